@@ -0,0 +1,66 @@
+"""Compare the row-by-row and columnar analytics paths on synthetic patients.
+
+Run from the project root:
+
+    python -m benchmarks.analytics_benchmark [ROWS ...]
+
+Defaults to 10,000, 100,000 and 1,000,000 patients. No database is needed.
+"""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+from datetime import date, timedelta # For synthetic visit dates
+import random # For reproducible synthetic data
+import sys # For command-line arguments
+import time # For timing each path
+from typing import List # For type hinting
+
+from system_configs.analytics_service import compute_analytics, compute_analytics_columnar, patient_frame
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+_GENDERS = ('male', 'FEMALE', ' Female ', 'Male', '', None)
+_DIAGNOSES = ('fever', 'Cough', 'headache', 'ASTHMA', 'sprain', 'allergy', 'flu', '', None)
+_MUNICIPALITIES = ('San Pablo', 'calamba', 'Los Banos', 'bay', 'Santa Cruz', 'Alaminos', 'Calauan')
+
+# Build reproducible patient rows in database column order.
+def make_rows(count: int, seed: int = 7) -> List[tuple]:
+    rng = random.Random(seed)
+    first_visit = date(2020, 1, 1)
+    rows = []
+    for index in range(count):
+        address = f'{rng.randint(1, 999)} Street, Brgy {rng.randint(1, 60)}, {rng.choice(_MUNICIPALITIES)}, Laguna'
+        if index % 50 == 0:
+            address = 'Incomplete, address'
+        visit = first_visit + timedelta(days=rng.randint(0, 2000)) if index % 20 else None
+        rows.append((
+            str(index + 1), f'Patient {index}', '+63 900 000 0000', 'patient@example.com', address,
+            rng.choice(_GENDERS), date(2010, 1, 1), rng.choice(_DIAGNOSES), visit,
+        ))
+    return rows
+
+# Time one call and return its result with the elapsed seconds.
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+# Benchmark both paths for each size and print a table.
+def main(sizes=DEFAULT_SIZES) -> None:
+    # Warm up untimed so the first size does not pay for importing pandas.
+    compute_analytics_columnar(patient_frame(make_rows(10)))
+    print(f"{'rows':>10} {'row-by-row':>12} {'frame build':>12} {'columnar':>10} {'speedup':>8}")
+    for size in sizes:
+        rows = make_rows(size)
+        expected, row_seconds = _timed(compute_analytics, rows)
+        frame, frame_seconds = _timed(patient_frame, rows)
+        actual, columnar_seconds = _timed(compute_analytics_columnar, frame)
+        if actual != expected:
+            raise SystemExit(f'Columnar analytics differ from the row-by-row result for {size} rows.')
+        print(
+            f'{size:>10,} {row_seconds:>11.3f}s {frame_seconds:>11.3f}s '
+            f'{columnar_seconds:>9.3f}s {row_seconds / columnar_seconds:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,52 @@
+"""Compare in-process and pooled rendering of the analytics PDF charts.
+
+Run from the project root:
+
+    python -m benchmarks.chart_benchmark [ROWS] [WORKERS]
+
+Defaults to 10,000 synthetic patients and 4 chart workers. Needs matplotlib;
+no running database is needed. The first pooled export includes starting the
+worker processes, which each import matplotlib.
+"""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+import os # For the CPU count that caps the pool
+import sys # For command-line arguments
+import time # For timing each path
+
+from benchmarks.analytics_benchmark import make_rows
+from system_configs.analytics_service import compute_analytics
+from system_configs.config import PRIMARY, SECONDARY
+from system_configs.export_service import CHART_KEYS, render_analytics_charts, shutdown_chart_pool
+from system_configs.optional_deps import load_figure_cls
+
+# Time one call and return the elapsed seconds.
+def _timed(function, *args, **kwargs) -> float:
+    started = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - started
+
+# Benchmark serial and pooled chart rendering and print a table.
+def main(size: int = 10_000, workers: int = 4) -> None:
+    figure_cls = load_figure_cls()
+    if figure_cls is None:
+        raise SystemExit('matplotlib is required for the chart benchmark.')
+    analytics = compute_analytics(make_rows(size))
+    # One untimed render so the serial figures exclude matplotlib's first-use cost.
+    render_analytics_charts(analytics, figure_cls, PRIMARY, SECONDARY, workers=1)
+
+    # The pool never exceeds the chart or CPU count; with one worker it renders in-process.
+    workers = min(workers, len(CHART_KEYS), os.cpu_count() or 1)
+    print(f"{'path':<22} {'seconds':>8}")
+    print(f"{'in-process':<22} {_timed(render_analytics_charts, analytics, figure_cls, PRIMARY, SECONDARY, workers=1):>7.3f}s")
+    try:
+        first = _timed(render_analytics_charts, analytics, figure_cls, PRIMARY, SECONDARY, workers=workers)
+        warm = _timed(render_analytics_charts, analytics, figure_cls, PRIMARY, SECONDARY, workers=workers)
+    finally:
+        shutdown_chart_pool()
+    print(f"{f'pool x{workers}, first export':<22} {first:>7.3f}s")
+    print(f"{f'pool x{workers}, later exports':<22} {warm:>7.3f}s")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -5,7 +5,7 @@ import customtkinter as ctk # Custom Tkinter for enhanced UI components
 from PIL import Image # For image handling
 
 from system_configs.config import PRIMARY, SECONDARY, BG, ACCENT, TEXT, CARD_BG # Import color constants from config
-from system_configs.database import db_connection, db_cursor # Import database connection
+from system_configs.database import get_pool # Import pooled database connections
 
 _next_action = None  # Track which window to launch after signup UI closes
 BASE_DIR = Path(__file__).resolve().parent
@@ -30,7 +30,8 @@ def _perform_transition() -> None:
 
     if target == 'loginn':
         try:
-            import loginn  # pylint: disable=import-outside-toplevel,unused-import
+            import loginn  # pylint: disable=import-outside-toplevel
+            loginn.main()
         except Exception as exc:  # pylint: disable=broad-except
             _show_launch_error(exc)
 
@@ -84,15 +85,16 @@ def sign_up():
         return
 
     try:
-        # Check if username already exists
-        db_cursor.execute('SELECT username FROM users WHERE username = %s', (username,))
-        if db_cursor.fetchone():
-            messagebox.showerror('Error', 'Username already exists')
-            return
-
-        # Insert new user into database
-        db_cursor.execute('INSERT INTO users (username, password) VALUES (%s, %s)', (username, passwrd))
-        db_connection.commit()
+        with get_pool().cursor() as (cursor, connection):
+            # Check if username already exists
+            cursor.execute('SELECT username FROM users WHERE username = %s', (username,))
+            if cursor.fetchone():
+                messagebox.showerror('Error', 'Username already exists')
+                return
+
+            # Insert new user into database
+            cursor.execute('INSERT INTO users (username, password) VALUES (%s, %s)', (username, passwrd))
+            connection.commit()
 
         messagebox.showinfo('Registration', 'Staff registered successfully')
         _schedule_transition('loginn')
@@ -1,7 +1,11 @@
 """Entry point for the School Clinic patient record management system."""
 from __future__ import annotations
 
-import importlib
+# Imported first so startup timing covers every later import.
+from system_configs.timing import profiling_enabled, startup_timer, write_report
+
+from datetime import date
+import threading
 import time
 from tkinter import messagebox
 
@@ -10,62 +14,127 @@ from system_configs.config import (
     PRIMARY,
     SECONDARY,
     SEARCH_FIELD_OPTIONS,
+    SEARCH_USE_FULLTEXT,
     SELECTION_MENU_OPTIONS,
     SIDEBAR_SIDE,
     SORT_FIELD_LABELS,
+    SLOW_QUERY_THRESHOLD_MS,
     SORT_FIELD_OPTIONS,
+    WARM_START_MAX_AGE,
+)
+from system_configs.analytics_cache import ANALYTICS_KEY, analytics_cache
+from system_configs.analytics_service import create_analytics_figures, load_analytics
+from system_configs.database import get_fulltext_columns, get_ngram_token_size, get_pool
+from system_configs.db_executor import DatabaseExecutor
+from system_configs.export_service import (
+    export_patient_analytics_pdf,
+    export_patient_records_csv,
+    export_patient_records_excel,
+    export_patient_records_jsonl,
+    export_patient_records_parquet,
+    shutdown_chart_pool,
+)
+from system_configs.helpers import normalize_mobile, to_proper_case
+from system_configs.optional_deps import (
+    HAS_FPDF,
+    HAS_MATPLOTLIB,
+    HAS_OPENPYXL,
+    HAS_PYARROW,
+    load_figure_classes,
+    load_figure_cls,
+    load_fpdf_cls,
 )
-from system_configs.analytics_service import compute_analytics, create_analytics_figures, load_all_patients
-from system_configs.database import db_connection, db_cursor
-from system_configs.export_service import export_patient_analytics_pdf, export_patient_records_excel
-from system_configs.helpers import normalize_column_name, normalize_mobile, to_proper_case
+from system_configs.query_stats import query_stats
+from system_configs.stats_service import apply_patient_stat_changes
 from system_features import analytics as analytics_feature
 from system_features import crud as crud_feature
+from system_features import diagnostics as diagnostics_feature
 from system_features import import_export as import_export_feature
 from system_features import search as search_feature
 from system_features import selection as selection_feature
 from system_features import sorting as sorting_feature
 from system_features.system_gui import build_main_window
 
-# Dependency checks for optional libraries.
-try:
-    FPDF = importlib.import_module('fpdf').FPDF
-except (ImportError, AttributeError):
-    FPDF = None
 
-try:
-    matplotlib = importlib.import_module('matplotlib')
-    matplotlib.use('TkAgg')
-    Figure = importlib.import_module('matplotlib.figure').Figure
-    FigureCanvasTkAgg = importlib.import_module('matplotlib.backends.backend_tkagg').FigureCanvasTkAgg
-except Exception:
-    Figure = None
-    FigureCanvasTkAgg = None
-    matplotlib = None
+def _compute_patient_analytics(cursor):
+    return analytics_cache.get_or_compute(ANALYTICS_KEY, lambda: load_analytics(cursor))
 
-try:
-    importlib.import_module('openpyxl')
-    HAS_OPENPYXL = True
-except ImportError:
-    HAS_OPENPYXL = False
 
-CONNECTION = db_connection
-CURSOR = db_cursor
+def _create_patient_analytics_figures(analytics):
+    # Each window gets its own Figures; only the analytics data and PDF PNGs are cached.
+    return create_analytics_figures(analytics, load_figure_cls(), PRIMARY, SECONDARY)
 
 
-def _load_patient_rows():
-    return load_all_patients(CURSOR)
+def _export_patient_analytics_pdf(cursor, file_path, fpdf_cls, figure_cls, primary_color, secondary_color):
+    export_patient_analytics_pdf(
+        cursor, file_path, fpdf_cls, figure_cls, primary_color, secondary_color, cache=analytics_cache
+    )
 
 
-def _compute_patient_analytics():
-    return compute_analytics(_load_patient_rows())
+def _load_fulltext_settings(cursor):
+    # (FULLTEXT column map, ngram token size) for the sorting module, or None when disabled.
+    if not SEARCH_USE_FULLTEXT:
+        return None
+    return get_fulltext_columns(cursor), get_ngram_token_size(cursor)
 
 
-def _create_patient_analytics_figures(analytics):
-    return create_analytics_figures(analytics, Figure, PRIMARY, SECONDARY)
+_warm_lock = threading.Lock()
+_warm_state = None  # (rows, next_key, fulltext_settings, fetched_at) prefetched by warm_start()
+
+
+def warm_start():
+    """Prepare the database and prefetch the first patient page off the Tk thread.
+
+    The login screen calls this on a background thread while staff type their
+    credentials. Importing this module already loads the feature modules; this
+    also applies pending migrations, opens a pooled connection and fetches the
+    unfiltered first page so main() can show it without a query. Errors are
+    left to main(), which repeats the work and reports them.
+    """
+    global _warm_state
+    pool = get_pool()
+    with startup_timer.span('warm_start_first_page'), pool.cursor() as (cursor, _connection):
+        fulltext_settings = _load_fulltext_settings(cursor)
+        rows, next_key = sorting_feature.fetch_patient_page(None, None, cursor=cursor)
+    with _warm_lock:
+        _warm_state = (rows, next_key, fulltext_settings, time.monotonic())
+
+
+def _take_warm_state():
+    # Hand the prefetched page over once; a page older than WARM_START_MAX_AGE is refetched.
+    global _warm_state
+    with _warm_lock:
+        state, _warm_state = _warm_state, None
+    if state is None or time.monotonic() - state[3] > WARM_START_MAX_AGE:
+        return None
+    return state[:3]
+
+
+_first_page_timed = False
+
+
+def _fetch_patient_page(*args, **kwargs):
+    # The first page query is part of startup; later pages are not timed.
+    global _first_page_timed
+    if _first_page_timed:
+        return sorting_feature.fetch_patient_page(*args, **kwargs)
+    _first_page_timed = True
+    with startup_timer.span('first_page_query'):
+        return sorting_feature.fetch_patient_page(*args, **kwargs)
+
+
+def _save_timing_report(parent) -> None:
+    try:
+        path = write_report()
+    except OSError as exc:
+        messagebox.showerror('Error', f'Could not write the timing report: {exc}', parent=parent)
+        return
+    messagebox.showinfo('Timing Report', f'Timing report saved to:\n{path}', parent=parent)
 
 
 def main():
+    # Phases recorded: imports, window, features, window_painted, first_screen, all_rows.
+    startup_timer.mark('imports')
     root_ref = {}
 
     def exit_application() -> None:
@@ -89,6 +158,8 @@ def main():
         on_sort_click=sorting_feature.open_sort_dialog,
         on_patient_details=crud_feature.show_patient_details,
         sidebar_side=SIDEBAR_SIDE,
+        on_table_scroll=crud_feature.on_table_scroll,
+        diagnostics_handler=diagnostics_feature.show_diagnostics_window,
     )
 
     root = components['root']
@@ -98,13 +169,33 @@ def main():
     search_field_var = components['search_field_var']
     selection_action_var = components['selection_action_var']
     patient_table = components['patient_table']
+    busy_label = components['busy_label']
+    loading_label = components['loading_label']
+    startup_timer.mark('window')
+
+    def show_busy(pending: int) -> None:
+        busy_label.configure(text='Working... (Esc to cancel)' if pending else '')
 
-    def current_date() -> str:
-        return time.strftime('%m/%d/%Y')
+    # A cold start opens the pool (and checks the schema) on a worker thread.
+    executor = DatabaseExecutor(get_pool, root, on_busy_change=show_busy)
+    root.bind('<Escape>', lambda event: executor.cancel_all())
+    root.bind('<Control-Shift-T>', lambda event: _save_timing_report(root))
+
+    def current_date() -> date:
+        return date.today()
 
     def refresh_table() -> None:
+        search_feature.invalidate_cache()
         crud_feature.show_patient()
 
+    def data_changed() -> None:
+        search_feature.invalidate_cache()
+        analytics_cache.bump()
+
+    def refresh_after_import() -> None:
+        analytics_cache.bump()
+        refresh_table()
+
     def update_clock() -> None:
         datetime_label.configure(
             text=f"  Date: {time.strftime('%m/%d/%Y')}\nTime: {time.strftime('%H:%M:%S')}"
@@ -116,6 +207,11 @@ def main():
         search_field_var=search_field_var,
         search_field_options=SEARCH_FIELD_OPTIONS,
         refresh_callback=refresh_table,
+        root=root,
+        fetch_page=sorting_feature.fetch_patient_page,
+        executor=executor,
+        display_results=crud_feature.show_patient_rows,
+        get_sort_state=lambda: (sorting_feature.current_sort_field, sorting_feature.current_sort_order),
     )
 
     selection_feature.configure(
@@ -123,55 +219,119 @@ def main():
         root=root,
         selection_action_var=selection_action_var,
         selection_menu_options=SELECTION_MENU_OPTIONS,
+        load_all_rows=crud_feature.load_all_patients,
     )
 
+    warm_state = _take_warm_state()
+    fulltext_columns, ngram_token_size = (warm_state[2] if warm_state is not None else None) or (None, 2)
+
     sorting_feature.configure(
-        cursor=CURSOR,
         sort_field_options=SORT_FIELD_OPTIONS,
         sort_field_labels=SORT_FIELD_LABELS,
         date_sort_fields=DATE_SORT_FIELDS,
         root=root,
         refresh_callback=refresh_table,
+        fulltext_columns=fulltext_columns,
+        ngram_token_size=ngram_token_size,
     )
 
     crud_feature.configure(
         patient_table=patient_table,
-        cursor=CURSOR,
-        connection=CONNECTION,
+        executor=executor,
         root=root,
-        fetch_patients=sorting_feature.fetch_patients,
+        fetch_patient_page=_fetch_patient_page,
         get_filter=search_feature.get_filter,
         get_current_date=current_date,
         normalize_mobile=normalize_mobile,
         to_proper_case=to_proper_case,
+        on_data_changed=data_changed,
+        record_stats_change=apply_patient_stat_changes,
+        locate_patient=sorting_feature.fetch_patient_position,
+        loading_placeholder=loading_label,
+        cancel_search=search_feature.cancel_search,
     )
 
     import_export_feature.configure(
-        cursor=CURSOR,
-        connection=CONNECTION,
+        executor=executor,
         root=root,
-        refresh_callback=refresh_table,
+        refresh_callback=refresh_after_import,
         has_openpyxl=HAS_OPENPYXL,
-        fpdf_cls=FPDF,
-        figure_cls=Figure,
-        export_records_fn=export_patient_records_excel,
-        export_analytics_fn=export_patient_analytics_pdf,
-        normalize_mobile=normalize_mobile,
-        normalize_column_name=normalize_column_name,
-        to_proper_case=to_proper_case,
+        has_fpdf=HAS_FPDF,
+        has_matplotlib=HAS_MATPLOTLIB,
+        load_fpdf_cls=load_fpdf_cls,
+        load_figure_cls=load_figure_cls,
+        record_exporters={
+            'excel': export_patient_records_excel,
+            'csv': export_patient_records_csv,
+            'parquet': export_patient_records_parquet,
+            'jsonl': export_patient_records_jsonl,
+        },
+        export_analytics_fn=_export_patient_analytics_pdf,
+        has_pyarrow=HAS_PYARROW,
     )
 
     analytics_feature.configure(
         compute_analytics=_compute_patient_analytics,
         create_analytics_figures=_create_patient_analytics_figures,
         root=root,
-        figure_cls=Figure,
-        figure_canvas_cls=FigureCanvasTkAgg,
+        executor=executor,
+        load_figure_classes=load_figure_classes,
+        get_cached_analytics=lambda: analytics_cache.get(ANALYTICS_KEY),
+    )
+
+    diagnostics_feature.configure(
+        root=root,
+        get_query_stats=query_stats.snapshot,
+        get_slow_queries=query_stats.slow_queries,
+        reset_query_stats=query_stats.reset,
+        slow_threshold_ms=SLOW_QUERY_THRESHOLD_MS,
+        get_startup_phases=startup_timer.phases,
+        save_timing_report=_save_timing_report,
     )
 
+    def show_startup_error(exc) -> None:
+        messagebox.showerror('Error', f'Database error: {exc}', parent=root)
+
+    if warm_state is None:
+        # Cold start: this is the first task to open the pool, so it reports connection failures.
+        executor.submit(
+            lambda cursor, _connection: _load_fulltext_settings(cursor),
+            on_success=lambda settings: sorting_feature.set_fulltext_columns(*settings) if settings else None,
+            on_error=show_startup_error,
+            cancellable=False,
+        )
+
+    startup_timer.mark('features')
     update_clock()
-    refresh_table()
+    # Paint the shell first; patients are shown once the event loop is running.
+    root.after_idle(lambda: startup_timer.mark('window_painted'))
+
+    def mark_first_screen() -> None:
+        startup_timer.mark('first_screen')
+
+    def mark_all_rows() -> None:
+        startup_timer.mark('all_rows')
+        if profiling_enabled():
+            try:
+                write_report()
+            except OSError:
+                pass  # profiling must never stop the app from starting
+
+    if warm_state is not None:
+        # The login screen already fetched the first unfiltered page in the default sort.
+        root.after_idle(
+            lambda: crud_feature.show_patient_rows(
+                warm_state[0], warm_state[1], None, None, mark_first_screen, mark_all_rows
+            )
+        )
+    else:
+        search_feature.invalidate_cache()
+        crud_feature.show_patient(mark_first_screen, mark_all_rows, cancellable=False)
     root.mainloop()
+    executor.shutdown()
+    shutdown_chart_pool()
+    if executor.pool is not None:
+        executor.pool.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,87 @@
+"""Shared cache for computed analytics and rendered charts."""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+from collections import OrderedDict # For least-recently-used eviction
+import threading # For access from database worker threads
+import time # For expiring entries
+from typing import Any, Callable, Hashable, Optional, Tuple # For type hinting
+
+from .config import ANALYTICS_CACHE_MAX_ENTRIES, ANALYTICS_CACHE_TTL # Cache tuning constants
+
+# Cache keys shared by the analytics window and the PDF export.
+ANALYTICS_KEY = ('analytics',)
+
+_MISSING = object()
+
+
+# Cache values under the current data version with a TTL and LRU eviction.
+class AnalyticsCache:
+    """Keep analytics results until patient data changes or they expire.
+
+    ``bump`` starts a new data version and drops every entry, so writes made
+    by this app are visible immediately. The TTL bounds how stale results can
+    get when another workstation changes the shared database.
+    """
+
+    def __init__(self, ttl: float = ANALYTICS_CACHE_TTL, max_entries: int = ANALYTICS_CACHE_MAX_ENTRIES) -> None:
+        self._ttl = ttl
+        self._max_entries = max(int(max_entries), 1)
+        self._version = 0
+        self._entries: "OrderedDict[Tuple[int, Hashable], Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Current data version; values computed under an older version are never returned.
+    @property
+    def version(self) -> int:
+        return self._version
+
+    # Mark patient data as changed and drop every cached value.
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    # Return a fresh cached value, or None when it is missing or expired.
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._lookup((self._version, key))
+        return None if value is _MISSING else value
+
+    # Store a value computed under ``version`` (defaults to the current one).
+    def put(self, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        with self._lock:
+            version = self._version if version is None else version
+            if version != self._version:
+                # The data changed while the value was being computed.
+                return
+            entry_key = (version, key)
+            self._entries[entry_key] = (value, time.monotonic() + self._ttl)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    # Return the cached value or compute, store and return it.
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, calling ``compute`` on a miss."""
+        version = self._version
+        value = self._lookup((version, key))
+        if value is not _MISSING:
+            return value
+        value = compute()
+        self.put(key, value, version)
+        return value
+
+    def _lookup(self, entry_key: Tuple[int, Hashable]) -> Any:
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[entry_key]
+                return _MISSING
+            self._entries.move_to_end(entry_key)
+            return value
+
+
+# Process-wide cache shared by the dashboard and exports.
+analytics_cache = AnalyticsCache()
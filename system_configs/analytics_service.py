@@ -2,10 +2,14 @@
 from __future__ import annotations # Ensure compatibility with future Python versions
 
 from collections import Counter # For counting hashable objects
-from datetime import datetime # For handling date and time
-from typing import Dict, Iterable, List, Tuple, Optional # For type hinting
+from datetime import date # For handling visit dates
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Tuple, Optional # For type hinting
 
-from .helpers import to_proper_case # Importing helper function for proper case conversion
+from .config import ANALYTICS_BACKEND # Which analytics implementation to use
+from .helpers import parse_date, to_proper_case # Importing helpers for dates and proper case conversion
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import pandas
 
 PatientRow = Tuple[str, str, str, str, str, str, str, str, str] # Define a type alias for patient record rows
 AnalyticsData = Dict[str, object] # Define a type alias for analytics data dictionary
@@ -19,6 +23,16 @@ def load_all_patients(cursor) -> List[PatientRow]:#
     return cursor.fetchall()
 
 
+# Extract the municipality (third non-empty comma-separated part) from an address.
+def municipality_of(address: Optional[str]) -> str:
+    """Return the proper-cased municipality of an address, or 'Unspecified'."""
+    parts: List[str] = []
+    for part in (address or '').split(','):
+        cleaned = to_proper_case(part)
+        if cleaned:
+            parts.append(cleaned)
+    return parts[2] if len(parts) >= 3 else 'Unspecified'
+
 # Define a type alias for analytics data dictionary
 def compute_analytics(rows: Iterable[PatientRow]) -> AnalyticsData:
     """Aggregate high-level statistics for dashboards and exports."""
@@ -30,32 +44,21 @@ def compute_analytics(rows: Iterable[PatientRow]) -> AnalyticsData:
     diagnosis_counts: Counter[str] = Counter()
     month_counts: Counter[str] = Counter()
     month_labels: Dict[str, str] = {}
-    latest_visit_dt: Optional[datetime] = None
+    latest_visit_dt: Optional[date] = None
 
     for row in rows:
         gender_value = to_proper_case(row[5])
         gender = gender_value or 'Unspecified'
         gender_counts[gender] += 1
 
-        address = row[4] or ''
-        parts: List[str] = []
-        for part in address.split(','):
-            cleaned = to_proper_case(part)
-            if cleaned:
-                parts.append(cleaned)
-        municipality = parts[2] if len(parts) >= 3 else 'Unspecified'
-        municipality_counts[municipality] += 1
+        municipality_counts[municipality_of(row[4])] += 1
 
         diagnosis_value = to_proper_case(row[7])
         diagnosis = diagnosis_value or 'Unspecified'
         diagnosis_counts[diagnosis] += 1
 
-        visit_date = row[8]
-        if visit_date:
-            try:
-                visit_dt = datetime.strptime(visit_date, '%m/%d/%Y')
-            except ValueError:
-                continue
+        visit_dt = parse_date(row[8])
+        if visit_dt is not None:
             key = visit_dt.strftime('%Y-%m')
             month_counts[key] += 1
             month_labels[key] = visit_dt.strftime('%B %Y')
@@ -63,7 +66,17 @@ def compute_analytics(rows: Iterable[PatientRow]) -> AnalyticsData:
                 latest_visit_dt = visit_dt
 
     visits_by_month = [(month_labels[key], month_counts[key]) for key in sorted(month_counts.keys())]
+    return _build_analytics(total, gender_counts, municipality_counts, diagnosis_counts, visits_by_month, latest_visit_dt)
 
+# Assemble the AnalyticsData dictionary shared by every analytics backend.
+def _build_analytics(
+    total: int,
+    gender_counts: Counter,
+    municipality_counts: Counter,
+    diagnosis_counts: Counter,
+    visits_by_month: List[Tuple[str, int]],
+    latest_visit_dt: Optional[date],
+) -> AnalyticsData:
     analytics: AnalyticsData = {
         'total': total,
         'genders': gender_counts.most_common(),
@@ -74,112 +87,363 @@ def compute_analytics(rows: Iterable[PatientRow]) -> AnalyticsData:
     }
     return analytics
 
-# Define a type alias for analytics data dictionary
-def create_analytics_figures(
-    analytics: AnalyticsData,
-    figure_cls,
-    primary_color: str,
-    secondary_color: str
-) -> Dict[str, object]:
-    """Generate matplotlib figures for the analytics dashboard and exports."""
-    if figure_cls is None:
-        return {}
+# Patient columns the columnar analytics path needs.
+ANALYTICS_COLUMNS = ('address', 'gender', 'diagnosis', 'visit_date')
 
-    figures: Dict[str, object] = {}
+# Load only the analytics columns into a DataFrame.
+def load_patient_frame(cursor) -> pandas.DataFrame:
+    """Fetch the columns used by ``compute_analytics_columnar`` for every patient."""
+    import pandas  # pylint: disable=import-outside-toplevel  # only needed for columnar analytics
+
+    cursor.execute(f"select {', '.join(ANALYTICS_COLUMNS)} from patient")
+    return pandas.DataFrame(list(cursor.fetchall()), columns=list(ANALYTICS_COLUMNS))
+
+# Build the columnar analytics input from rows in patient column order.
+def patient_frame(rows: Iterable[PatientRow]) -> pandas.DataFrame:
+    """Return a DataFrame with ``ANALYTICS_COLUMNS`` taken from full patient rows."""
+    import pandas  # pylint: disable=import-outside-toplevel  # only needed for columnar analytics
+
+    frame = pandas.DataFrame(
+        list(rows),
+        columns=['patient_id', 'name', 'mobile', 'email', 'address', 'gender', 'dob', 'diagnosis', 'visit_date'],
+    )
+    return frame[list(ANALYTICS_COLUMNS)]
+
+# Count each distinct value once, then merge counts under the normalized labels.
+def _factorized_counts(values: pandas.Series, normalize: Callable[[pandas.Index], Iterable]) -> Counter:
+    """Count ``values`` with factorize/bincount; labels keep first-appearance order like the row path.
+
+    Missing values are skipped; ``normalize`` maps the distinct values to labels
+    and may return None for values that should not be counted.
+    """
+    import numpy  # pylint: disable=import-outside-toplevel  # only needed for columnar analytics
+    import pandas  # pylint: disable=import-outside-toplevel
+
+    codes, uniques = pandas.factorize(values)
+    frequencies = numpy.bincount(codes[codes >= 0], minlength=len(uniques))
+    counts: Counter[str] = Counter()
+    for label, count in zip(normalize(uniques), frequencies.tolist()):
+        if label is not None:
+            counts[label] += count
+    return counts
+
+# Vectorized municipality_of over a Series of addresses.
+def municipality_series(addresses: pandas.Series) -> pandas.Series:
+    """Return the proper-cased third non-empty address part, or 'Unspecified'."""
+    import numpy  # pylint: disable=import-outside-toplevel  # only needed for columnar analytics
+    import pandas  # pylint: disable=import-outside-toplevel
+
+    if addresses.empty:
+        return pandas.Series([], index=addresses.index, dtype=object)
+    parts = addresses.fillna('').astype(str).str.split(',', expand=True)
+    parts = parts.apply(lambda column: column.str.strip()).fillna('').to_numpy(dtype=object)
+    present = parts != ''
+    third = present & (present.cumsum(axis=1) == 3)
+    found = third.any(axis=1)
+    values = parts[numpy.arange(len(parts)), third.argmax(axis=1)]
+    municipalities = pandas.Series(values, index=addresses.index, dtype=object).str.title()
+    return municipalities.where(found, 'Unspecified')
+
+# Compute analytics with vectorized operations over columnar patient data.
+def compute_analytics_columnar(frame: pandas.DataFrame) -> AnalyticsData:
+    """Return the same data as ``compute_analytics`` for a DataFrame with ``ANALYTICS_COLUMNS``.
+
+    Values are counted with ``pandas.factorize`` and labels are normalized once
+    per distinct value instead of once per row.
+    """
+    import pandas  # pylint: disable=import-outside-toplevel  # only needed for columnar analytics
+
+    # Distinct text, in first-appearance order, normalized like to_proper_case.
+    def _proper_case_labels(uniques: pandas.Index) -> List[str]:
+        return [to_proper_case(value) or 'Unspecified' for value in uniques]
+
+    gender_counts = _factorized_counts(frame['gender'].fillna(''), _proper_case_labels)
+    diagnosis_counts = _factorized_counts(frame['diagnosis'].fillna(''), _proper_case_labels)
+
+    municipality_counts = _factorized_counts(
+        frame['address'].fillna('').astype(str),
+        lambda uniques: municipality_series(pandas.Series(uniques)).tolist(),
+    )
+
+    visit_dates: Dict[object, Optional[date]] = {}
+
+    # Parse each distinct visit date once.
+    def _visit_months(uniques: pandas.Index) -> List[Optional[str]]:
+        months: List[Optional[str]] = []
+        for value in uniques:
+            visit_dt = parse_date(value)
+            visit_dates[value] = visit_dt
+            months.append(visit_dt.strftime('%Y-%m') if visit_dt is not None else None)
+        return months
+
+    month_counts = _factorized_counts(frame['visit_date'], _visit_months)
+    parsed_dates = [value for value in visit_dates.values() if value is not None]
+    latest_visit_dt = max(parsed_dates) if parsed_dates else None
+
+    visits_by_month = []
+    for month in sorted(month_counts):
+        visits_by_month.append((parse_date(f'{month}-01').strftime('%B %Y'), month_counts[month]))
+
+    return _build_analytics(
+        len(frame), gender_counts, municipality_counts, diagnosis_counts, visits_by_month, latest_visit_dt
+    )
+
+# Collapse empty address parts so the third remaining part is the municipality, as in compute_analytics.
+_MUNICIPALITY_SQL = (
+    "case when {address} like '%,%,%' then trim(substring_index(substring_index({address}, ',', 3), ',', -1)) end"
+).format(address="trim(both ',' from regexp_replace(coalesce(address, ''), '[[:space:]]*,[[:space:],]*', ','))")
+
+# Run a GROUP BY query and merge its groups under normalized labels.
+def _grouped_counts(cursor, expression: str, normalize: Callable[[object], str]) -> Counter:
+    # Group on exact bytes like patient_stats does; the column's accent- and case-insensitive collation would merge "José" into "Jose".
+    cursor.execute(
+        f'select convert({expression} using utf8mb4) collate utf8mb4_bin as label, count(*) '
+        'from patient group by label order by count(*) desc'
+    )
+    counts: Counter[str] = Counter()
+    for value, count in cursor.fetchall():
+        counts[normalize(value)] += int(count)
+    return counts
+
+# Aggregate analytics inside MySQL so only the grouped counts are transferred.
+def compute_analytics_sql(cursor) -> AnalyticsData:
+    """Compute the same data as ``compute_analytics`` with GROUP BY queries.
+
+    Each query returns one row per distinct byte value; labels are normalized
+    in Python so differently cased values merge exactly as the row-by-row path
+    merges them. Raises ``MySQLError`` on servers without ``REGEXP_REPLACE``.
+    """
+    cursor.execute('select count(*), max(visit_date) from patient')
+    total, latest_visit = cursor.fetchone()
+
+    gender_counts = _grouped_counts(cursor, 'gender', lambda value: to_proper_case(value) or 'Unspecified')
+    diagnosis_counts = _grouped_counts(cursor, 'diagnosis', lambda value: to_proper_case(value) or 'Unspecified')
+    municipality_counts = _grouped_counts(
+        cursor, _MUNICIPALITY_SQL, lambda value: to_proper_case(value) or 'Unspecified'
+    )
+
+    cursor.execute(
+        "select date_format(visit_date, '%Y-%m') as month, count(*) from patient "
+        'where visit_date is not null group by month order by month'
+    )
+    visits_by_month = []
+    for month, count in cursor.fetchall():
+        month_start = parse_date(f'{month}-01')
+        visits_by_month.append((month_start.strftime('%B %Y'), int(count)))
+
+    return _build_analytics(
+        int(total or 0),
+        gender_counts,
+        municipality_counts,
+        diagnosis_counts,
+        visits_by_month,
+        parse_date(latest_visit) if latest_visit is not None else None,
+    )
 
+# Read analytics from the patient_stats counter table maintained by every write.
+def compute_analytics_from_summary(cursor) -> AnalyticsData:
+    """Build analytics from ``patient_stats``; cost depends on distinct labels, not patients."""
+    cursor.execute('select dimension, label, patient_count from patient_stats where patient_count > 0')
+    counters: Dict[str, Counter] = {
+        'gender': Counter(),
+        'municipality': Counter(),
+        'diagnosis': Counter(),
+        'visit_month': Counter(),
+    }
+    for dimension, label, count in cursor.fetchall():
+        if dimension in counters:
+            counters[dimension][label] += int(count)
+
+    # The visit_date index answers MAX() without scanning the table.
+    cursor.execute('select max(visit_date) from patient')
+    latest_visit = cursor.fetchone()[0]
+
+    visits_by_month = []
+    for month in sorted(counters['visit_month']):
+        month_start = parse_date(f'{month}-01')
+        if month_start is not None:
+            visits_by_month.append((month_start.strftime('%B %Y'), counters['visit_month'][month]))
+
+    return _build_analytics(
+        # Every patient is counted under exactly one gender label.
+        sum(counters['gender'].values()),
+        counters['gender'],
+        counters['municipality'],
+        counters['diagnosis'],
+        visits_by_month,
+        parse_date(latest_visit) if latest_visit is not None else None,
+    )
+
+# Compute analytics with the configured backend, falling back to the row-by-row path.
+def load_analytics(cursor, backend: str = ANALYTICS_BACKEND) -> AnalyticsData:
+    """Return analytics for every patient using ``backend``.
+
+    ``'summary'`` reads the counter tables, ``'sql'`` aggregates with GROUP BY,
+    ``'columnar'`` counts every row with pandas and ``'python'`` counts every
+    row in a loop; each falls back to the next on error.
+    """
+    # Imported here so the compute helpers (and the benchmarks) work without the MySQL driver.
+    from pymysql import MySQLError  # pylint: disable=import-outside-toplevel
+
+    if backend == 'summary':
+        try:
+            return compute_analytics_from_summary(cursor)
+        except MySQLError:
+            backend = 'sql'
+    if backend == 'sql':
+        try:
+            return compute_analytics_sql(cursor)
+        except MySQLError:
+            backend = 'columnar'
+    if backend == 'columnar':
+        try:
+            return compute_analytics_columnar(load_patient_frame(cursor))
+        except ImportError:
+            pass
+    return compute_analytics(load_all_patients(cursor))
+
+# Pie chart of patients per gender.
+def _gender_figure(analytics: AnalyticsData, figure_cls, primary_color: str, secondary_color: str):
     gender_data = analytics.get('genders') or []
-    if gender_data:
-        labels = [label for label, _ in gender_data]
-        counts = [count for _, count in gender_data]
-        fig = figure_cls(figsize=(4.2, 3.2), dpi=100)
-        ax = fig.add_subplot(111)
-
-        # Show percentage labels only when a slice has a value.
-        def _autopct(pct: float) -> str:
-            return f'{pct:.1f}%' if pct > 0 else ''
-
-        ax.pie(counts, labels=labels, autopct=_autopct, startangle=90)
-        ax.axis('equal')
-        ax.set_title('Gender Distribution', fontsize=12)
-        fig.tight_layout()
-        figures['gender'] = fig
+    if not gender_data:
+        return None
+    labels = [label for label, _ in gender_data]
+    counts = [count for _, count in gender_data]
+    fig = figure_cls(figsize=(4.2, 3.2), dpi=100)
+    ax = fig.add_subplot(111)
+
+    # Show percentage labels only when a slice has a value.
+    def _autopct(pct: float) -> str:
+        return f'{pct:.1f}%' if pct > 0 else ''
 
+    ax.pie(counts, labels=labels, autopct=_autopct, startangle=90)
+    ax.axis('equal')
+    ax.set_title('Gender Distribution', fontsize=12)
+    fig.tight_layout()
+    return fig
+
+# Bar chart of the five most common diagnoses.
+def _diagnosis_figure(analytics: AnalyticsData, figure_cls, primary_color: str, secondary_color: str):
     diagnosis_data = analytics.get('diagnoses') or []
     top_diagnoses = diagnosis_data[:5]
-    if top_diagnoses:
-        labels = [label for label, _ in top_diagnoses]
-        counts = [count for _, count in top_diagnoses]
-        fig = figure_cls(figsize=(4.6, 3.2), dpi=100)
-        ax = fig.add_subplot(111)
-        positions = list(range(len(labels)))
-        bars = ax.bar(positions, counts, color=primary_color)
-        ax.set_title('Top Diagnoses', fontsize=12)
-        ax.set_ylabel('Patients')
-        ax.set_xticks(positions)
-        ax.set_xticklabels(labels, rotation=30, ha='right')
-        if counts:
-            ax.set_ylim(0, max(counts) + 1)
-        try:
-            ax.bar_label(bars, padding=3, fontsize=9)
-        except Exception:
-            for rect, value in zip(bars, counts):
-                ax.text(
-                    rect.get_x() + rect.get_width() / 2,
-                    rect.get_height() + 0.1,
-                    str(value),
-                    ha='center',
-                    va='bottom',
-                    fontsize=9
-                )
-        ax.grid(axis='y', linestyle='--', alpha=0.2)
-        fig.tight_layout()
-        figures['diagnosis'] = fig
+    if not top_diagnoses:
+        return None
+    labels = [label for label, _ in top_diagnoses]
+    counts = [count for _, count in top_diagnoses]
+    fig = figure_cls(figsize=(4.6, 3.2), dpi=100)
+    ax = fig.add_subplot(111)
+    positions = list(range(len(labels)))
+    bars = ax.bar(positions, counts, color=primary_color)
+    ax.set_title('Top Diagnoses', fontsize=12)
+    ax.set_ylabel('Patients')
+    ax.set_xticks(positions)
+    ax.set_xticklabels(labels, rotation=30, ha='right')
+    if counts:
+        ax.set_ylim(0, max(counts) + 1)
+    try:
+        ax.bar_label(bars, padding=3, fontsize=9)
+    except Exception:
+        for rect, value in zip(bars, counts):
+            ax.text(
+                rect.get_x() + rect.get_width() / 2,
+                rect.get_height() + 0.1,
+                str(value),
+                ha='center',
+                va='bottom',
+                fontsize=9
+            )
+    ax.grid(axis='y', linestyle='--', alpha=0.2)
+    fig.tight_layout()
+    return fig
 
+# Line chart of visits over the last twelve months with data.
+def _visits_figure(analytics: AnalyticsData, figure_cls, primary_color: str, secondary_color: str):
     visits_data = analytics.get('visits_by_month') or []
     recent_visits = visits_data[-12:]
-    if recent_visits:
-        labels = [label for label, _ in recent_visits]
-        counts = [count for _, count in recent_visits]
-        positions = list(range(len(labels)))
-        fig = figure_cls(figsize=(6.0, 3.2), dpi=100)
-        ax = fig.add_subplot(111)
-        ax.plot(positions, counts, marker='o', color=secondary_color, linewidth=2)
-        ax.set_title('Clinic Visits by Month', fontsize=12)
-        ax.set_ylabel('Patients Seen')
-        ax.set_xticks(positions)
-        ax.set_xticklabels(labels, rotation=35, ha='right')
-        ax.grid(True, linestyle='--', alpha=0.3)
-        fig.tight_layout()
-        figures['visits'] = fig
+    if not recent_visits:
+        return None
+    labels = [label for label, _ in recent_visits]
+    counts = [count for _, count in recent_visits]
+    positions = list(range(len(labels)))
+    fig = figure_cls(figsize=(6.0, 3.2), dpi=100)
+    ax = fig.add_subplot(111)
+    ax.plot(positions, counts, marker='o', color=secondary_color, linewidth=2)
+    ax.set_title('Clinic Visits by Month', fontsize=12)
+    ax.set_ylabel('Patients Seen')
+    ax.set_xticks(positions)
+    ax.set_xticklabels(labels, rotation=35, ha='right')
+    ax.grid(True, linestyle='--', alpha=0.3)
+    fig.tight_layout()
+    return fig
 
+# Horizontal bar chart of the five largest municipalities.
+def _municipality_figure(analytics: AnalyticsData, figure_cls, primary_color: str, secondary_color: str):
     municipality_data = analytics.get('municipalities') or []
     top_municipalities = municipality_data[:5]
-    if top_municipalities:
-        labels = [label for label, _ in top_municipalities]
-        counts = [count for _, count in top_municipalities]
-        fig = figure_cls(figsize=(4.6, 3.2), dpi=100)
-        ax = fig.add_subplot(111)
-        positions = list(range(len(labels)))
-        bars = ax.barh(positions, counts, color=primary_color)
-        ax.set_title('Top Municipalities', fontsize=12)
-        ax.set_xlabel('Patients')
-        ax.set_yticks(positions)
-        ax.set_yticklabels(labels)
-        if counts:
-            ax.set_xlim(0, max(counts) + 1)
-        try:
-            ax.bar_label(bars, padding=3, fontsize=9)
-        except Exception:
-            for rect, value in zip(bars, counts):
-                ax.text(
-                    rect.get_width() + 0.1,
-                    rect.get_y() + rect.get_height() / 2,
-                    str(value),
-                    va='center',
-                    fontsize=9
-                )
-        ax.grid(axis='x', linestyle='--', alpha=0.2)
-        fig.tight_layout()
-        figures['municipality'] = fig
+    if not top_municipalities:
+        return None
+    labels = [label for label, _ in top_municipalities]
+    counts = [count for _, count in top_municipalities]
+    fig = figure_cls(figsize=(4.6, 3.2), dpi=100)
+    ax = fig.add_subplot(111)
+    positions = list(range(len(labels)))
+    bars = ax.barh(positions, counts, color=primary_color)
+    ax.set_title('Top Municipalities', fontsize=12)
+    ax.set_xlabel('Patients')
+    ax.set_yticks(positions)
+    ax.set_yticklabels(labels)
+    if counts:
+        ax.set_xlim(0, max(counts) + 1)
+    try:
+        ax.bar_label(bars, padding=3, fontsize=9)
+    except Exception:
+        for rect, value in zip(bars, counts):
+            ax.text(
+                rect.get_width() + 0.1,
+                rect.get_y() + rect.get_height() / 2,
+                str(value),
+                va='center',
+                fontsize=9
+            )
+    ax.grid(axis='x', linestyle='--', alpha=0.2)
+    fig.tight_layout()
+    return fig
+
+# Figure builders by chart key, in dashboard order.
+_FIGURE_BUILDERS = {
+    'gender': _gender_figure,
+    'diagnosis': _diagnosis_figure,
+    'visits': _visits_figure,
+    'municipality': _municipality_figure,
+}
+
+# Build one analytics chart by key.
+def create_analytics_figure(
+    key: str,
+    analytics: AnalyticsData,
+    figure_cls,
+    primary_color: str,
+    secondary_color: str
+):
+    """Return the matplotlib figure for chart ``key``, or None when it has no data."""
+    if figure_cls is None:
+        return None
+    return _FIGURE_BUILDERS[key](analytics, figure_cls, primary_color, secondary_color)
+
+# Define a type alias for analytics data dictionary
+def create_analytics_figures(
+    analytics: AnalyticsData,
+    figure_cls,
+    primary_color: str,
+    secondary_color: str
+) -> Dict[str, object]:
+    """Generate matplotlib figures for the analytics dashboard and exports."""
+    if figure_cls is None:
+        return {}
 
+    figures: Dict[str, object] = {}
+    for key in _FIGURE_BUILDERS:
+        fig = create_analytics_figure(key, analytics, figure_cls, primary_color, secondary_color)
+        if fig is not None:
+            figures[key] = fig
     return figures
@@ -31,10 +31,61 @@ SORT_FIELD_OPTIONS = {
     'Patient ID': 'patient_id',
     'Name': 'name',
     'Date of Birth': 'dob',
-    'Visit Date': 'visit_date'
+    'Visit Date': 'visit_date',
+    'Relevance': 'relevance'
 }
 
 SORT_FIELD_LABELS = {value: key for key, value in SORT_FIELD_OPTIONS.items()}
 DATE_SORT_FIELDS = {'dob', 'visit_date'}
 
+# Patient dates are stored as DATE and shown to staff in this format.
+DISPLAY_DATE_FORMAT = '%m/%d/%Y'
+
 SELECTION_MENU_OPTIONS = ['Selection...', 'Select Specific Patients', 'Select All Patients', 'Clear Selection']
+
+# Patient table paging
+PATIENT_PAGE_SIZE = 200  # rows fetched per keyset page while scrolling the patient table
+TABLE_STREAM_CHUNK_ROWS = 50  # rows inserted per Tk tick when filling the table; the first chunk is painted before the rest
+DELETE_BATCH_SIZE = 500  # patient IDs per DELETE ... WHERE patient_id IN (...) statement
+
+# Search behaviour
+SEARCH_DEBOUNCE_MS = 250  # quiet time after the last keystroke before a search query runs
+SEARCH_USE_FULLTEXT = True  # use FULLTEXT indexes for name/address/diagnosis searches when available
+RELEVANCE_SORT_FIELDS = {'relevance'}  # sort keys whose order depends on the search term
+
+# Import behaviour
+IMPORT_BATCH_SIZE = 1000  # rows sent per executemany batch during bulk imports
+IMPORT_CHUNK_SIZE = 5000  # rows read, validated and committed per chunk when streaming a file
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xltx', '.xltm')
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+# Export behaviour
+EXPORT_FETCH_SIZE = 2000  # rows pulled per round trip from the server-side cursor while exporting
+PARQUET_ROW_GROUP_SIZE = 50000  # rows per Parquet row group; larger groups compress and scan better
+
+# Startup
+LOGIN_WARM_START = True  # import the main system and prefetch the first patient page while the login screen is open
+WARM_START_MAX_AGE = 120.0  # seconds a prefetched first page stays usable; older pages are fetched again
+STARTUP_PROFILING = False  # time module imports and write a timing report once the table is filled (or set CLINIC_STARTUP_PROFILING=1)
+TIMING_REPORT_DIR = 'logs'  # folder, relative to the app, for timing reports (Ctrl+Shift+T writes one on demand)
+TIMING_REPORT_TOP_IMPORTS = 40  # slowest imports listed in each timing report
+
+# Background database work
+DB_WORKER_COUNT = 2  # worker threads serving searches, page loads, saves and analytics
+DB_FILE_WORKER_COUNT = 1  # separate worker threads for imports and exports, so they never block the table
+
+# Connection pool
+DB_POOL_SIZE = 4  # most connections open at once; leave room beyond DB_WORKER_COUNT + DB_FILE_WORKER_COUNT for login/signup
+DB_POOL_TIMEOUT = 10.0  # seconds to wait for a free connection before giving up
+DB_POOL_PING_INTERVAL = 30.0  # seconds a connection may sit idle before it is pinged on checkout
+
+# Query diagnostics
+QUERY_STATS_ENABLED = True  # time every statement on pooled cursors; the numbers appear under Diagnostics
+SLOW_QUERY_THRESHOLD_MS = 500.0  # statements slower than this are written to the slow-query log
+SLOW_QUERY_LOG = 'logs/slow_queries.log'  # relative to the app folder; statement values are never logged
+
+# Analytics
+ANALYTICS_BACKEND = 'summary'  # 'summary' reads the patient_stats counters; 'sql' runs GROUP BY queries; 'columnar' counts rows with pandas; 'python' counts rows in a loop
+ANALYTICS_CACHE_TTL = 300.0  # seconds cached analytics stay valid (bounds staleness from other workstations)
+ANALYTICS_CACHE_MAX_ENTRIES = 16  # cached results and chart sets kept before the least recently used is evicted
+CHART_RENDER_WORKERS = 1  # chart renderers for the analytics PDF; above 1 spawns worker processes (slower first export, see benchmarks/chart_benchmark.py)
@@ -0,0 +1,163 @@
+"""Thread-safe pool of MySQL connections shared by the UI and background workers."""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+from contextlib import contextmanager # For context-managed checkout
+import threading # For guarding the pool across threads
+import time # For tracking idle time
+from typing import Any, Callable, Iterator, List, Optional, Tuple # For type hinting
+
+import pymysql # MySQL database connector
+
+from .config import DB_POOL_PING_INTERVAL, DB_POOL_SIZE, DB_POOL_TIMEOUT # Pool tuning constants
+
+# Errors after which a connection cannot be trusted and must be replaced.
+CONNECTION_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+
+# Raised when no connection frees up within the checkout timeout.
+class PoolTimeoutError(RuntimeError):
+    """No pooled connection became available in time."""
+
+
+# Hand out healthy connections, opening new ones up to a fixed size.
+class ConnectionPool:
+    """Pool of connections created by ``connection_factory``.
+
+    Idle connections are pinged on checkout once they have been unused for
+    ``ping_interval`` seconds; a connection that fails the ping, or that
+    raised a connection error while checked out, is closed and replaced.
+    ``cursor_wrapper``, when given, wraps every cursor handed out by
+    ``cursor()``, for example to time the statements it runs.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], Any],
+        size: int = DB_POOL_SIZE,
+        timeout: float = DB_POOL_TIMEOUT,
+        ping_interval: float = DB_POOL_PING_INTERVAL,
+        cursor_wrapper: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self._connection_factory = connection_factory
+        self._cursor_wrapper = cursor_wrapper
+        self._size = max(int(size), 1)
+        self._timeout = timeout
+        self._ping_interval = ping_interval
+        self._idle: List[Tuple[Any, float]] = []
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    # Number of connections currently open, idle or checked out.
+    @property
+    def size(self) -> int:
+        return self._open
+
+    # Take a connection from the pool, opening one if the pool is not full.
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """Return a live connection; call ``release`` when done with it."""
+        timeout = self._timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError('Connection pool is closed.')
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                    break
+                if self._open < self._size:
+                    # Reserve the slot before connecting outside the lock.
+                    self._open += 1
+                    connection, released_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f'No database connection available after {timeout:g} seconds.')
+                self._condition.wait(remaining)
+
+        if connection is not None and not self._is_healthy(connection, released_at):
+            self._close_quietly(connection)
+            connection = None
+        if connection is None:
+            try:
+                connection = self._connection_factory()
+            except Exception:
+                self._forget()
+                raise
+        return connection
+
+    # Return a connection to the pool, or close it when it is no longer usable.
+    def release(self, connection: Any, discard: bool = False) -> None:
+        if not discard:
+            try:
+                # Never hand the next caller an open transaction.
+                connection.rollback()
+            except Exception:
+                discard = True
+        if discard:
+            self._close_quietly(connection)
+            self._forget()
+            return
+        with self._condition:
+            if self._closed:
+                self._open -= 1
+                self._close_quietly(connection)
+                return
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    # Check out a connection for the duration of a with block.
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Yield a pooled connection; it is returned (or replaced) afterwards."""
+        connection = self.acquire(timeout)
+        discard = False
+        try:
+            yield connection
+        except CONNECTION_ERRORS:
+            discard = True
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    # Check out a connection and a cursor on it for the duration of a with block.
+    @contextmanager
+    def cursor(self, timeout: Optional[float] = None) -> Iterator[Tuple[Any, Any]]:
+        """Yield ``(cursor, connection)``; commit through the connection when writing."""
+        with self.connection(timeout) as connection:
+            cursor = connection.cursor()
+            try:
+                yield (self._cursor_wrapper(cursor) if self._cursor_wrapper else cursor), connection
+            finally:
+                cursor.close()
+
+    # Close every idle connection and refuse further checkouts.
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+    def _is_healthy(self, connection: Any, released_at: float) -> bool:
+        if time.monotonic() - released_at < self._ping_interval:
+            return True
+        try:
+            connection.ping(reconnect=False)
+        except Exception:
+            return False
+        return True
+
+    def _forget(self) -> None:
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _close_quietly(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -1,8 +1,17 @@
 """Database connection helpers for the clinic management system."""
 from __future__ import annotations # Ensure compatibility with future Python versions
 
+import threading # For creating the shared pool once
+from typing import Dict, Optional # For type hinting
+
 import pymysql # MySQL database connector
 
+from .config import QUERY_STATS_ENABLED # Query instrumentation toggle
+from .connection_pool import ConnectionPool # Pooled connections shared across threads
+from .migrations import FULLTEXT_COLUMNS, apply_migrations # Versioned schema changes
+from .query_stats import query_stats # Per-query latency statistics
+from .timing import startup_timer # Startup timing for the schema check
+
 DB_NAME = 'clinicmanagementsystem'
 
 # Create a new connection to the MySQL server.
@@ -10,29 +19,76 @@ def get_connection() -> pymysql.connections.Connection:
     """Create a new connection to the MySQL server."""
     return pymysql.connect(host='localhost', user='root', password='')
 
-# Ensure the application database and patient table exist.
+# Open a new connection with the application database already selected.
+def get_database_connection() -> pymysql.connections.Connection:
+    """Create a new connection bound to the application database."""
+    connection = get_connection()
+    connection.select_db(DB_NAME)
+    return connection
+
+# Ensure the application database exists and its schema is up to date.
 def ensure_schema(cursor: pymysql.cursors.Cursor, connection: pymysql.connections.Connection) -> None:
-    """Create the application database and patient table if they do not exist."""
+    """Create the application database if needed and apply pending migrations."""
     cursor.execute(f'create database if not exists {DB_NAME}')
     cursor.execute(f'use {DB_NAME}')
-    cursor.execute(
-        'create table if not exists patient ('
-        'patient_id varchar(30) primary key, '
-        'name varchar(30), mobile varchar(30), email varchar(30), '
-        'address varchar(100), gender varchar(30), dob DATE, '
-        'diagnosis varchar(30), visit_date DATE'
-        ')'
-    )
-    cursor.execute(
-        'create table if not exists users ('
-        'username varchar(50) primary key, '
-        'password varchar(255) not null'
-        ')'
-    )
-    connection.commit()
-
-
-# Initialize shared connection and cursor for the application.
-db_connection = get_connection()
-db_cursor = db_connection.cursor()
-ensure_schema(db_cursor, db_connection)
+    apply_migrations(cursor, connection)
+
+# Report which patient columns have a FULLTEXT index and which parser it uses.
+def get_fulltext_columns(cursor: pymysql.cursors.Cursor) -> Dict[str, str]:
+    """Map indexed column names to ``'ngram'`` or ``'word'`` based on the table definition."""
+    try:
+        cursor.execute('show create table patient')
+        definition = cursor.fetchone()[1]
+    except (pymysql.MySQLError, TypeError, IndexError):
+        return {}
+
+    columns: Dict[str, str] = {}
+    for line in definition.splitlines():
+        line = line.strip()
+        if not line.startswith('FULLTEXT KEY'):
+            continue
+        try:
+            column = line.split('(', 1)[1].split(')', 1)[0].strip('`')
+        except IndexError:
+            continue
+        if column in FULLTEXT_COLUMNS:
+            columns[column] = 'ngram' if 'ngram' in line else 'word'
+    return columns
+
+# Read the server's ngram token size, which bounds the shortest term an ngram index can match.
+def get_ngram_token_size(cursor: pymysql.cursors.Cursor) -> int:
+    """Return ``@@ngram_token_size``, or the MySQL default of 2 when it cannot be read."""
+    try:
+        cursor.execute('select @@ngram_token_size')
+        return int(cursor.fetchone()[0])
+    except (pymysql.MySQLError, TypeError, ValueError, IndexError):
+        return 2
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+# Return the shared connection pool, creating the schema on first use.
+def get_pool() -> ConnectionPool:
+    """Return the application-wide connection pool.
+
+    The first call makes sure the database and tables exist; every pooled
+    connection has the application database selected. With
+    ``QUERY_STATS_ENABLED`` every statement, including the schema check, is
+    recorded in ``query_stats``.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            with startup_timer.span('ensure_schema'):
+                connection = get_connection()
+                try:
+                    cursor = connection.cursor()
+                    ensure_schema(query_stats.wrap(cursor) if QUERY_STATS_ENABLED else cursor, connection)
+                finally:
+                    connection.close()
+            _pool = ConnectionPool(
+                get_database_connection,
+                cursor_wrapper=query_stats.wrap if QUERY_STATS_ENABLED else None,
+            )
+        return _pool
@@ -0,0 +1,222 @@
+"""Background database executor that keeps queries off the Tk main thread."""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+import queue # For handing work to workers and results back to Tk
+import sys # For reporting callback errors through Tk
+import threading # For worker threads
+from typing import Any, Callable, List, Optional # For type hinting
+
+from .config import DB_FILE_WORKER_COUNT, DB_WORKER_COUNT # Number of worker threads per lane
+
+# Database work receives a cursor and its connection and returns a result.
+DatabaseWork = Callable[[Any, Any], Any]
+
+_POLL_MS = 30  # how often the Tk loop collects finished tasks
+
+
+# A unit of database work submitted to the executor.
+class DatabaseTask:
+    """Handle for submitted work; cancel it to skip it or drop its callbacks.
+
+    A cancelled task runs ``on_cancel`` (on the Tk thread) instead of its
+    result callbacks, so callers can clear state they would otherwise reset there.
+    """
+
+    def __init__(
+        self,
+        work: DatabaseWork,
+        on_success: Optional[Callable[[Any], None]],
+        on_error: Optional[Callable[[BaseException], None]],
+        cancellable: bool,
+        on_cancel: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.work = work
+        self.on_success = on_success
+        self.on_error = on_error
+        self.cancellable = cancellable
+        self.on_cancel = on_cancel
+        self._cancelled = threading.Event()
+
+    # Mark the task as cancelled; queued work is skipped and callbacks are not run.
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+# Run database work on worker threads using pooled connections.
+class DatabaseExecutor:
+    """Thread pool for database work whose callbacks run on the Tk main thread.
+
+    Each task checks a connection out of ``pool`` (a ``ConnectionPool``), so
+    dropped connections are replaced transparently. ``pool`` may also be a
+    zero-argument callable such as ``get_pool``; it is called by the first
+    worker that needs a connection, which keeps a slow schema check off the
+    Tk thread. Finished tasks
+    are delivered through ``root.after`` polling, and ``on_busy_change``
+    receives the number of outstanding tasks whenever it changes.
+
+    Work submitted with ``long_running=True`` (imports and exports) runs on
+    its own ``file_workers`` threads, so a long file job never holds the
+    workers that serve searches and page loads.
+    """
+
+    def __init__(
+        self,
+        pool,
+        root,
+        workers: int = DB_WORKER_COUNT,
+        on_busy_change: Optional[Callable[[int], None]] = None,
+        file_workers: int = DB_FILE_WORKER_COUNT,
+    ) -> None:
+        self._pool_factory: Optional[Callable[[], Any]] = pool if callable(pool) else None
+        self._pool = None if self._pool_factory is not None else pool
+        self._pool_lock = threading.Lock()
+        self._root = root
+        self._on_busy_change = on_busy_change
+        self._tasks: "queue.Queue[Optional[DatabaseTask]]" = queue.Queue()
+        self._file_tasks: "queue.Queue[Optional[DatabaseTask]]" = queue.Queue()
+        self._completed: "queue.Queue[tuple]" = queue.Queue()
+        self._outstanding: List[DatabaseTask] = []
+        self._poll_after_id = None
+        self._threads = [
+            threading.Thread(target=self._worker, args=(self._tasks,), name=f"db-worker-{index}", daemon=True)
+            for index in range(max(int(workers), 1))
+        ]
+        self._file_threads = [
+            threading.Thread(target=self._worker, args=(self._file_tasks,), name=f"db-file-worker-{index}", daemon=True)
+            for index in range(max(int(file_workers), 1))
+        ]
+        for thread in self._threads + self._file_threads:
+            thread.start()
+
+    # Queue database work; callbacks run later on the Tk thread.
+    def submit(
+        self,
+        work: DatabaseWork,
+        on_success: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        cancellable: bool = True,
+        on_cancel: Optional[Callable[[], None]] = None,
+        long_running: bool = False,
+    ) -> DatabaseTask:
+        """Run ``work(cursor, connection)`` on a worker thread.
+
+        Work that writes must commit itself; the pool rolls back any open
+        transaction when the connection is returned. ``cancel_all`` skips tasks submitted with
+        ``cancellable=False`` so writes are never dropped by the busy indicator.
+        ``on_cancel`` runs instead of ``on_success``/``on_error`` once a
+        cancelled task has been dropped. Pass ``long_running=True`` for file
+        imports and exports so they queue on the file lane.
+        """
+        task = DatabaseTask(work, on_success, on_error, cancellable, on_cancel)
+        self._outstanding.append(task)
+        (self._file_tasks if long_running else self._tasks).put(task)
+        self._notify_busy()
+        self._schedule_poll()
+        return task
+
+    # Run a callback on the Tk thread; call it from work that is still running.
+    def post(self, callback: Callable[..., None], *args) -> None:
+        self._completed.put((None, callback, args))
+
+    # Cancel every outstanding task that allows it.
+    def cancel_all(self) -> None:
+        for task in list(self._outstanding):
+            if task.cancellable:
+                task.cancel()
+
+    # Number of tasks that have not delivered their result yet.
+    @property
+    def pending(self) -> int:
+        return len(self._outstanding)
+
+    # The connection pool, or None while a deferred pool has not been created yet.
+    @property
+    def pool(self):
+        return self._pool
+
+    # Return the pool, creating a deferred one on first use.
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = self._pool_factory()
+        return self._pool
+
+    # Stop the worker threads after the queued work drains.
+    def shutdown(self) -> None:
+        for _ in self._threads:
+            self._tasks.put(None)
+        for _ in self._file_threads:
+            self._file_tasks.put(None)
+
+    def _worker(self, tasks: "queue.Queue[Optional[DatabaseTask]]") -> None:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            if task.cancelled:
+                self._completed.put((task, None, None))
+                continue
+
+            result = None
+            error: Optional[BaseException] = None
+            try:
+                with self._get_pool().cursor() as (cursor, connection):
+                    result = task.work(cursor, connection)
+            except Exception as exc:  # pylint: disable=broad-except
+                error = exc
+            self._completed.put((task, result, error))
+
+    def _schedule_poll(self) -> None:
+        if self._poll_after_id is None:
+            self._poll_after_id = self._root.after(_POLL_MS, self._poll)
+
+    def _poll(self) -> None:  # pragma: no cover - UI callback
+        self._poll_after_id = None
+        finished = False
+        while True:
+            try:
+                task, result, payload = self._completed.get_nowait()
+            except queue.Empty:
+                break
+
+            if task is None:
+                # A callback posted from a worker thread.
+                self._run_callback(result, *payload)
+                continue
+
+            finished = True
+            if task in self._outstanding:
+                self._outstanding.remove(task)
+            if task.cancelled:
+                if task.on_cancel is not None:
+                    self._run_callback(task.on_cancel)
+                continue
+            if payload is not None:
+                if task.on_error is not None:
+                    self._run_callback(task.on_error, payload)
+            elif task.on_success is not None:
+                self._run_callback(task.on_success, result)
+
+        if finished:
+            self._notify_busy()
+        if self._outstanding or not self._completed.empty():
+            self._schedule_poll()
+
+    # Run a callback without letting its errors stop the polling loop.
+    def _run_callback(self, callback: Callable[..., None], *args) -> None:
+        try:
+            callback(*args)
+        except Exception:  # pylint: disable=broad-except
+            self._root.report_callback_exception(*sys.exc_info())
+
+    def _notify_busy(self) -> None:
+        if self._on_busy_change is not None:
+            try:
+                self._on_busy_change(len(self._outstanding))
+            except Exception:
+                pass
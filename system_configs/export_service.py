@@ -1,50 +1,286 @@
 """Export helpers for patient records and analytics."""
 from __future__ import annotations # Ensure compatibility with future Python versions
 
+from concurrent.futures import Executor, ThreadPoolExecutor # For rendering charts concurrently
+from contextlib import closing # For closing the row stream on errors
+import csv # For CSV record exports
 from datetime import datetime # For handling date and time
+import gzip # For compressed JSON Lines exports
+import io # For rendering charts to PNG bytes
+from itertools import chain, islice # For re-joining peeked rows and batching
+import json # For JSON Lines exports
 import os # For file system operations
 import tempfile # For creating temporary files
-from typing import List # For type hinting
+import threading # For creating the chart pool once
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence # For type hinting
 
-import pandas # For data manipulation and Excel export
+import pymysql # For server-side (unbuffered) cursors
 
-from .analytics_service import compute_analytics, create_analytics_figures, load_all_patients #  Importing analytics functions
-from .helpers import normalize_mobile # Importing helper function for mobile number normalization
+from .analytics_cache import ANALYTICS_KEY, AnalyticsCache # Shared analytics cache
+from .analytics_service import create_analytics_figure, load_analytics #  Importing analytics functions
+from .config import CHART_RENDER_WORKERS, EXPORT_FETCH_SIZE, PARQUET_ROW_GROUP_SIZE # Export tuning constants
+from .helpers import format_date, normalize_mobile, parse_date # Importing helpers for mobile numbers and dates
+
+# Column headings used by every record export.
+RECORD_HEADERS = [
+    'Patient ID',
+    'Name',
+    'Mobile No.',
+    'Email',
+    'Address',
+    'Gender',
+    'Date of Birth',
+    'Diagnosis',
+    'Visit Date'
+]
+
+# Stream every patient row from the server without buffering the whole table.
+def iter_patient_rows(cursor, fetch_size: int = EXPORT_FETCH_SIZE) -> Iterator[Sequence]:
+    """Yield patient rows in column order through an unbuffered ``SSCursor``.
+
+    The stream uses ``cursor``'s connection, which must not run other queries
+    until the iterator is exhausted or closed.
+    """
+    stream = cursor.connection.cursor(pymysql.cursors.SSCursor)
+    try:
+        stream.execute(
+            'select patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date from patient'
+        )
+        while True:
+            rows = stream.fetchmany(fetch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        stream.close()
+
+# Format a patient row the way exports present it.
+def format_record(row: Sequence) -> List[str]:
+    """Return the export cells for a patient row, with normalized mobile numbers and display dates."""
+    return [
+        str(row[0] or ''),
+        str(row[1] or ''),
+        normalize_mobile(row[2]) or str(row[2] or ''),
+        str(row[3] or ''),
+        str(row[4] or ''),
+        str(row[5] or ''),
+        format_date(row[6]),
+        str(row[7] or ''),
+        format_date(row[8])
+    ]
+
+# Stream every patient into ``write``; empty tables and failed writes leave no file behind.
+def _export_rows(cursor, file_path: str, write: Callable[[Iterable[Sequence]], None]) -> None:
+    with closing(iter_patient_rows(cursor)) as rows:
+        first_row = next(rows, None)
+        if first_row is None:
+            raise ValueError('There are no patient records to export.')
+        try:
+            write(chain([first_row], rows))
+        except BaseException:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+            raise
 
 # Export all patient records to an Excel file.
 def export_patient_records_excel(cursor, file_path: str) -> None:
-    """Write all patients to an Excel workbook."""
-    rows = load_all_patients(cursor)
-    if not rows:
-        raise ValueError('There are no patient records to export.')
-
-    headers = [
-        'Patient ID',
-        'Name',
-        'Mobile No.',
-        'Email',
-        'Address',
-        'Gender',
-        'Date of Birth',
-        'Diagnosis',
-        'Visit Date'
-    ]
-    formatted_rows = []
-    for row in rows:
-        formatted_rows.append([
-            str(row[0] or ''),
-            str(row[1] or ''),
-            normalize_mobile(row[2]) or str(row[2] or ''),
-            str(row[3] or ''),
-            str(row[4] or ''),
-            str(row[5] or ''),
-            str(row[6] or ''),
-            str(row[7] or ''),
-            str(row[8] or '')
-        ])
-
-    table = pandas.DataFrame(formatted_rows, columns=headers)
-    table.to_excel(file_path, index=False)
+    """Write all patients to an Excel workbook, streaming rows as they arrive.
+
+    openpyxl's write-only mode spools rows to disk, so memory stays flat no
+    matter how many patients are exported.
+    """
+    from openpyxl import Workbook  # pylint: disable=import-outside-toplevel  # optional dependency
+    from openpyxl.cell import WriteOnlyCell  # pylint: disable=import-outside-toplevel
+    from openpyxl.styles import Font  # pylint: disable=import-outside-toplevel
+
+    def _write(rows: Iterable[Sequence]) -> None:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Sheet1')
+        header_font = Font(bold=True)
+        header_cells = []
+        for header in RECORD_HEADERS:
+            cell = WriteOnlyCell(sheet, value=header)
+            cell.font = header_font
+            header_cells.append(cell)
+        sheet.append(header_cells)
+        for row in rows:
+            sheet.append(format_record(row))
+        workbook.save(file_path)
+
+    _export_rows(cursor, file_path, _write)
+
+# Export all patient records to a CSV file.
+def export_patient_records_csv(cursor, file_path: str) -> None:
+    """Write all patients to a UTF-8 CSV file that the importer reads back as-is."""
+    def _write(rows: Iterable[Sequence]) -> None:
+        with open(file_path, 'w', encoding='utf-8', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(RECORD_HEADERS)
+            writer.writerows(format_record(row) for row in rows)
+
+    _export_rows(cursor, file_path, _write)
+
+# Export all patient records to a gzip-compressed JSON Lines file.
+def export_patient_records_jsonl(cursor, file_path: str) -> None:
+    """Write one JSON object per patient, keyed by the export headers, to a ``.jsonl.gz`` file."""
+    def _write(rows: Iterable[Sequence]) -> None:
+        with gzip.open(file_path, 'wt', encoding='utf-8', newline='\n') as handle:
+            for row in rows:
+                handle.write(json.dumps(dict(zip(RECORD_HEADERS, format_record(row))), ensure_ascii=False))
+                handle.write('\n')
+
+    _export_rows(cursor, file_path, _write)
+
+# Export all patient records to a Parquet file.
+def export_patient_records_parquet(cursor, file_path: str) -> None:
+    """Write all patients to Parquet, one row group per ``PARQUET_ROW_GROUP_SIZE`` rows.
+
+    Text columns hold the same values as the other exports; birth and visit
+    dates are stored as Arrow dates so readers get typed columns.
+    """
+    import pyarrow  # pylint: disable=import-outside-toplevel  # optional dependency
+    from pyarrow import parquet  # pylint: disable=import-outside-toplevel
+
+    date_headers = {RECORD_HEADERS[6], RECORD_HEADERS[8]}
+    schema = pyarrow.schema([
+        (header, pyarrow.date32() if header in date_headers else pyarrow.string()) for header in RECORD_HEADERS
+    ])
+
+    def _write(rows: Iterable[Sequence]) -> None:
+        rows = iter(rows)
+        with parquet.ParquetWriter(file_path, schema, compression='snappy') as writer:
+            while True:
+                batch = list(islice(rows, PARQUET_ROW_GROUP_SIZE))
+                if not batch:
+                    break
+                records = [format_record(row) for row in batch]
+                columns = [list(column) for column in zip(*records)]
+                columns[6] = [parse_date(row[6]) for row in batch]
+                columns[8] = [parse_date(row[8]) for row in batch]
+                writer.write_table(pyarrow.Table.from_arrays(
+                    [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+                    schema=schema,
+                ))
+
+    _export_rows(cursor, file_path, _write)
+
+# Charts included in the analytics PDF, in page order.
+CHART_KEYS = ('gender', 'diagnosis', 'municipality', 'visits')
+
+_chart_pool: Optional[Executor] = None
+_chart_pool_lock = threading.Lock()
+
+# Build and render one chart to PNG bytes; runs inside a chart worker.
+def _render_chart_png(
+    key: str,
+    analytics: Dict[str, object],
+    figure_cls,
+    primary_color: str,
+    secondary_color: str
+) -> Optional[bytes]:
+    fig = create_analytics_figure(key, analytics, figure_cls, primary_color, secondary_color)
+    if fig is None:
+        return None
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=180, bbox_inches='tight')
+    return buffer.getvalue()
+
+# Return the shared chart worker pool, or None when charts render in the calling thread.
+def _get_chart_pool(workers: int = CHART_RENDER_WORKERS) -> Optional[Executor]:
+    """Create the chart pool on first use and keep it for later exports.
+
+    Only four charts are drawn, so the pool is opt-in: every spawned worker
+    imports matplotlib before its first chart, which makes the first export
+    several times slower than rendering in the calling thread (see
+    ``benchmarks/chart_benchmark.py``). It is never larger than the CPU count.
+
+    Worker processes are always spawned, never forked: the calling process
+    runs Tk and several worker threads, which a forked child would inherit in
+    an undefined state. The launch scripts build their UI under ``main()``, so
+    a spawned worker only imports them. Charts render on threads when worker
+    processes cannot be started.
+    """
+    global _chart_pool
+    workers = min(workers, len(CHART_KEYS), os.cpu_count() or 1)
+    if workers <= 1:
+        return None
+    with _chart_pool_lock:
+        if _chart_pool is None:
+            # Process support is imported with the first PDF export, not at startup.
+            import multiprocessing  # pylint: disable=import-outside-toplevel
+            from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+            try:
+                _chart_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            except (OSError, ValueError, ImportError, NotImplementedError):
+                _chart_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chart-render')
+        return _chart_pool
+
+# Stop the chart workers; the next export starts a new pool.
+def shutdown_chart_pool() -> None:
+    """Shut down the chart worker pool if one was started."""
+    global _chart_pool
+    with _chart_pool_lock:
+        pool, _chart_pool = _chart_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+# Render each analytics chart to PNG bytes; charts without data map to None.
+def render_analytics_charts(
+    analytics: Dict[str, object],
+    figure_cls,
+    primary_color: str,
+    secondary_color: str,
+    workers: int = CHART_RENDER_WORKERS,
+) -> Dict[str, Optional[bytes]]:
+    """Render the PDF charts for ``analytics`` as PNG images.
+
+    With ``workers`` above 1 the charts render concurrently on the chart pool.
+    If the pool fails (for example a worker process died), they are rendered
+    one after another in the calling thread.
+    """
+    args = (analytics, figure_cls, primary_color, secondary_color)
+    pool = _get_chart_pool(workers)
+    if pool is not None:
+        try:
+            futures = {key: pool.submit(_render_chart_png, key, *args) for key in CHART_KEYS}
+            return {key: future.result() for key, future in futures.items()}
+        except Exception:  # pylint: disable=broad-except
+            shutdown_chart_pool()
+    return {key: _render_chart_png(key, *args) for key in CHART_KEYS}
+
+# Place a PNG on the current page from memory, using a temporary file for FPDF versions that need a path.
+def _add_png(pdf, image: bytes, x: float, width: float, temp_files: List[str]) -> None:
+    try:
+        pdf.image(io.BytesIO(image), x=x, w=width)
+        return
+    except (AttributeError, TypeError):
+        # The legacy PyFPDF 1.7 package only reads images from file names; fpdf2 reads them from memory.
+        pass
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp_file:
+        tmp_file.write(image)
+    temp_files.append(tmp_file.name)
+    pdf.image(tmp_file.name, x=x, w=width)
+
+# Reuse rendered charts while they belong to the same cached analytics result.
+def _chart_images(
+    analytics: Dict[str, object],
+    figure_cls,
+    primary_color: str,
+    secondary_color: str,
+    cache: Optional[AnalyticsCache]
+) -> Dict[str, Optional[bytes]]:
+    key = ('chart_png', primary_color, secondary_color)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None and cached[0] is analytics:
+            return cached[1]
+    charts = render_analytics_charts(analytics, figure_cls, primary_color, secondary_color)
+    if cache is not None:
+        cache.put(key, (analytics, charts))
+    return charts
 
 # Generate a PDF file summarizing patient analytics.
 def export_patient_analytics_pdf(
@@ -53,10 +289,18 @@ def export_patient_analytics_pdf(
     fpdf_cls,
     figure_cls,
     primary_color: str,
-    secondary_color: str
+    secondary_color: str,
+    cache: Optional[AnalyticsCache] = None
 ) -> None:
-    """Generate a PDF file summarizing patient analytics."""
-    analytics = compute_analytics(load_all_patients(cursor))
+    """Generate a PDF file summarizing patient analytics.
+
+    With ``cache``, analytics and rendered charts computed for the current
+    data version are reused instead of being recomputed.
+    """
+    if cache is not None:
+        analytics = cache.get_or_compute(ANALYTICS_KEY, lambda: load_analytics(cursor))
+    else:
+        analytics = load_analytics(cursor)
 
     pdf = fpdf_cls(unit='mm', format='A4')
     pdf.set_auto_page_break(auto=True, margin=15)
@@ -80,7 +324,7 @@ def export_patient_analytics_pdf(
     pdf.cell(0, 6, f"Most Recent Visit: {analytics['latest_visit']}", 0, 1)
     pdf.ln(3)
 
-    figures = create_analytics_figures(analytics, figure_cls, primary_color, secondary_color)
+    charts = _chart_images(analytics, figure_cls, primary_color, secondary_color, cache)
     chart_titles = {
         'gender': 'Gender Distribution',
         'diagnosis': 'Top Diagnoses',
@@ -88,14 +332,14 @@ def export_patient_analytics_pdf(
         'visits': 'Clinic Visits by Month'
     }
 
-# Temporary files to hold chart images
+# Temporary files, only needed when FPDF cannot read images from memory
     temp_files: List[str] = []
     try:
-        for key in ('gender', 'diagnosis', 'municipality', 'visits'):
-            fig = figures.get(key)
+        for key in CHART_KEYS:
+            image = charts.get(key)
             title = chart_titles.get(key, key.title())
 
-            if fig is None:
+            if image is None:
                 pdf.add_page()
                 pdf.set_font('Arial', 'B', 14)
                 pdf.cell(0, 10, title, 0, 1, 'C')
@@ -104,18 +348,13 @@ def export_patient_analytics_pdf(
                 pdf.multi_cell(0, 7, 'No data available for this chart.')
                 continue
 
-            tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            tmp_file.close()
-            temp_files.append(tmp_file.name)
-            fig.savefig(tmp_file.name, dpi=180, bbox_inches='tight')
-
             pdf.add_page()
             pdf.set_font('Arial', 'B', 14)
             pdf.cell(0, 10, title, 0, 1, 'C')
             pdf.ln(4)
 
             max_width = pdf.w - 20
-            pdf.image(tmp_file.name, x=10, w=max_width)
+            _add_png(pdf, image, 10, max_width, temp_files)
 
         pdf.output(file_path)
     finally:
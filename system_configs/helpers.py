@@ -1,7 +1,21 @@
 """Utility helpers for patient data normalization."""
 from __future__ import annotations # Ensure compatibility with future Python versions
 
-from typing import Optional # For type hinting
+from datetime import date, datetime # For patient date parsing and display
+import re # For recognising numeric patient IDs
+from typing import TYPE_CHECKING, Optional # For type hinting
+
+from .config import DISPLAY_DATE_FORMAT # Date format shown to staff
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import pandas
+
+# Date formats accepted from forms, imports and legacy rows, tried in order.
+DATE_INPUT_FORMATS = ('%m/%d/%Y', '%Y-%m-%d', '%Y-%m-%d %H:%M:%S')
+
+# Sort key for patient IDs that are not plain numbers; they sort after every numeric ID.
+ID_SORT_KEY_NON_NUMERIC = 2 ** 63 - 1
+_NUMERIC_PATIENT_ID = re.compile(r'[0-9]{1,18}')
 
 # Normalize a mobile phone number to the standard +63 format.
 def normalize_mobile(number: str) -> Optional[str]:
@@ -32,3 +46,72 @@ def to_proper_case(value: str) -> str:
     if not value:
         return ''
     return str(value).strip().title()
+
+# Vectorized normalize_mobile over a pandas Series; invalid numbers become ''.
+def normalize_mobile_series(numbers: pandas.Series) -> pandas.Series:
+    """Format a Series of raw phone numbers like ``normalize_mobile`` in one pass."""
+    digits = numbers.fillna('').astype(str).str.replace(r'\D', '', regex=True)
+    local = digits.str.len().eq(11) & digits.str.startswith('0')
+    digits = digits.where(~local, '63' + digits.str[1:])
+    valid = digits.str.len().eq(12) & digits.str.startswith('63')
+    formatted = '+63 ' + digits.str[2:5] + ' ' + digits.str[5:8] + ' ' + digits.str[8:12]
+    return formatted.where(valid, '')
+
+# Vectorized to_proper_case over a pandas Series.
+def to_proper_case_series(values: pandas.Series) -> pandas.Series:
+    """Convert a Series of text values to proper case like ``to_proper_case``."""
+    return values.fillna('').astype(str).str.strip().str.title()
+
+# Numeric sort key stored alongside a patient ID so ID ordering can use an index.
+def patient_id_sort_key(patient_id) -> int:
+    """Return the ID's numeric value, or ``ID_SORT_KEY_NON_NUMERIC`` for other IDs."""
+    text = str(patient_id or '').strip()
+    if _NUMERIC_PATIENT_ID.fullmatch(text):
+        return int(text)
+    return ID_SORT_KEY_NON_NUMERIC
+
+# Parse a patient date from a DATE value or any accepted text format.
+def parse_date(value) -> Optional[date]:
+    """Return a ``date`` for date objects and accepted strings, otherwise ``None``."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or '').strip()
+    for date_format in DATE_INPUT_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+# Format a stored patient date for display; unparseable text is shown as-is.
+def format_date(value) -> str:
+    """Render a patient date in ``DISPLAY_DATE_FORMAT``."""
+    if value is None:
+        return ''
+    parsed = parse_date(value)
+    if parsed is None:
+        return str(value)
+    return parsed.strftime(DISPLAY_DATE_FORMAT)
+
+# Vectorized patient_id_sort_key over a pandas Series.
+def patient_id_sort_key_series(patient_ids: pandas.Series) -> pandas.Series:
+    """Compute ``patient_id_sort_key`` for a Series of IDs; values are Python ints."""
+    text = patient_ids.fillna('').astype(str).str.strip()
+    numeric = text.str.fullmatch(_NUMERIC_PATIENT_ID.pattern)
+    return text.where(numeric, str(ID_SORT_KEY_NON_NUMERIC)).astype('int64').astype(object)
+
+# Vectorized parse_date over a pandas Series; values become ISO strings, '' when invalid.
+def parse_date_series(values: pandas.Series) -> pandas.Series:
+    """Parse a Series of date text like ``parse_date`` and return 'YYYY-MM-DD' strings."""
+    import pandas  # pylint: disable=import-outside-toplevel  # only needed for imports
+
+    text = values.fillna('').astype(str).str.strip()
+    parsed = pandas.Series(pandas.NaT, index=text.index, dtype='datetime64[ns]')
+    for date_format in DATE_INPUT_FORMATS:
+        missing = parsed.isna() & text.ne('')
+        if not missing.any():
+            break
+        parsed[missing] = pandas.to_datetime(text[missing], format=date_format, errors='coerce')
+    return parsed.dt.strftime('%Y-%m-%d').fillna('')
@@ -1,12 +1,21 @@
 """Helpers for importing patient data from external files."""
 from __future__ import annotations # Ensure compatibility with future Python versions
 
-from typing import Dict, List, Tuple # For type hinting
+import os # For file size and extension checks
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple # For type hinting
 
 import pandas # For data manipulation
 from pymysql.err import IntegrityError # For handling database integrity errors
 
-from .helpers import normalize_column_name, normalize_mobile, to_proper_case # Importing helper functions
+from .config import EXCEL_EXTENSIONS, IMPORT_BATCH_SIZE, IMPORT_CHUNK_SIZE, PARQUET_EXTENSIONS # Import tuning constants
+from .helpers import ( # Importing helper functions
+    normalize_column_name,
+    normalize_mobile_series,
+    parse_date_series,
+    patient_id_sort_key_series,
+    to_proper_case_series,
+)
+from .stats_service import apply_patient_stat_changes # Keep analytics counters in step with inserts
 
 # Define required columns mapping
 REQUIRED_COLUMNS = {
@@ -34,22 +43,27 @@ FIELD_LABELS = {
     'visit_date': 'visit date'
 }
 
-# Import patient records from a DataFrame into the database.
-def import_patient_dataframe(data_frame: pandas.DataFrame, cursor, connection) -> Tuple[int, int, List[str]]:
-    """Insert patient records from a prepared DataFrame.
+EMPTY_IMPORT_MESSAGE = 'The selected file does not contain any records.'
 
-    Returns a tuple of (inserted_count, skipped_count, sample_errors).
-    """
-    if data_frame.empty:
-        raise ValueError('The selected file does not contain any records.')
+# Columns written for each imported patient, in insert order.
+_INSERT_FIELDS = list(REQUIRED_COLUMNS) + ['id_sort_key']
 
+# Insert statement shared by the batched and row-by-row paths.
+_INSERT_PATIENT_QUERY = (
+    'insert into patient ('
+    'patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date, id_sort_key'
+    ') values (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)'
+)
+
+# Resolve the file's column headers to the required patient fields.
+def _resolve_columns(data_frame: pandas.DataFrame, required_columns: Dict[str, str]) -> Dict[str, str]:
     normalized_to_original = {
         normalize_column_name(col): col for col in data_frame.columns
     }
 
     resolved_columns: Dict[str, str] = {}
     missing_fields = []
-    for field, normalized in REQUIRED_COLUMNS.items():
+    for field, normalized in required_columns.items():
         if normalized in normalized_to_original:
             resolved_columns[field] = normalized_to_original[normalized]
         else:
@@ -58,81 +72,275 @@ def import_patient_dataframe(data_frame: pandas.DataFrame, cursor, connection) -
     if missing_fields:
         pretty_missing = ', '.join(field.replace('_', ' ').title() for field in missing_fields)
         raise KeyError(f'Missing required columns in file: {pretty_missing}')
+    return resolved_columns
+
+# Look up which of the given patient IDs already exist in the database.
+def _existing_patient_ids(cursor, patient_ids: List[str]) -> Set[str]:
+    if not patient_ids:
+        return set()
+    placeholders = ','.join(['%s'] * len(patient_ids))
+    cursor.execute(f'select patient_id from patient where patient_id in ({placeholders})', tuple(patient_ids))
+    return {str(row[0]) for row in cursor.fetchall()}
+
+# Clean and validate an imported DataFrame column-wise in a single pass.
+def normalize_patient_frame(
+    data_frame: pandas.DataFrame,
+    required_columns: Optional[Dict[str, str]] = None,
+) -> Tuple[pandas.DataFrame, pandas.Series, pandas.Series]:
+    """Normalize imported patient columns with pandas string operations.
+
+    Returns ``(cleaned, error_mask, error_messages)``: ``cleaned`` has one
+    column per patient field (dates as ISO strings) plus ``id_sort_key``, ``error_mask`` flags rows that must be skipped
+    and ``error_messages`` holds the reason for each flagged row ('' otherwise).
+    All three share the index of ``data_frame``.
+    """
+    required_columns = required_columns or REQUIRED_COLUMNS
+    resolved_columns = _resolve_columns(data_frame, required_columns)
+    fields = list(REQUIRED_COLUMNS)
+
+    cleaned = data_frame[[resolved_columns[field] for field in fields]].copy()
+    cleaned.columns = fields
+
+    # Typed date columns (e.g. from Parquet) are formatted directly instead of parsed from text.
+    typed_dates = [
+        field for field in ('dob', 'visit_date') if pandas.api.types.is_datetime64_any_dtype(cleaned[field])
+    ]
+    for field in typed_dates:
+        cleaned[field] = cleaned[field].dt.strftime('%Y-%m-%d')
+    cleaned = cleaned.fillna('').astype(str).apply(lambda column: column.str.strip())
+
+    messages = pandas.Series('', index=cleaned.index, dtype=object)
+
+    missing = cleaned.eq('')
+    missing_rows = missing.any(axis=1)
+    if missing_rows.any():
+        labels = pandas.DataFrame(
+            {field: missing[field].map({True: FIELD_LABELS[field], False: ''}) for field in fields}
+        )
+        missing_text = labels[missing_rows].apply(lambda row: ', '.join(label for label in row if label), axis=1)
+        messages[missing_rows] = 'Missing ' + missing_text + '.'
+    error_mask = missing_rows.copy()
+
+    cleaned['mobile'] = normalize_mobile_series(cleaned['mobile'])
+    bad_mobile = ~error_mask & cleaned['mobile'].eq('')
+    messages[bad_mobile] = 'Mobile number must follow +63 000 000 0000 format.'
+    error_mask |= bad_mobile
+
+    for field in ('dob', 'visit_date'):
+        if field not in typed_dates:
+            cleaned[field] = parse_date_series(cleaned[field])
+        bad_date = ~error_mask & cleaned[field].eq('')
+        messages[bad_date] = f'{FIELD_LABELS[field].capitalize()} must be a valid date (MM/DD/YYYY).'
+        error_mask |= bad_date
+
+    for field in ('name', 'address', 'diagnosis'):
+        cleaned[field] = to_proper_case_series(cleaned[field])
+    cleaned['id_sort_key'] = patient_id_sort_key_series(cleaned['patient_id'])
+
+    # Only valid rows claim an ID; an invalid earlier row must not shadow a later valid one.
+    valid_ids = cleaned.loc[~error_mask, 'patient_id']
+    repeated = valid_ids.duplicated(keep='first').reindex(cleaned.index, fill_value=False)
+    messages[repeated] = 'Patient ID already exists.'
+    error_mask |= repeated
+
+    return cleaned, error_mask, messages
+
+# Import patient records from a DataFrame into the database.
+def import_patient_dataframe(
+    data_frame: pandas.DataFrame,
+    cursor,
+    connection,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    required_columns: Optional[Dict[str, str]] = None,
+) -> Tuple[int, int, List[str]]:
+    """Insert patient records from a prepared DataFrame in batches.
+
+    Rows are cleaned by ``normalize_patient_frame``, patient IDs that already
+    exist are reported as duplicates, and the rest are inserted with
+    ``executemany`` in chunks of ``batch_size`` inside a single transaction.
+
+    Returns a tuple of (inserted_count, skipped_count, sample_errors).
+    """
+    if data_frame.empty:
+        raise ValueError(EMPTY_IMPORT_MESSAGE)
+
+    cleaned, error_mask, messages = normalize_patient_frame(data_frame, required_columns)
 
-    def get_value(row, field: str) -> str:
-        value = row[resolved_columns[field]]
-        if pandas.isna(value):
-            return ''
-        return str(value).strip()
+    # Row-level problems keyed by the DataFrame index so samples stay in file order.
+    errors: Dict[object, str] = messages[error_mask].to_dict()
 
+    candidates = cleaned[~error_mask]
     inserted = 0
-    skipped = 0
-    error_samples: List[str] = []
+    batch_size = max(int(batch_size), 1)
+    try:
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates.iloc[start:start + batch_size]
+            existing = _existing_patient_ids(cursor, batch['patient_id'].tolist())
+            if existing:
+                duplicate = batch['patient_id'].isin(existing)
+                for idx in batch.index[duplicate]:
+                    errors[idx] = 'Patient ID already exists.'
+                batch = batch[~duplicate]
+            if batch.empty:
+                continue
+
+            rows = list(batch[_INSERT_FIELDS].itertuples(index=False, name=None))
+            try:
+                cursor.executemany(_INSERT_PATIENT_QUERY, rows)
+            except Exception:  # pylint: disable=broad-except
+                pass
+            else:
+                apply_patient_stat_changes(cursor, added=rows)
+                inserted += len(rows)
+                continue
+
+            # A failed statement only undoes itself, so retry this batch row by row
+            # to keep the good rows and report the bad ones.
+            inserted_rows = []
+            for idx, row in zip(batch.index, rows):
+                try:
+                    cursor.execute(_INSERT_PATIENT_QUERY, row)
+                    inserted_rows.append(row)
+                except IntegrityError:
+                    errors[idx] = 'Patient ID already exists.'
+                except Exception as exc:  # pylint: disable=broad-except
+                    errors[idx] = str(exc)
+            apply_patient_stat_changes(cursor, added=inserted_rows)
+            inserted += len(inserted_rows)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
 
-    for idx, row in data_frame.iterrows():
+    error_samples: List[str] = []
+    for idx in sorted(errors)[:5]:
         excel_row = idx + 2  # account for header row in Excel
-        patient_id = get_value(row, 'patient_id')
-        name = get_value(row, 'name')
-        mobile = get_value(row, 'mobile')
-        email_value = get_value(row, 'email')
-        address_value = get_value(row, 'address')
-        gender_value = get_value(row, 'gender')
-        dob_value = get_value(row, 'dob')
-        diagnosis_value = get_value(row, 'diagnosis')
-        visit_date_value = get_value(row, 'visit_date')
-
-        required_values = {
-            'patient_id': patient_id,
-            'name': name,
-            'mobile': mobile,
-            'email': email_value,
-            'address': address_value,
-            'gender': gender_value,
-            'dob': dob_value,
-            'diagnosis': diagnosis_value,
-            'visit_date': visit_date_value
-        }
-
-        missing_values = [FIELD_LABELS[key] for key, value in required_values.items() if not value]
-        if missing_values:
-            skipped += 1
-            if len(error_samples) < 5:
-                missing_text = ', '.join(missing_values)
-                error_samples.append(f'Row {excel_row}: Missing {missing_text}.')
-            continue
+        error_samples.append(f'Row {excel_row}: {errors[idx]}')
+
+    return inserted, len(errors), error_samples
+
+# Convert an openpyxl cell value to the text pandas would read with dtype=str.
+def _excel_cell_text(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+# Stream an Excel worksheet in DataFrame chunks using openpyxl's read-only mode.
+def _iter_excel_chunks(file_path: str, chunk_size: int) -> Iterator[Tuple[pandas.DataFrame, Optional[float]]]:
+    import openpyxl  # pylint: disable=import-outside-toplevel
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(value) if value is not None else f'Unnamed: {index}' for index, value in enumerate(header)]
+        total_rows = (sheet.max_row - 1) if sheet.max_row else None
+
+        start = 0
+        chunk: List[List[Optional[str]]] = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            chunk.append([_excel_cell_text(value) for value in row[:len(columns)]])
+            if len(chunk) >= chunk_size:
+                frame = pandas.DataFrame(chunk, columns=columns, index=range(start, start + len(chunk)))
+                start += len(chunk)
+                chunk = []
+                yield frame, (min(start / total_rows, 1.0) if total_rows else None)
+        if chunk:
+            yield pandas.DataFrame(chunk, columns=columns, index=range(start, start + len(chunk))), 1.0
+    finally:
+        workbook.close()
+
+# Stream a CSV file in DataFrame chunks, reporting progress from the file position.
+def _iter_csv_chunks(file_path: str, chunk_size: int) -> Iterator[Tuple[pandas.DataFrame, Optional[float]]]:
+    total_bytes = os.path.getsize(file_path) or None
+    with open(file_path, 'rb') as handle:
+        for frame in pandas.read_csv(handle, dtype=str, chunksize=chunk_size):
+            fraction = min(handle.tell() / total_bytes, 1.0) if total_bytes else None
+            yield frame, fraction
+
+# Stream a Parquet file in DataFrame chunks, one Arrow record batch at a time.
+def _iter_parquet_chunks(file_path: str, chunk_size: int) -> Iterator[Tuple[pandas.DataFrame, Optional[float]]]:
+    from pyarrow import parquet  # pylint: disable=import-outside-toplevel  # optional dependency
+
+    parquet_file = parquet.ParquetFile(file_path)
+    try:
+        total_rows = parquet_file.metadata.num_rows or None
+        start = 0
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            # Dates stay datetime64 columns so validation can skip text parsing.
+            frame = batch.to_pandas(date_as_object=False)
+            frame.index = range(start, start + len(frame))
+            start += len(frame)
+            yield frame, (min(start / total_rows, 1.0) if total_rows else None)
+    finally:
+        parquet_file.close()
+
+# Read an import file lazily, one chunk of rows at a time.
+def iter_import_chunks(
+    file_path: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> Iterator[Tuple[pandas.DataFrame, Optional[float]]]:
+    """Yield ``(chunk, fraction_done)`` pairs for a CSV, Excel or Parquet file.
+
+    Chunks keep a continuous index across the file so row numbers in error
+    messages match the spreadsheet. ``fraction_done`` is ``None`` when the
+    total size cannot be determined up front.
+    """
+    chunk_size = max(int(chunk_size), 1)
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in EXCEL_EXTENSIONS:
+        return _iter_excel_chunks(file_path, chunk_size)
+    if extension in PARQUET_EXTENSIONS:
+        return _iter_parquet_chunks(file_path, chunk_size)
+    return _iter_csv_chunks(file_path, chunk_size)
+
+# Import a file chunk by chunk, committing and reporting progress after each one.
+def import_patient_file(
+    file_path: str,
+    cursor,
+    connection,
+    progress_callback: Optional[Callable[[Optional[float], int, int, int], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    required_columns: Optional[Dict[str, str]] = None,
+) -> Tuple[int, int, List[str]]:
+    """Stream patient records from a CSV, Excel or Parquet file into the database.
+
+    ``progress_callback`` receives ``(fraction_done, rows_read, inserted, skipped)``
+    after every chunk. When ``should_cancel`` returns true the import stops
+    after the current chunk; chunks already committed are kept.
+
+    Returns a tuple of (inserted_count, skipped_count, sample_errors).
+    """
+    inserted = 0
+    skipped = 0
+    rows_read = 0
+    error_samples: List[str] = []
 
-        formatted_mobile = normalize_mobile(mobile)
-        if not formatted_mobile:
-            skipped += 1
-            if len(error_samples) < 5:
-                error_samples.append(f'Row {excel_row}: Mobile number must follow +63 000 000 0000 format.')
+    for chunk, fraction in iter_import_chunks(file_path, chunk_size):
+        if chunk.empty:
             continue
+        chunk_inserted, chunk_skipped, chunk_errors = import_patient_dataframe(
+            chunk, cursor, connection, batch_size=batch_size, required_columns=required_columns
+        )
+        inserted += chunk_inserted
+        skipped += chunk_skipped
+        rows_read += len(chunk)
+        error_samples.extend(chunk_errors[:5 - len(error_samples)])
 
-        name = to_proper_case(name)
-        address_value = to_proper_case(address_value)
-        diagnosis_value = to_proper_case(diagnosis_value)
-
-        try:
-            query = (
-                'insert into patient ('
-                'patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date'
-                ') values (%s,%s,%s,%s,%s,%s,%s,%s,%s)'
-            )
-            cursor.execute(query, (
-                patient_id, name, formatted_mobile, email_value, address_value, gender_value,
-                dob_value, diagnosis_value, visit_date_value
-            ))
-            connection.commit()
-            inserted += 1
-        except IntegrityError:
-            connection.rollback()
-            skipped += 1
-            if len(error_samples) < 5:
-                error_samples.append(f'Row {excel_row}: Patient ID already exists.')
-        except Exception as exc:  # pylint: disable=broad-except
-            connection.rollback()
-            skipped += 1
-            if len(error_samples) < 5:
-                error_samples.append(f'Row {excel_row}: {exc}')
+        if progress_callback is not None:
+            progress_callback(fraction, rows_read, inserted, skipped)
+        if should_cancel is not None and should_cancel():
+            break
 
+    if rows_read == 0:
+        raise ValueError(EMPTY_IMPORT_MESSAGE)
     return inserted, skipped, error_samples
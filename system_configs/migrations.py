@@ -0,0 +1,248 @@
+"""Versioned schema migrations for the clinic database."""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+from typing import Callable, List, NamedTuple, Optional # For type hinting
+
+import pymysql # MySQL database connector
+
+from .helpers import ID_SORT_KEY_NON_NUMERIC, parse_date # Sort key sentinel and legacy date parsing
+from .stats_service import rebuild_patient_stats # Initial fill of the analytics counters
+
+# Patient columns that get a FULLTEXT index for indexed substring search.
+FULLTEXT_COLUMNS = ('name', 'address', 'diagnosis')
+
+# Patient columns stored as DATE, and the plain indexes that serve each sort option.
+DATE_COLUMNS = ('dob', 'visit_date')
+SORT_INDEXES = {
+    'idx_patient_name': 'name',
+    'idx_patient_dob': 'dob',
+    'idx_patient_visit_date': 'visit_date',
+    'idx_patient_id_sort_key': 'id_sort_key',
+}
+
+# Named lock that keeps two app instances from migrating the same database at once.
+_MIGRATION_LOCK = 'clinicmanagementsystem_schema_migration'
+_MIGRATION_LOCK_TIMEOUT = 60  # seconds to wait for another instance to finish migrating
+
+# MySQL error codes for an index name already in use and a missing full-text parser plugin.
+_ER_DUP_KEYNAME = 1061
+_ER_PARSER_UNAVAILABLE = (1128, 1524)  # "Function 'ngram' is not defined", plugin not loaded
+
+
+# One ordered schema change; ``apply`` receives a cursor on the application database.
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable[[pymysql.cursors.Cursor], None]
+
+
+# Check whether a table has a column.
+def column_exists(cursor: pymysql.cursors.Cursor, table: str, column: str) -> bool:
+    """Return True when ``table`` in the current database has ``column``."""
+    cursor.execute(
+        'select count(*) from information_schema.columns '
+        'where table_schema=database() and table_name=%s and column_name=%s',
+        (table, column),
+    )
+    return bool(cursor.fetchone()[0])
+
+# Check whether a table has an index with the given name.
+def index_exists(cursor: pymysql.cursors.Cursor, table: str, index_name: str) -> bool:
+    """Return True when ``table`` in the current database has ``index_name``."""
+    cursor.execute(
+        'select count(*) from information_schema.statistics '
+        'where table_schema=database() and table_name=%s and index_name=%s',
+        (table, index_name),
+    )
+    return bool(cursor.fetchone()[0])
+
+# Run an ALTER TABLE online when the server allows it, otherwise with its default locking.
+def alter_table_online(cursor: pymysql.cursors.Cursor, table: str, change: str) -> None:
+    """Apply ``change`` with ALGORITHM=INPLACE, LOCK=NONE, falling back to a plain ALTER.
+
+    Servers that cannot make a given change in place (older MySQL, MariaDB
+    or FULLTEXT indexes) reject the online clause, and the change is retried
+    so it still applies, only with a table lock.
+    """
+    try:
+        cursor.execute(f'alter table {table} {change}, algorithm=inplace, lock=none')
+    except pymysql.MySQLError:
+        cursor.execute(f'alter table {table} {change}')
+
+# Add an index unless one with the same name already exists.
+def add_index(cursor: pymysql.cursors.Cursor, table: str, index_name: str, definition: str) -> None:
+    """Create ``index_name`` on ``table`` with the given column ``definition`` online."""
+    if not index_exists(cursor, table, index_name):
+        alter_table_online(cursor, table, f'add index {index_name} ({definition})')
+
+# Migration 1: the original patient and users tables.
+def _create_base_tables(cursor: pymysql.cursors.Cursor) -> None:
+    cursor.execute(
+        'create table if not exists patient ('
+        'patient_id varchar(30) primary key, '
+        'name varchar(30), mobile varchar(30), email varchar(30), '
+        'address varchar(100), gender varchar(30), dob DATE, '
+        'diagnosis varchar(30), visit_date DATE'
+        ')'
+    )
+    cursor.execute(
+        'create table if not exists users ('
+        'username varchar(50) primary key, '
+        'password varchar(255) not null'
+        ')'
+    )
+
+# Migration 2: convert legacy text date columns (MM/DD/YYYY) to real DATE columns.
+def _convert_date_columns(cursor: pymysql.cursors.Cursor) -> None:
+    cursor.execute(
+        'select column_name, data_type from information_schema.columns '
+        "where table_schema=database() and table_name='patient'"
+    )
+    data_types = {str(row[0]).lower(): str(row[1]).lower() for row in cursor.fetchall()}
+    legacy = [column for column in DATE_COLUMNS if data_types.get(column, 'date') != 'date']
+    if not legacy:
+        return
+
+    # Parse in Python: STR_TO_DATE raises on bad values under strict SQL mode.
+    cursor.execute(f"select patient_id, {', '.join(legacy)} from patient")
+    updates = []
+    for row in cursor.fetchall():
+        values = [parse_date(value) for value in row[1:]]
+        updates.append(tuple(value.isoformat() if value else None for value in values) + (row[0],))
+    if updates:
+        assignments = ', '.join(f'{column}=%s' for column in legacy)
+        cursor.executemany(f'update patient set {assignments} where patient_id=%s', updates)
+    # Changing a column type copies the table, so it cannot run in place.
+    cursor.execute('alter table patient ' + ', '.join(f'modify {column} DATE' for column in legacy))
+
+# Migration 3: add the numeric patient ID sort key and fill it for existing rows.
+def _add_id_sort_key(cursor: pymysql.cursors.Cursor) -> None:
+    if column_exists(cursor, 'patient', 'id_sort_key'):
+        return
+    alter_table_online(
+        cursor, 'patient', f'add column id_sort_key bigint not null default {ID_SORT_KEY_NON_NUMERIC}'
+    )
+    cursor.execute(
+        "update patient set id_sort_key = cast(patient_id as unsigned) where patient_id regexp '^[0-9]{1,18}$'"
+    )
+
+# Migration 4: plain indexes that let every sort option read rows in index order.
+def _add_sort_indexes(cursor: pymysql.cursors.Cursor) -> None:
+    for index_name, column in SORT_INDEXES.items():
+        add_index(cursor, 'patient', index_name, column)
+
+# Migration 5: FULLTEXT indexes for the searchable columns, preferring the ngram parser.
+def _add_fulltext_indexes(cursor: pymysql.cursors.Cursor) -> None:
+    # With the default stopword list the ngram parser drops every token that
+    # contains a stopword ("a", "i", ...), so names like "Maria" would have no
+    # indexed tokens. The setting is read when an index is built.
+    try:
+        cursor.execute('select @@session.innodb_ft_enable_stopword')
+        previous = cursor.fetchone()[0]
+        cursor.execute('set session innodb_ft_enable_stopword = 0')
+    except pymysql.MySQLError:
+        previous = None  # servers without this setting build the indexes as they are
+    try:
+        for column in FULLTEXT_COLUMNS:
+            if not index_exists(cursor, 'patient', f'ft_patient_{column}'):
+                _add_fulltext_index(cursor, column)
+    finally:
+        if previous is not None:
+            cursor.execute('set session innodb_ft_enable_stopword = %s', (previous,))
+
+# Add one FULLTEXT index, preferring the ngram parser.
+def _add_fulltext_index(cursor: pymysql.cursors.Cursor, column: str) -> None:
+    index_name = f'ft_patient_{column}'
+    try:
+        cursor.execute(f'alter table patient add fulltext index {index_name} ({column}) with parser ngram')
+        return
+    except pymysql.MySQLError as exc:
+        if exc.args and exc.args[0] == _ER_DUP_KEYNAME:
+            return
+        if not exc.args or exc.args[0] not in _ER_PARSER_UNAVAILABLE:
+            raise
+    # Servers without the ngram plugin get a word-parser index instead.
+    try:
+        cursor.execute(f'alter table patient add fulltext index {index_name} ({column})')
+    except pymysql.MySQLError as exc:
+        if not exc.args or exc.args[0] != _ER_DUP_KEYNAME:
+            raise
+
+# Migration 6: analytics counter table, filled from the existing patients.
+def _create_patient_stats(cursor: pymysql.cursors.Cursor) -> None:
+    cursor.execute(
+        'create table if not exists patient_stats ('
+        'dimension varchar(20) not null, '
+        # Binary collation keeps labels distinct exactly as Python counts them.
+        'label varchar(100) character set utf8mb4 collate utf8mb4_bin not null, '
+        'patient_count int not null default 0, '
+        'primary key (dimension, label)'
+        ')'
+    )
+    rebuild_patient_stats(cursor)
+
+
+# Every schema change in the order it must be applied. Append new steps with the
+# next version number; never edit or reorder a step that has shipped. Steps must
+# be safe to re-run because databases created before versioning start at 0.
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'Create patient and users tables', _create_base_tables),
+    Migration(2, 'Store dob and visit_date as DATE', _convert_date_columns),
+    Migration(3, 'Add numeric patient ID sort key', _add_id_sort_key),
+    Migration(4, 'Add sort indexes on name, dob, visit_date and id_sort_key', _add_sort_indexes),
+    Migration(5, 'Add FULLTEXT indexes on name, address and diagnosis', _add_fulltext_indexes),
+    Migration(6, 'Create patient_stats analytics counters', _create_patient_stats),
+]
+
+
+# Create the table that records which migrations have been applied.
+def _ensure_version_table(cursor: pymysql.cursors.Cursor) -> None:
+    cursor.execute(
+        'create table if not exists schema_version ('
+        'version int primary key, '
+        'description varchar(255) not null, '
+        'applied_at datetime not null default current_timestamp'
+        ')'
+    )
+
+# Return the highest applied migration version, or 0 for an unversioned database.
+def get_schema_version(cursor: pymysql.cursors.Cursor) -> int:
+    """Return the current schema version of the selected database."""
+    _ensure_version_table(cursor)
+    cursor.execute('select coalesce(max(version), 0) from schema_version')
+    return int(cursor.fetchone()[0])
+
+# Apply every migration newer than the database's schema version.
+def apply_migrations(
+    cursor: pymysql.cursors.Cursor,
+    connection: pymysql.connections.Connection,
+    migrations: Optional[List[Migration]] = None,
+) -> List[int]:
+    """Bring the selected database up to date and return the versions applied.
+
+    Each step is recorded in ``schema_version`` and committed on its own, so
+    an interrupted run resumes at the failed step next time. A named lock
+    keeps concurrent app instances from migrating the same database twice.
+    """
+    migrations = sorted(MIGRATIONS if migrations is None else migrations, key=lambda step: step.version)
+    cursor.execute('select get_lock(%s, %s)', (_MIGRATION_LOCK, _MIGRATION_LOCK_TIMEOUT))
+    if not cursor.fetchone()[0]:
+        raise RuntimeError('Timed out waiting for another instance to finish migrating the database.')
+
+    applied: List[int] = []
+    try:
+        current = get_schema_version(cursor)
+        for step in migrations:
+            if step.version <= current:
+                continue
+            step.apply(cursor)
+            cursor.execute(
+                'insert into schema_version (version, description) values (%s, %s)',
+                (step.version, step.description),
+            )
+            connection.commit()
+            applied.append(step.version)
+    finally:
+        cursor.execute('select release_lock(%s)', (_MIGRATION_LOCK,))
+        cursor.fetchone()
+    return applied
@@ -0,0 +1,62 @@
+"""Deferred loading of heavy optional dependencies (matplotlib, fpdf, openpyxl, pyarrow)."""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+import importlib # For importing dependencies on first use
+import importlib.util # For checking availability without importing
+import threading # For loading from the Tk thread and database workers alike
+from typing import Callable, Dict, Optional, Tuple # For type hinting
+
+_loaded: Dict[str, object] = {}
+_load_lock = threading.Lock()
+
+# Check whether a module can be imported, without importing it.
+def is_available(module_name: str) -> bool:
+    """Return True when ``module_name`` is installed; only the import system's finders run."""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+HAS_FPDF = is_available('fpdf')
+HAS_MATPLOTLIB = is_available('matplotlib')
+HAS_OPENPYXL = is_available('openpyxl')
+HAS_PYARROW = is_available('pyarrow')
+
+# Import a dependency once and remember the result; failures are remembered as None.
+def _load(name: str, loader: Callable[[], object]) -> Optional[object]:
+    with _load_lock:
+        if name not in _loaded:
+            try:
+                _loaded[name] = loader()
+            except Exception:  # pylint: disable=broad-except
+                _loaded[name] = None
+        return _loaded[name]
+
+# Import matplotlib for embedding in Tk and return its figure and canvas classes.
+def _import_matplotlib() -> Tuple[type, type]:
+    matplotlib = importlib.import_module('matplotlib')
+    matplotlib.use('TkAgg')
+    figure_cls = importlib.import_module('matplotlib.figure').Figure
+    canvas_cls = importlib.import_module('matplotlib.backends.backend_tkagg').FigureCanvasTkAgg
+    return figure_cls, canvas_cls
+
+# Return fpdf's FPDF class, importing fpdf on first use.
+def load_fpdf_cls() -> Optional[type]:
+    """Return ``fpdf.FPDF``, or None when fpdf is missing or broken."""
+    if not HAS_FPDF:
+        return None
+    return _load('fpdf', lambda: importlib.import_module('fpdf').FPDF)
+
+# Return matplotlib's Figure and FigureCanvasTkAgg classes, importing matplotlib on first use.
+def load_figure_classes() -> Tuple[Optional[type], Optional[type]]:
+    """Return ``(Figure, FigureCanvasTkAgg)``, or ``(None, None)`` without matplotlib."""
+    if not HAS_MATPLOTLIB:
+        return None, None
+    classes = _load('matplotlib', _import_matplotlib)
+    return classes if classes is not None else (None, None)
+
+# Return matplotlib's Figure class, importing matplotlib on first use.
+def load_figure_cls() -> Optional[type]:
+    """Return ``matplotlib.figure.Figure``, or None without matplotlib."""
+    return load_figure_classes()[0]
@@ -0,0 +1,212 @@
+"""Per-query latency and row statistics gathered from instrumented cursors."""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+from bisect import bisect_left # For finding a latency's histogram bucket
+from collections import deque # For the recent slow-query list
+from datetime import datetime # For slow-query log timestamps
+from functools import lru_cache # For normalizing each distinct statement once
+from pathlib import Path # For the slow-query log location
+import re # For reducing statements to their shape
+import threading # For recording from worker threads
+import time # For timing statements
+from typing import Any, Deque, Dict, List, Optional, Tuple # For type hinting
+
+from .config import SLOW_QUERY_LOG, SLOW_QUERY_THRESHOLD_MS # Slow-query settings
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Upper bounds (milliseconds) of the latency histogram buckets; slower queries land in a final overflow bucket.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_MAX_SHAPE_LENGTH = 300
+_RECENT_SLOW_QUERIES = 50
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|%\(\w+\)s')
+_VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+# Reduce a statement to its shape so calls that differ only in values are grouped.
+@lru_cache(maxsize=1024)
+def query_shape(statement: str) -> str:
+    """Collapse whitespace and replace literals, placeholders and value lists with ``?``.
+
+    ``where patient_id in (%s, %s, %s)`` becomes ``where patient_id in (?)``,
+    so batched statements of any size share one entry.
+    """
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    shape = _STRING_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER.sub('?', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _VALUE_LIST.sub('(?)', shape)
+    if len(shape) > _MAX_SHAPE_LENGTH:
+        shape = shape[:_MAX_SHAPE_LENGTH - 3] + '...'
+    return shape
+
+
+# Running totals and latency histogram for one query shape.
+class _ShapeStats:
+    __slots__ = ('calls', 'errors', 'rows', 'total', 'max', 'buckets')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    # Latency (ms) below which ``fraction`` of the calls finished, read from the histogram.
+    def percentile(self, fraction: float) -> float:
+        target = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return min(float(LATENCY_BUCKETS_MS[index]), self.max * 1000)
+                break
+        return self.max * 1000
+
+
+# Collect statistics per query shape and log statements slower than a threshold.
+class QueryStats:
+    """Thread-safe statistics for every statement run through ``InstrumentedCursor``.
+
+    Statement parameters are never stored or logged; patient data stays out
+    of the diagnostics window and the slow-query log.
+    """
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+        slow_log_path: Optional[Path] = BASE_DIR / SLOW_QUERY_LOG,
+    ) -> None:
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_log_path = slow_log_path
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._shapes: Dict[str, _ShapeStats] = {}
+        self._slow: Deque[Tuple[str, float, int, str]] = deque(maxlen=_RECENT_SLOW_QUERIES)
+        self._since = datetime.now()
+
+    # Record one statement's latency and row count.
+    def record(self, statement: str, seconds: float, rows: int, error: bool = False) -> None:
+        shape = query_shape(statement if isinstance(statement, str) else str(statement))
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                stats = self._shapes[shape] = _ShapeStats()
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.rows += max(int(rows), 0)
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        if elapsed_ms >= self.slow_threshold_ms:
+            self._log_slow(shape, elapsed_ms, rows)
+
+    # Wrap a DB-API cursor so its statements are recorded here.
+    def wrap(self, cursor: Any) -> "InstrumentedCursor":
+        return InstrumentedCursor(cursor, self)
+
+    # Per-shape statistics, slowest total time first.
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return one dict per query shape with calls, rows, latency figures and the histogram."""
+        with self._lock:
+            entries = []
+            for shape, stats in self._shapes.items():
+                entries.append({
+                    'shape': shape,
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'rows': stats.rows,
+                    'total_ms': stats.total * 1000,
+                    'avg_ms': stats.total * 1000 / stats.calls,
+                    'p50_ms': stats.percentile(0.5),
+                    'p95_ms': stats.percentile(0.95),
+                    'max_ms': stats.max * 1000,
+                    'histogram': list(zip(LATENCY_BUCKETS_MS + (None,), stats.buckets)),
+                })
+        return sorted(entries, key=lambda entry: entry['total_ms'], reverse=True)
+
+    # Most recent slow statements as (timestamp, milliseconds, rows, shape), newest first.
+    def slow_queries(self) -> List[Tuple[str, float, int, str]]:
+        with self._lock:
+            return list(reversed(self._slow))
+
+    # When the current statistics started.
+    @property
+    def since(self) -> datetime:
+        return self._since
+
+    # Drop every statistic gathered so far; the slow-query log file is kept.
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+            self._slow.clear()
+            self._since = datetime.now()
+
+    def _log_slow(self, shape: str, elapsed_ms: float, rows: int) -> None:
+        timestamp = datetime.now().isoformat(timespec='seconds')
+        thread = threading.current_thread().name
+        with self._lock:
+            self._slow.append((timestamp, elapsed_ms, rows, shape))
+        if self.slow_log_path is None:
+            return
+        try:
+            with self._log_lock:
+                self.slow_log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.slow_log_path, 'a', encoding='utf-8') as log_file:
+                    log_file.write(f'{timestamp} {elapsed_ms:.1f} ms rows={rows} thread={thread} {shape}\n')
+        except OSError:
+            pass  # a full or read-only disk must not break database work
+
+
+# Cursor proxy that times execute/executemany and counts the rows they return or change.
+class InstrumentedCursor:
+    """Delegate to ``cursor`` while recording each statement in ``stats``.
+
+    Buffered PyMySQL cursors fetch the whole result inside ``execute``, so
+    the recorded latency covers the server round trip and the transfer, and
+    ``rowcount`` gives the rows returned (or changed, for writes).
+    """
+
+    def __init__(self, cursor: Any, stats: QueryStats) -> None:
+        self._cursor = cursor
+        self._stats = stats
+
+    def execute(self, query, args=None):
+        return self._timed(self._cursor.execute, query, args)
+
+    def executemany(self, query, args):
+        return self._timed(self._cursor.executemany, query, args)
+
+    def _timed(self, method, query, args):
+        start = time.perf_counter()
+        try:
+            result = method(query, args)
+        except Exception:
+            self._stats.record(query, time.perf_counter() - start, 0, error=True)
+            raise
+        rows = getattr(self._cursor, 'rowcount', 0)
+        self._stats.record(query, time.perf_counter() - start, rows if isinstance(rows, int) else 0)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self) -> "InstrumentedCursor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._cursor.close()
+
+
+# Process-wide statistics shared by the connection pool and the diagnostics window.
+query_stats = QueryStats()
@@ -0,0 +1,98 @@
+"""Incrementally maintained patient counters behind the analytics dashboard."""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+from collections import Counter # For accumulating counter deltas
+from typing import Iterable, List, Sequence, Tuple # For type hinting
+
+from .analytics_service import municipality_of # Municipality extraction shared with analytics
+from .helpers import parse_date, to_proper_case # Importing helpers for dates and proper case conversion
+
+# Counters kept in patient_stats; visit_month labels are 'YYYY-MM'.
+STAT_DIMENSIONS = ('gender', 'municipality', 'diagnosis', 'visit_month')
+
+_REBUILD_FETCH_SIZE = 5000  # patient rows read per round trip while rebuilding
+
+# Add a delta to a counter row, creating the row when it does not exist yet.
+_UPSERT_STAT_QUERY = (
+    'insert into patient_stats (dimension, label, patient_count) values (%s, %s, %s) '
+    'on duplicate key update patient_count = patient_count + values(patient_count)'
+)
+
+# Counter labels a patient row contributes to, using the same rules as compute_analytics.
+def patient_stat_labels(record: Sequence) -> List[Tuple[str, str]]:
+    """Return ``(dimension, label)`` pairs for a row in patient column order."""
+    labels = [
+        ('gender', to_proper_case(record[5]) or 'Unspecified'),
+        ('municipality', municipality_of(record[4])),
+        ('diagnosis', to_proper_case(record[7]) or 'Unspecified'),
+    ]
+    visit_date = parse_date(record[8])
+    if visit_date is not None:
+        labels.append(('visit_month', visit_date.strftime('%Y-%m')))
+    return labels
+
+# Apply the counter changes for added and removed patient rows.
+def apply_patient_stat_changes(
+    cursor,
+    added: Iterable[Sequence] = (),
+    removed: Iterable[Sequence] = (),
+) -> None:
+    """Update ``patient_stats`` for written rows; the caller commits with its own write.
+
+    Pass the old row in ``removed`` and the new row in ``added`` for updates.
+    """
+    deltas: Counter = Counter()
+    for record in added:
+        for key in patient_stat_labels(record):
+            deltas[key] += 1
+    for record in removed:
+        for key in patient_stat_labels(record):
+            deltas[key] -= 1
+
+    changes = [(dimension, label, delta) for (dimension, label), delta in deltas.items() if delta]
+    if not changes:
+        return
+    cursor.executemany(_UPSERT_STAT_QUERY, changes)
+    if any(delta < 0 for _, _, delta in changes):
+        cursor.execute('delete from patient_stats where patient_count <= 0')
+
+# Recount every patient into patient_stats, replacing counters that have drifted.
+def rebuild_patient_stats(cursor) -> int:
+    """Rebuild the counters from the patient table and return the patients counted.
+
+    Run it after editing patients outside the app. The caller commits.
+    """
+    cursor.execute(
+        'select patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date from patient'
+    )
+    counts: Counter = Counter()
+    patients = 0
+    while True:
+        rows = cursor.fetchmany(_REBUILD_FETCH_SIZE)
+        if not rows:
+            break
+        patients += len(rows)
+        for record in rows:
+            for key in patient_stat_labels(record):
+                counts[key] += 1
+
+    cursor.execute('delete from patient_stats')
+    if counts:
+        cursor.executemany(
+            'insert into patient_stats (dimension, label, patient_count) values (%s, %s, %s)',
+            [(dimension, label, count) for (dimension, label), count in counts.items()],
+        )
+    return patients
+
+# Rebuild the counters from the command line: python -m system_configs.stats_service
+def main() -> None:
+    from .database import get_pool  # pylint: disable=import-outside-toplevel  # avoids an import cycle
+
+    with get_pool().cursor() as (cursor, connection):
+        patients = rebuild_patient_stats(cursor)
+        connection.commit()
+    print(f'Rebuilt analytics counters for {patients} patient(s).')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""Startup timing: phase markers, background spans, import times and reports.
+
+Import this module before anything heavy; the startup timer starts here,
+and when startup profiling is on every later module import is timed too.
+"""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+import builtins # For wrapping __import__ while profiling imports
+from contextlib import contextmanager # For timing spans with a with-block
+from datetime import datetime # For report timestamps and file names
+import json # For writing reports
+import os # For the profiling environment switch
+from pathlib import Path # For report locations
+import platform # For describing the machine in reports
+import sys # For checking which modules are already loaded
+import threading # For marks made by the Tk thread and background threads alike
+import time # For high-resolution timestamps
+from typing import Any, Dict, Iterator, List, Optional, Tuple # For type hinting
+
+from .config import STARTUP_PROFILING, TIMING_REPORT_DIR, TIMING_REPORT_TOP_IMPORTS # Timing settings
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Environment switch that turns startup profiling on without editing config.py.
+PROFILING_ENV_VAR = 'CLINIC_STARTUP_PROFILING'
+
+
+# Record the end of each named phase relative to a common start time.
+class PhaseTimer:
+    """Collect ``(phase, duration, elapsed)`` timings in the order phases finish.
+
+    ``mark`` closes the phase that began at the previous mark (or at the
+    start), so each phase is named after the work that just completed.
+    Work that overlaps the phases, such as background preloading, is
+    recorded separately with ``span``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._marks: List[Tuple[str, float]] = []
+        self._spans: List[Tuple[str, float, float, str]] = []
+
+    # Forget earlier marks and measure from now.
+    def restart(self) -> None:
+        with self._lock:
+            self._start = time.perf_counter()
+            self._marks.clear()
+            self._spans.clear()
+
+    # Close the current phase and return how long it took, in seconds.
+    def mark(self, phase: str) -> float:
+        now = time.perf_counter()
+        with self._lock:
+            previous = self._marks[-1][1] if self._marks else self._start
+            self._marks.append((phase, now))
+        return now - previous
+
+    # Time a block of work on any thread without closing a phase.
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self._spans.append((name, start, end, threading.current_thread().name))
+
+    # Seconds since the start, without closing a phase.
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    # Recorded phases as (name, seconds in the phase, seconds since the start).
+    def phases(self) -> List[Tuple[str, float, float]]:
+        with self._lock:
+            previous = self._start
+            result = []
+            for phase, at in self._marks:
+                result.append((phase, at - previous, at - self._start))
+                previous = at
+            return result
+
+    # Recorded spans as (name, seconds since the start when it began, seconds taken, thread name).
+    def spans(self) -> List[Tuple[str, float, float, str]]:
+        with self._lock:
+            return [(name, start - self._start, end - start, thread) for name, start, end, thread in self._spans]
+
+
+# Process-wide timer for launching the app; it starts when this module is imported.
+startup_timer = PhaseTimer()
+
+
+# Whether imports are timed and a report is written once the patient table is ready.
+def profiling_enabled() -> bool:
+    """Return True when ``STARTUP_PROFILING`` or ``CLINIC_STARTUP_PROFILING=1`` asks for it."""
+    return STARTUP_PROFILING or os.environ.get(PROFILING_ENV_VAR, '') not in ('', '0')
+
+
+_original_import = builtins.__import__
+_import_times: Dict[str, Tuple[float, float]] = {}  # module -> (cumulative, self) seconds
+_import_state = threading.local()
+
+# Absolute module name an __import__ call refers to.
+def _absolute_name(name: str, import_globals: Optional[Dict[str, Any]], level: int) -> str:
+    if level == 0:
+        return name
+    package = (import_globals or {}).get('__package__') or ''
+    base = package.rsplit('.', level - 1)[0] if level > 1 else package
+    return f'{base}.{name}' if name else base
+
+# __import__ replacement that times modules loaded for the first time, like python -X importtime.
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):  # pylint: disable=redefined-builtin
+    module_name = _absolute_name(name, globals, level)
+    if module_name in sys.modules:
+        # ``from package import submodule`` may still load the submodule.
+        package = sys.modules[module_name]
+        pending = [
+            f'{module_name}.{item}' for item in fromlist or ()
+            if item != '*' and not hasattr(package, item) and f'{module_name}.{item}' not in sys.modules
+        ]
+        if not pending:
+            return _original_import(name, globals, locals, fromlist, level)
+        module_name = pending[0] if len(pending) == 1 else module_name
+
+    stack = getattr(_import_state, 'stack', None)
+    if stack is None:
+        stack = _import_state.stack = []
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        cumulative = time.perf_counter() - start
+        nested = stack.pop()
+        if stack:
+            stack[-1] += cumulative
+        if module_name in sys.modules:
+            _import_times.setdefault(module_name, (cumulative, cumulative - nested))
+
+# Start timing module imports.
+def install_import_timer() -> None:
+    """Time every module imported from now on; modules already loaded are not listed."""
+    builtins.__import__ = _timed_import
+
+# Stop timing module imports; times recorded so far are kept.
+def uninstall_import_timer() -> None:
+    if builtins.__import__ is _timed_import:
+        builtins.__import__ = _original_import
+
+# Timed imports as (module, cumulative seconds, self seconds), slowest first.
+def import_times() -> List[Tuple[str, float, float]]:
+    """Return the recorded imports; cumulative time includes the modules each one imported."""
+    records = [(module, cumulative, own) for module, (cumulative, own) in list(_import_times.items())]
+    return sorted(records, key=lambda record: record[1], reverse=True)
+
+
+if profiling_enabled():
+    install_import_timer()
+
+
+# Gather everything recorded so far into a JSON-serialisable report.
+def build_report(timer: PhaseTimer = startup_timer, top_imports: int = TIMING_REPORT_TOP_IMPORTS) -> Dict[str, Any]:
+    """Return phases, spans and the slowest imports with machine details."""
+    imports = import_times()
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'elapsed_seconds': round(timer.elapsed(), 4),
+        'phases': [
+            {'phase': phase, 'seconds': round(seconds, 4), 'elapsed': round(elapsed, 4)}
+            for phase, seconds, elapsed in timer.phases()
+        ],
+        'spans': [
+            {'name': name, 'start': round(start, 4), 'seconds': round(seconds, 4), 'thread': thread}
+            for name, start, seconds, thread in timer.spans()
+        ],
+        'imports_profiled': bool(imports),
+        'import_self_seconds': round(sum(own for _, _, own in imports), 4),
+        'imports': [
+            {'module': module, 'cumulative': round(cumulative, 4), 'self': round(own, 4)}
+            for module, cumulative, own in imports[:top_imports]
+        ],
+    }
+
+# One-line summary of a report for the running timing log.
+def format_summary(report: Dict[str, Any]) -> str:
+    phases = ' '.join(f"{entry['phase']}={entry['seconds']:.3f}s" for entry in report['phases'])
+    spans = ' '.join(f"{entry['name']}={entry['seconds']:.3f}s" for entry in report['spans'])
+    return f"{report['created']} elapsed={report['elapsed_seconds']:.3f}s {phases} | {spans}".rstrip(' |')
+
+# Write the report as JSON and append its summary to startup.log.
+def write_report(directory: Optional[Path] = None, timer: PhaseTimer = startup_timer) -> Path:
+    """Save a timing report under ``TIMING_REPORT_DIR`` and return the JSON file's path.
+
+    Each report gets its own timestamped JSON file; ``startup.log`` keeps one
+    summary line per report so slow launches stand out over time.
+    """
+    directory = Path(directory) if directory is not None else BASE_DIR / TIMING_REPORT_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    report = build_report(timer)
+    path = directory / f"startup-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    with open(directory / 'startup.log', 'a', encoding='utf-8') as log_file:
+        log_file.write(format_summary(report) + '\n')
+    return path
@@ -6,6 +6,7 @@ from . import analytics # Analytics window and functionalities.
 from . import search # Search and filter helpers.
 from . import sorting # Sorting helpers.
 from . import selection # Selection helpers.
+from . import diagnostics # Query statistics and startup timing window.
 
 # Exported module features.
-__all__ = ['crud', 'import_export', 'analytics', 'search', 'sorting', 'selection']
+__all__ = ['crud', 'import_export', 'analytics', 'search', 'sorting', 'selection', 'diagnostics']
@@ -1,7 +1,7 @@
 """Analytics window separated from the main system module."""
 from __future__ import annotations # Ensure compatibility with future Python versions
 
-from typing import Callable, Optional # 
+from typing import Callable, Optional, Tuple # For type hinting
 
 import customtkinter as ctk # For custom Tkinter widgets
 from tkinter import BOTH, messagebox # For message boxes
@@ -9,41 +9,86 @@ from tkinter import BOTH, messagebox # For message boxes
 from system_configs.config import ACCENT, CARD_BG, PRIMARY, SECONDARY, TEXT # Import color constants
 
 # Module-level variables to hold dependencies
-_compute_analytics: Optional[Callable[[], dict]] = None 
+_compute_analytics: Optional[Callable[[object], dict]] = None
 _create_analytics_figures: Optional[Callable[[dict], dict]] = None
 _root = None
-_figure_cls = None
-_figure_canvas_cls = None
+_executor = None
+_analytics_task = None
+_get_cached_analytics: Optional[Callable[[], Optional[dict]]] = None
+_load_figure_classes: Optional[Callable[[], Tuple[object, object]]] = None
 
 # Configure module-level analytics dependencies.
 def configure(
     *,
-    compute_analytics: Callable[[], dict],
+    compute_analytics: Callable[[object], dict],
     create_analytics_figures: Callable[[dict], dict],
     root,
-    figure_cls,
-    figure_canvas_cls,
+    executor,
+    load_figure_classes: Callable[[], Tuple[object, object]],
+    get_cached_analytics: Optional[Callable[[], Optional[dict]]] = None,
 ) -> None:
-    """Configure module-level analytics dependencies."""
-    global _compute_analytics, _create_analytics_figures, _root, _figure_cls, _figure_canvas_cls
+    """Configure module-level analytics dependencies.
+
+    ``compute_analytics`` receives a cursor and runs on the database executor;
+    ``get_cached_analytics`` lets the window open without touching the database
+    when up-to-date results are already cached. ``load_figure_classes``
+    returns matplotlib's ``(Figure, FigureCanvasTkAgg)``, importing it on
+    first use, or ``(None, None)`` when matplotlib is missing.
+    """
+    global _compute_analytics, _create_analytics_figures, _root, _executor, _load_figure_classes
+    global _get_cached_analytics
     _compute_analytics = compute_analytics
     _create_analytics_figures = create_analytics_figures
     _root = root
-    _figure_cls = figure_cls
-    _figure_canvas_cls = figure_canvas_cls
+    _executor = executor
+    _load_figure_classes = load_figure_classes
+    _get_cached_analytics = get_cached_analytics
 
 # Show the analytics window with charts and summaries.
 def show_analytics_window():  # pragma: no cover - UI callback
-    if _compute_analytics is None or _create_analytics_figures is None:
+    global _analytics_task
+    if _compute_analytics is None or _create_analytics_figures is None or _executor is None:
+        return
+    # Ignore repeated clicks while the previous computation is still running.
+    if _analytics_task is not None and not _analytics_task.cancelled:
+        return
+
+    cached = _get_cached_analytics() if _get_cached_analytics is not None else None
+    if cached is not None:
+        _open_analytics_window(cached)
         return
 
-    analytics = _compute_analytics()
+    def _on_computed(analytics):
+        global _analytics_task
+        _analytics_task = None
+        _open_analytics_window(analytics)
+
+    def _on_failed(exc):
+        global _analytics_task
+        _analytics_task = None
+        messagebox.showerror("Error", f"Unable to compute patient analytics: {exc}")
+
+    # matplotlib is imported on the worker too, so the window opens without a pause.
+    def _compute(cursor, _connection):
+        analytics = _compute_analytics(cursor)
+        if _load_figure_classes is not None:
+            _load_figure_classes()
+        return analytics
+
+    _analytics_task = _executor.submit(
+        _compute,
+        on_success=_on_computed,
+        on_error=_on_failed,
+    )
 
+# Build the analytics window from computed analytics data.
+def _open_analytics_window(analytics: dict):  # pragma: no cover - UI callback
     if analytics.get("total", 0) == 0:
         messagebox.showinfo("Patient Analytics", "No patient records available to analyze yet.")
         return
 
-    if _figure_cls is None or _figure_canvas_cls is None:
+    figure_cls, figure_canvas_cls = _load_figure_classes() if _load_figure_classes is not None else (None, None)
+    if figure_cls is None or figure_canvas_cls is None:
         messagebox.showerror(
             "Missing Dependency",
             'Analytics charts require the "matplotlib" package. Install it with "pip install matplotlib" and try again.',
@@ -142,7 +187,7 @@ def show_analytics_window():  # pragma: no cover - UI callback
             )
             continue
 
-        canvas = _figure_canvas_cls(fig, master=frame)
+        canvas = figure_canvas_cls(fig, master=frame)
         canvas.draw()
         canvas.get_tk_widget().pack(fill=BOTH, expand=True)
         chart_canvases.append(canvas)
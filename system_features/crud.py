@@ -1,14 +1,16 @@
 """Tkinter-backed patient CRUD helpers for the management system UI."""
 from __future__ import annotations # Ensure compatibility with future Python versions
 
-from typing import Callable, Iterable, Optional, Tuple # For type hinting
+from datetime import date # For DATE column values
+from typing import Callable, Iterable, List, Optional, Tuple, Union # For type hinting
 
 import customtkinter as ctk # For custom Tkinter widgets
 from pymysql.err import IntegrityError # For handling database integrity errors
 from tkinter import END, StringVar, W, messagebox # For message boxes
 from tkinter import ttk # For themed Tkinter widgets
 
-from system_configs.config import ACCENT, CARD_BG, PRIMARY, SECONDARY, TEXT # Import color constants
+from system_configs.config import ACCENT, CARD_BG, DELETE_BATCH_SIZE, PATIENT_PAGE_SIZE, PRIMARY, SECONDARY, TABLE_STREAM_CHUNK_ROWS, TEXT # Import color and size constants
+from system_configs.helpers import format_date, patient_id_sort_key # Date display and ID sort key helpers
 
 # Allowed column names for filtered lookups to avoid unsafe SQL fragments.
 _ALLOWED_FILTER_COLUMNS = {
@@ -28,45 +30,79 @@ _DOB_MONTHS = ["Month"] + [str(i) for i in range(1, 13)]
 _DOB_DAYS = ["Day"] + [str(i) for i in range(1, 32)]
 _DOB_YEARS = ["Year"] + [str(i) for i in range(1990, 2031)]
 _GENDER_OPTIONS = ["Male", "Female", "Other"]
+_DATE_COLUMN_INDEXES = (6, 8)  # dob and visit_date positions in a patient row
 
 # Module-level variables to hold UI widgets and helper callbacks
 _patient_table = None
-_cursor = None
-_connection = None
+_executor = None
 _root = None
-_fetch_patients: Optional[Callable[[Optional[str], Optional[str]], Iterable[Tuple]]] = None
+_fetch_patient_page: Optional[Callable[..., Tuple[List[Tuple], Optional[Tuple]]]] = None
 _get_filter: Optional[Callable[[], Tuple[Optional[str], Optional[str]]]] = None
-_get_current_date: Optional[Callable[[], str]] = None
+_get_current_date: Optional[Callable[[], date]] = None
 _normalize_mobile: Optional[Callable[[str], Optional[str]]] = None
 _to_proper_case: Optional[Callable[[str], str]] = None
+_on_data_changed: Optional[Callable[[], None]] = None
+_record_stats_change: Optional[Callable[..., None]] = None
+_locate_patient: Optional[Callable[..., Tuple[Optional[Tuple], Optional[str]]]] = None
+_cancel_search: Optional[Callable[[], None]] = None
+
+# Keyset paging state for the patient table.
+_LOAD_MORE_THRESHOLD = 0.9  # fetch the next page once the view passes this scroll fraction
+_page_filter: Tuple[Optional[str], Optional[str]] = (None, None)
+_next_page_key: Optional[Tuple] = None
+_loaded_row_count = 0
+_page_task = None
+_table_generation = 0  # bumped whenever the table is reloaded, so stale row patches are dropped
+_loading_placeholder = None  # widget shown over the table until the first rows arrive
+_pending_stream: Optional[Tuple[List[Tuple], Optional[Tuple], Optional[Callable[[], None]]]] = None
+_stream_after_id = None
 
 # Configure module-level dependencies and UI widgets.
 def configure(
     *,
     patient_table,
-    cursor,
-    connection,
+    executor,
     root,
-    fetch_patients: Callable[[Optional[str], Optional[str]], Iterable[Tuple]],
+    fetch_patient_page: Callable[..., Tuple[List[Tuple], Optional[Tuple]]],
     get_filter: Callable[[], Tuple[Optional[str], Optional[str]]],
-    get_current_date: Callable[[], str],
+    get_current_date: Callable[[], date],
     normalize_mobile: Callable[[str], Optional[str]],
     to_proper_case: Callable[[str], str],
+    on_data_changed: Optional[Callable[[], None]] = None,
+    record_stats_change: Optional[Callable[..., None]] = None,
+    locate_patient: Optional[Callable[..., Tuple[Optional[Tuple], Optional[str]]]] = None,
+    loading_placeholder=None,
+    cancel_search: Optional[Callable[[], None]] = None,
 ) -> None:
-    """Wire UI widgets and helper callbacks used by the CRUD routines."""
-    global _patient_table, _cursor, _connection, _root
-    global _fetch_patients, _get_filter, _get_current_date
-    global _normalize_mobile, _to_proper_case
+    """Wire UI widgets and helper callbacks used by the CRUD routines.
+
+    Database work is submitted to ``executor`` (a ``DatabaseExecutor``) so
+    queries never run on the Tk main thread. ``record_stats_change(cursor,
+    added=..., removed=...)`` runs inside each write's transaction to keep
+    the analytics counters current. ``locate_patient(patient_id, field, term,
+    cursor=...)`` returns a written row and the ID that follows it, so edits
+    patch the table in place instead of reloading it. ``loading_placeholder``
+    is hidden once the first rows are displayed. ``cancel_search`` stops an
+    in-flight search so its result cannot replace a list loaded afterwards.
+    """
+    global _patient_table, _executor, _root
+    global _fetch_patient_page, _get_filter, _get_current_date
+    global _normalize_mobile, _to_proper_case, _on_data_changed, _record_stats_change
+    global _locate_patient, _loading_placeholder, _cancel_search
 
     _patient_table = patient_table
-    _cursor = cursor
-    _connection = connection
+    _executor = executor
     _root = root
-    _fetch_patients = fetch_patients
+    _fetch_patient_page = fetch_patient_page
     _get_filter = get_filter
     _get_current_date = get_current_date
     _normalize_mobile = normalize_mobile
     _to_proper_case = to_proper_case
+    _on_data_changed = on_data_changed
+    _record_stats_change = record_stats_change
+    _locate_patient = locate_patient
+    _loading_placeholder = loading_placeholder
+    _cancel_search = cancel_search
 
 # Format a string value to proper case.
 def _format_case(value: str) -> str:
@@ -88,35 +124,91 @@ def _format_mobile(value: str) -> str:
     return normalized or ""
 
 # Get the current visit date from the provided callback.
-def _current_visit_date() -> str:
+def _current_visit_date() -> Optional[date]:
     if _get_current_date is None:
-        return ""
+        return None
     try:
         return _get_current_date()
     except Exception:
-        return ""
+        return None
 
-# Ensure that the database connection is available.
+# Build a birth date from the dropdown values, or None when the day does not exist.
+def _dob_from_inputs(month_value: str, day_value: str, year_value: str) -> Optional[date]:
+    try:
+        return date(int(year_value), int(month_value), int(day_value))
+    except ValueError:
+        return None
+
+# Convert a database row into the strings shown in the table and dialogs.
+def _display_values(record: Iterable) -> List[str]:
+    values = ["" if value is None else str(value) for value in record]
+    for index in _DATE_COLUMN_INDEXES:
+        if index < len(values) and values[index]:
+            values[index] = format_date(record[index])
+    return values
+
+# Ensure that the database executor is available.
 def _ensure_db(parent) -> bool:
-    if _cursor is None or _connection is None:
+    if _executor is None:
         messagebox.showerror("Error", "Database connection is not configured.", parent=parent)
         return False
     return True
 
-# Fetch a patient record by patient ID.
-def _fetch_patient_by_id(patient_id: str) -> Optional[Tuple]:
-    if _cursor is None:
-        return None
+# Use a window as a dialog parent only while it still exists.
+def _dialog_parent(window):
     try:
-        _cursor.execute(
-            "select patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date "
-            "from patient where patient_id=%s",
-            (patient_id,),
-        )
-        return _cursor.fetchone()
+        return window if window is not None and window.winfo_exists() else None
     except Exception:
         return None
 
+# Column list shared by every full patient lookup.
+_PATIENT_SELECT = "select patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date from patient"
+
+# Fetch a patient record by patient ID; runs on a database worker.
+def _fetch_patient_by_id(cursor, patient_id: str, for_update: bool = False) -> Optional[Tuple]:
+    query = f"{_PATIENT_SELECT} where patient_id=%s"
+    if for_update:
+        # Lock the row so the counters see the same old values the update replaces.
+        query += " for update"
+    cursor.execute(query, (patient_id,))
+    return cursor.fetchone()
+
+# Delete patients in IN-list chunks and return the rows that were removed; runs on a database worker.
+def _delete_patients(cursor, patient_ids: List[str], batch_size: int = DELETE_BATCH_SIZE) -> List[Tuple]:
+    """Lock and delete ``patient_ids``; the caller commits or rolls back the transaction."""
+    removed: List[Tuple] = []
+    batch_size = max(int(batch_size), 1)
+    for start in range(0, len(patient_ids), batch_size):
+        batch = patient_ids[start:start + batch_size]
+        placeholders = ", ".join(["%s"] * len(batch))
+        # Lock the rows so the counters see the same old values the delete removes.
+        cursor.execute(f"{_PATIENT_SELECT} where patient_id in ({placeholders}) for update", batch)
+        rows = list(cursor.fetchall())
+        if not rows:
+            continue
+        cursor.execute(
+            f"delete from patient where patient_id in ({', '.join(['%s'] * len(rows))})",
+            [row[0] for row in rows],
+        )
+        removed.extend(rows)
+    return removed
+
+# Update the analytics counters inside the current write transaction.
+def _record_stats(cursor, added: Iterable[Tuple] = (), removed: Iterable[Tuple] = ()) -> None:
+    if _record_stats_change is not None:
+        _record_stats_change(cursor, added=added, removed=removed)
+
+# Load the full record for a patient in the background, then hand it to a callback.
+def _with_patient_record(patient_id: str, callback: Callable[[Optional[Tuple]], None]) -> None:
+    if _executor is None:
+        callback(None)
+        return
+    _executor.submit(
+        lambda cursor, _connection: _fetch_patient_by_id(cursor, patient_id),
+        on_success=callback,
+        on_error=lambda _exc: callback(None),
+    )
+
 # Create a new top-level window with standard configurations.
 def _create_window(title: str) -> ctk.CTkToplevel:
     window = ctk.CTkToplevel()
@@ -170,6 +262,15 @@ def _populate_dob_fields(dob_value: str, month_entry, day_entry, year_entry) ->
     day_entry.current(0)
     year_entry.current(0)
 
+# Notify listeners that patient data was written.
+def _notify_data_changed() -> None:
+    if _on_data_changed is None:
+        return
+    try:
+        _on_data_changed()
+    except Exception:
+        pass
+
 # Collect filter criteria from the provided callback.
 def _collect_filter() -> Tuple[Optional[str], Optional[str]]:
     if _get_filter is None:
@@ -179,46 +280,408 @@ def _collect_filter() -> Tuple[Optional[str], Optional[str]]:
     except Exception:
         return None, None
 
-# Display patient records in the table with optional filtering.
-def show_patient() -> None:
+# Append patient records to the table, keeping the row striping continuous.
+def _append_rows(rows: Iterable[Tuple]) -> None:
+    global _loaded_row_count
     table = _patient_table
     if table is None:
         return
 
-    for row in table.get_children():
-        table.delete(row)
+    for record in rows:
+        values = _row_values(record)
+        item_id = values[0]
+        if table.exists(item_id):
+            continue
+        table.insert("", "end", iid=item_id, values=values, tags=(_stripe_tag(_loaded_row_count),))
+        _loaded_row_count += 1
+
+# Table cell values for a patient record.
+def _row_values(record: Iterable) -> List[str]:
+    values = _display_values(record)
+    if len(values) > 2 and values[2]:
+        mobile_value = _format_mobile(values[2])
+        if mobile_value:
+            values[2] = mobile_value
+    return values
+
+# Striping tag for the row at a table position.
+def _stripe_tag(index: int) -> str:
+    return "evenrow" if index % 2 == 0 else "oddrow"
+
+# Re-apply alternating stripes to the rows on screen, continuing from the top row's stripe.
+def _restripe_visible() -> None:
+    """Fix striping where it can be seen; edits never walk the rows off screen."""
+    table = _patient_table
+    if table is None:
+        return
+    item = ""
+    for y in range(0, 120, 6):  # first row below the heading
+        item = table.identify_row(y)
+        if item:
+            break
+    if not item:
+        return
+    even = "evenrow" in table.item(item, "tags")
+    while item and table.bbox(item):
+        tag = "evenrow" if even else "oddrow"
+        if tag not in table.item(item, "tags"):
+            table.item(item, tags=(tag,))
+        even = not even
+        item = table.next(item)
+
+# Remove patients from the table without reloading it.
+def remove_patient_rows(patient_ids: Iterable[str]) -> None:
+    """Delete the table items for ``patient_ids``; IDs that are not shown are ignored."""
+    global _loaded_row_count
+    table = _patient_table
+    if table is None:
+        return
+    _flush_stream()
+
+    doomed = [str(item) for item in patient_ids if table.exists(str(item))]
+    if not doomed:
+        return
+    table.delete(*doomed)
+    _loaded_row_count = max(_loaded_row_count - len(doomed), 0)
+    _restripe_visible()
+
+    # Refill a table that the delete left short of a page.
+    if _next_page_key is not None and len(table.get_children()) < PATIENT_PAGE_SIZE and _root is not None:
+        _root.after_idle(load_more_patients)
+
+# Refresh one patient's cells in place.
+def update_patient_row(record: Tuple) -> bool:
+    """Replace the values of the item for ``record``; returns False when it is not shown."""
+    table = _patient_table
+    item_id = str(record[0])
+    if table is None or not table.exists(item_id):
+        return False
+    table.item(item_id, values=_row_values(record))
+    return True
+
+# Insert or move a patient row so it sits just before ``next_patient_id`` in sort order.
+def upsert_patient_row(record: Tuple, next_patient_id: Optional[str]) -> None:
+    """Place ``record`` at its sorted position among the loaded rows.
+
+    ``next_patient_id`` is the patient that sorts right after it (``None`` if
+    it sorts last). A row that belongs beyond the loaded pages is left for
+    paging to bring in.
+    """
+    global _loaded_row_count
+    table = _patient_table
+    if table is None:
+        return
+    _flush_stream()
+    item_id = str(record[0])
+
+    # Position of the following row, or None when the row sorts past the loaded pages.
+    def _target_index() -> Optional[Union[int, str]]:
+        if next_patient_id is not None and table.exists(next_patient_id):
+            return table.index(next_patient_id)
+        if next_patient_id is None and _next_page_key is None:
+            return "end"
+        return None
+
+    if table.exists(item_id):
+        # Already just before its successor: only the cells changed.
+        if (table.next(item_id) or None) == next_patient_id and (next_patient_id is not None or _next_page_key is None):
+            update_patient_row(record)
+            return
+        table.delete(item_id)
+        _loaded_row_count = max(_loaded_row_count - 1, 0)
+    target = _target_index()
+    if target is None:
+        _restripe_visible()
+        return
+
+    table.insert("", target, iid=item_id, values=_row_values(record), tags=(_stripe_tag(_loaded_row_count),))
+    _loaded_row_count += 1
+    _restripe_visible()
+
+# Find where a written patient now sits in the table's query; runs on a database worker.
+def _locate_written_row(cursor, patient_id: str, page_filter: Tuple[Optional[str], Optional[str]]):
+    if _locate_patient is None:
+        return None
+    filter_field, filter_term = page_filter
+    try:
+        return _locate_patient(patient_id, filter_field, filter_term, cursor=cursor)
+    except Exception:  # pylint: disable=broad-except
+        # The write is already committed; the caller falls back to a reload.
+        return None
+
+# Apply a located row to the table, or reload when the position is unknown.
+def _patch_written_row(patient_id: str, position, generation: int) -> None:
+    if generation != _table_generation:
+        # The table was reloaded meanwhile and already shows the write.
+        return
+    if position is None:
+        show_patient()
+        return
+    record, next_patient_id = position
+    if record is None:
+        # The patient no longer matches the active search.
+        remove_patient_rows([patient_id])
+        return
+    upsert_patient_row(record, next_patient_id)
+
+# Clear the table and reset the keyset paging state.
+def _reset_table(filter_field: Optional[str], filter_term: Optional[str]) -> None:
+    global _page_filter, _next_page_key, _loaded_row_count, _table_generation, _pending_stream
+    _cancel_stream()
+    _pending_stream = None
+    table = _patient_table
+    children = table.get_children()
+    if children:
+        table.delete(*children)
+    _loaded_row_count = 0
+    _next_page_key = None
+    _page_filter = (filter_field, filter_term)
+    _table_generation += 1
+
+# Replace the table contents with rows fetched elsewhere, such as a search worker.
+def show_patient_rows(
+    rows: Iterable[Tuple],
+    next_key: Optional[Tuple],
+    filter_field: Optional[str],
+    filter_term: Optional[str],
+    on_first_screen: Optional[Callable[[], None]] = None,
+    on_complete: Optional[Callable[[], None]] = None,
+) -> None:
+    """Display a prefetched first page and continue paging from ``next_key``.
+
+    The first ``TABLE_STREAM_CHUNK_ROWS`` rows are inserted and painted at
+    once; the rest follow in chunks on later Tk ticks so the window stays
+    responsive. ``on_first_screen`` runs after the first chunk is painted and
+    ``on_complete`` once every row is in the table.
+    """
+    if _patient_table is None:
+        return
+    _cancel_page_task()
+    if filter_field not in _ALLOWED_FILTER_COLUMNS:
+        filter_field = None
+        filter_term = None
+
+    _reset_table(filter_field, filter_term)
+    _hide_loading_placeholder()
+    rows = list(rows)
+    _append_rows(rows[:TABLE_STREAM_CHUNK_ROWS])
+    _patient_table.update_idletasks()
+    if on_first_screen is not None:
+        on_first_screen()
+    _start_stream(rows[TABLE_STREAM_CHUNK_ROWS:], next_key, on_complete)
+
+# Queue the rest of a page to be inserted chunk by chunk on later Tk ticks.
+def _start_stream(rows: List[Tuple], next_key: Optional[Tuple], on_complete: Optional[Callable[[], None]]) -> None:
+    global _pending_stream, _stream_after_id
+    _pending_stream = (rows, next_key, on_complete)
+    if rows and _root is not None:
+        _stream_after_id = _root.after(1, _stream_next_chunk)
+    else:
+        _flush_stream()
+
+# Insert the next chunk of a streaming page.
+def _stream_next_chunk() -> None:
+    global _pending_stream, _stream_after_id
+    _stream_after_id = None
+    if _pending_stream is None:
+        return
+    rows, next_key, on_complete = _pending_stream
+    if len(rows) <= TABLE_STREAM_CHUNK_ROWS:
+        _flush_stream()
+        return
+    _append_rows(rows[:TABLE_STREAM_CHUNK_ROWS])
+    _pending_stream = (rows[TABLE_STREAM_CHUNK_ROWS:], next_key, on_complete)
+    _stream_after_id = _root.after(1, _stream_next_chunk)
+
+# Insert every row still waiting to stream in, then allow paging past the page.
+def _flush_stream() -> None:
+    """Finish a streaming page now; row patches call this so positions are final."""
+    global _pending_stream, _next_page_key
+    _cancel_stream()
+    if _pending_stream is None:
+        return
+    rows, next_key, on_complete = _pending_stream
+    _pending_stream = None
+    _append_rows(rows)
+    # Paging starts only after the whole page is shown, so pages never interleave.
+    _next_page_key = next_key
+    if on_complete is not None:
+        on_complete()
+
+# Stop inserting queued rows; the pending page itself is kept.
+def _cancel_stream() -> None:
+    global _stream_after_id
+    if _stream_after_id is not None and _root is not None:
+        _root.after_cancel(_stream_after_id)
+    _stream_after_id = None
+
+# Remove the loading placeholder shown over the table at startup.
+def _hide_loading_placeholder() -> None:
+    global _loading_placeholder
+    if _loading_placeholder is not None:
+        _loading_placeholder.place_forget()
+        _loading_placeholder = None
+
+# Cancel any page fetch that is still in flight.
+def _cancel_page_task() -> None:
+    global _page_task
+    if _page_task is not None:
+        _page_task.cancel()
+        _page_task = None
+
+# Display patient records in the table with optional filtering.
+def show_patient(
+    on_first_screen: Optional[Callable[[], None]] = None,
+    on_complete: Optional[Callable[[], None]] = None,
+    cancellable: bool = True,
+) -> None:
+    """Fetch the first page in the background and display it; see ``show_patient_rows``.
+
+    Pass ``cancellable=False`` for the startup load, so Esc cannot leave the
+    loading placeholder up with its callbacks never called.
+    """
+    global _page_task
+    if _patient_table is None:
+        return
 
     filter_field, filter_term = _collect_filter()
     if filter_field not in _ALLOWED_FILTER_COLUMNS:
         filter_field = None
         filter_term = None
 
-    rows: Iterable[Tuple] = ()
-    try:
-        if _fetch_patients is not None:
-            rows = _fetch_patients(filter_field, filter_term) or ()
-        elif _cursor is not None:
-            query = (
-                "select patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date "
-                "from patient"
-            )
-            params = []
-            if filter_field and filter_term:
-                query += f" where LOWER({filter_field}) LIKE %s"
-                params.append(f"%{filter_term.lower()}%")
-            query += " order by patient_id"
-            _cursor.execute(query, tuple(params))
-            rows = _cursor.fetchall()
-    except Exception:
-        rows = ()
+    _cancel_page_task()
+    if _cancel_search is not None:
+        _cancel_search()
+    if _executor is None or _fetch_patient_page is None:
+        _reset_table(filter_field, filter_term)
+        return
+
+    def _on_page(result) -> None:
+        global _page_task
+        _page_task = None
+        rows, next_key = result
+        show_patient_rows(rows, next_key, filter_field, filter_term, on_first_screen, on_complete)
+
+    def _on_error(_exc) -> None:
+        global _page_task
+        _page_task = None
+        show_patient_rows((), None, filter_field, filter_term, on_first_screen, on_complete)
+
+    # Cancelled by Esc (not superseded by a newer load): allow loading again.
+    def _on_cancel() -> None:
+        global _page_task
+        if _page_task is task:
+            _page_task = None
+
+    task = _executor.submit(
+        lambda cursor, _connection: _fetch_patient_page(filter_field, filter_term, cursor=cursor),
+        on_success=_on_page,
+        on_error=_on_error,
+        cancellable=cancellable,
+        on_cancel=_on_cancel,
+    )
+    _page_task = task
+
+# Fetch the next keyset page and append it below the rows already shown.
+def load_more_patients() -> None:
+    global _page_task
+    if _patient_table is None or _executor is None or _fetch_patient_page is None:
+        return
+    if _next_page_key is None or _page_task is not None:
+        return
+
+    filter_field, filter_term = _page_filter
+    after_key = _next_page_key
+
+    def _on_page(result) -> None:
+        global _page_task, _next_page_key
+        _page_task = None
+        rows, _next_page_key = result
+        _append_rows(rows)
+
+    # Keep the page key so the next scroll retries this page.
+    def _on_error(exc) -> None:
+        global _page_task
+        _page_task = None
+        messagebox.showerror("Error", f"Failed to load more patients: {exc}")
+
+    # Cancelled by Esc: keep the page key so scrolling fetches this page again.
+    def _on_cancel() -> None:
+        global _page_task
+        if _page_task is task:
+            _page_task = None
+
+    task = _executor.submit(
+        lambda cursor, _connection: _fetch_patient_page(filter_field, filter_term, after_key, cursor=cursor),
+        on_success=_on_page,
+        on_error=_on_error,
+        on_cancel=_on_cancel,
+    )
+    _page_task = task
+
+# Load every patient that matches the current list, then run ``on_loaded``.
+def load_all_patients(on_loaded: Callable[[], None]) -> None:
+    """Fetch the pages not shown yet in one query and append them to the table.
+
+    Bulk selections call this first so they act on every matching patient,
+    not only the pages scrolled into view. ``on_loaded`` is not called when
+    the fetch fails, is cancelled, or the table is reloaded meanwhile.
+    """
+    global _page_task
+    if _patient_table is None:
+        return
+    _flush_stream()
+    if _next_page_key is None:
+        on_loaded()
+        return
+    if _executor is None or _fetch_patient_page is None:
+        return
+    if _page_task is not None:
+        messagebox.showinfo("Loading", "Patients are still loading. Please try again in a moment.")
+        return
+
+    filter_field, filter_term = _page_filter
+    after_key = _next_page_key
+    generation = _table_generation
 
-    for index, record in enumerate(rows):
-        values = ["" if value is None else str(value) for value in record]
-        if len(values) > 2 and values[2]:
-            mobile_value = _format_mobile(values[2])
-            if mobile_value:
-                values[2] = mobile_value
-        table.insert("", "end", values=values, tags=("evenrow" if index % 2 == 0 else "oddrow",))
+    def _on_rows(result) -> None:
+        global _page_task, _next_page_key
+        _page_task = None
+        if generation != _table_generation:
+            return
+        rows, _next_page_key = result
+        _append_rows(rows)
+        on_loaded()
+
+    def _on_error(exc) -> None:
+        global _page_task
+        _page_task = None
+        messagebox.showerror("Error", f"Failed to load the remaining patients: {exc}")
+
+    def _on_cancel() -> None:
+        global _page_task
+        if _page_task is task:
+            _page_task = None
+
+    task = _executor.submit(
+        lambda cursor, _connection: _fetch_patient_page(filter_field, filter_term, after_key, limit=None, cursor=cursor),
+        on_success=_on_rows,
+        on_error=_on_error,
+        on_cancel=_on_cancel,
+    )
+    _page_task = task
+
+# Load another page when the table view nears the end of the loaded rows.
+def on_table_scroll(first, last) -> None:  # pragma: no cover - UI callback
+    _restripe_visible()
+    if _next_page_key is None or _page_task is not None:
+        return
+    try:
+        near_end = float(last) >= _LOAD_MORE_THRESHOLD
+    except (TypeError, ValueError):
+        return
+    if near_end and _root is not None:
+        _root.after_idle(load_more_patients)
 
 # Add a new patient record via a form window.
 def add_patient() -> None:
@@ -332,48 +795,70 @@ def add_patient() -> None:
                 return
             formatted_mobile = normalized_mobile
 
-        dob_value = f"{month_value}/{day_value}/{year_value}"
+        dob_value = _dob_from_inputs(month_value, day_value, year_value)
+        if dob_value is None:
+            messagebox.showerror("Error", "Please enter a valid birth date.", parent=add_window)
+            return
         normalized_name = _format_case(name_value)
         normalized_address = _format_case(address_value)
         normalized_diagnosis = _format_case(diagnosis_value)
         visit_date = _current_visit_date()
 
+        record = (
+            patient_id_value,
+            normalized_name,
+            formatted_mobile,
+            email_value,
+            normalized_address,
+            gender_value,
+            dob_value,
+            normalized_diagnosis,
+            visit_date,
+            patient_id_sort_key(patient_id_value),
+        )
+
+        page_filter, generation = _page_filter, _table_generation
+
         # Insert the new patient record into the database.
-        try:
-            _cursor.execute(
-                (
-                    "insert into patient (patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date) "
-                    "values (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
-                ),
+        def _insert(cursor, connection):
+            cursor.execute(
                 (
-                    patient_id_value,
-                    normalized_name,
-                    formatted_mobile,
-                    email_value,
-                    normalized_address,
-                    gender_value,
-                    dob_value,
-                    normalized_diagnosis,
-                    visit_date,
+                    "insert into patient "
+                    "(patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date, id_sort_key) "
+                    "values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
                 ),
+                record,
             )
-            _connection.commit()
-        except IntegrityError:
-            messagebox.showerror("Error", "Patient ID already exists.", parent=add_window)
-            return
-        except Exception as exc:
-            _connection.rollback()
-            messagebox.showerror("Error", f"Failed to add patient: {exc}", parent=add_window)
-            return
-
-        messagebox.showinfo("Success", f"Patient ID {patient_id_value} added successfully!", parent=add_window)
-        show_patient()
-        if messagebox.askyesno("Confirm", "Clear the form for another entry?", parent=add_window):
-            reset_form()
-        else:
-            add_window.destroy()
-
-    ctk.CTkButton(
+            _record_stats(cursor, added=[record])
+            connection.commit()
+            return _locate_written_row(cursor, patient_id_value, page_filter)
+
+        def _on_added(position) -> None:
+            _notify_data_changed()
+            _patch_written_row(patient_id_value, position, generation)
+            parent = _dialog_parent(add_window)
+            messagebox.showinfo("Success", f"Patient ID {patient_id_value} added successfully!", parent=parent)
+            if parent is None:
+                return
+            add_button.configure(state="normal")
+            if messagebox.askyesno("Confirm", "Clear the form for another entry?", parent=add_window):
+                reset_form()
+            else:
+                add_window.destroy()
+
+        def _on_failed(exc) -> None:
+            parent = _dialog_parent(add_window)
+            if parent is not None:
+                add_button.configure(state="normal")
+            if isinstance(exc, IntegrityError):
+                messagebox.showerror("Error", "Patient ID already exists.", parent=parent)
+            else:
+                messagebox.showerror("Error", f"Failed to add patient: {exc}", parent=parent)
+
+        add_button.configure(state="disabled")
+        _executor.submit(_insert, on_success=_on_added, on_error=_on_failed, cancellable=False)
+
+    add_button = ctk.CTkButton(
         form_container,
         text="Add Patient",
         command=add_data,
@@ -381,7 +866,8 @@ def add_patient() -> None:
         hover_color=PRIMARY,
         corner_radius=14,
         font=("Segoe UI", 14, "bold"),
-    ).grid(row=8, column=0, columnspan=2, padx=24, pady=(18, 10), sticky="ew")
+    )
+    add_button.grid(row=8, column=0, columnspan=2, padx=24, pady=(18, 10), sticky="ew")
     patient_id_entry.focus_set()
 
 # Update an existing patient record via a form window.
@@ -404,14 +890,20 @@ def update_patient() -> None:
         messagebox.showerror("Error", "Unable to read the selected patient data.")
         return
 
-    patient_id = str(values[0])
-    record = _fetch_patient_by_id(patient_id)
-    if record:
-        record_values = ["" if value is None else str(value) for value in record]
-    else:
-        record_values = ["" if value is None else str(value) for value in values]
-        record_values += [""] * (9 - len(record_values))
+    patient_id = str(patient_item)
 
+    def _open(record: Optional[Tuple]) -> None:
+        if record:
+            record_values = _display_values(record)
+        else:
+            record_values = ["" if value is None else str(value) for value in values]
+            record_values += [""] * (9 - len(record_values))
+        _open_update_window(patient_id, record_values)
+
+    _with_patient_record(patient_id, _open)
+
+# Build the update form for a patient, prefilled with the stored values.
+def _open_update_window(patient_id: str, record_values: List[str]) -> None:
     update_window = _create_window(f"Update Patient {patient_id}")
     form_container = _create_form_container(update_window)
 
@@ -513,42 +1005,62 @@ def update_patient() -> None:
                 return
             formatted_mobile = normalized_mobile
 
-        dob_value = f"{month_value}/{day_value}/{year_value}"
+        dob_value = _dob_from_inputs(month_value, day_value, year_value)
+        if dob_value is None:
+            messagebox.showerror("Error", "Please enter a valid birth date.", parent=update_window)
+            return
         normalized_name = _format_case(name_value)
         normalized_address = _format_case(address_value)
         normalized_diagnosis = _format_case(diagnosis_value)
         visit_date = _current_visit_date()
 
+        params = (
+            normalized_name,
+            formatted_mobile,
+            email_value,
+            normalized_address,
+            gender_value,
+            dob_value,
+            normalized_diagnosis,
+            visit_date,
+            patient_id,
+        )
+
+        page_filter, generation = _page_filter, _table_generation
+
         # Update the patient record in the database.
-        try:
-            _cursor.execute(
+        def _update(cursor, connection):
+            previous = _fetch_patient_by_id(cursor, patient_id, for_update=True)
+            cursor.execute(
                 (
                     "update patient set name=%s, mobile=%s, email=%s, address=%s, gender=%s, dob=%s, diagnosis=%s, visit_date=%s "
                     "where patient_id=%s"
                 ),
-                (
-                    normalized_name,
-                    formatted_mobile,
-                    email_value,
-                    normalized_address,
-                    gender_value,
-                    dob_value,
-                    normalized_diagnosis,
-                    visit_date,
-                    patient_id,
-                ),
+                params,
             )
-            _connection.commit()
-        except Exception as exc:
-            _connection.rollback()
-            messagebox.showerror("Error", f"Failed to update patient: {exc}", parent=update_window)
-            return
-
-        messagebox.showinfo("Success", f"Patient ID {patient_id} updated successfully!", parent=update_window)
-        update_window.destroy()
-        show_patient()
-
-    ctk.CTkButton(
+            if previous is not None:
+                _record_stats(cursor, added=[(patient_id,) + params[:-1]], removed=[previous])
+            connection.commit()
+            return _locate_written_row(cursor, patient_id, page_filter)
+
+        def _on_updated(position) -> None:
+            _notify_data_changed()
+            _patch_written_row(patient_id, position, generation)
+            parent = _dialog_parent(update_window)
+            messagebox.showinfo("Success", f"Patient ID {patient_id} updated successfully!", parent=parent)
+            if parent is not None:
+                update_window.destroy()
+
+        def _on_failed(exc) -> None:
+            parent = _dialog_parent(update_window)
+            if parent is not None:
+                update_button.configure(state="normal")
+            messagebox.showerror("Error", f"Failed to update patient: {exc}", parent=parent)
+
+        update_button.configure(state="disabled")
+        _executor.submit(_update, on_success=_on_updated, on_error=_on_failed, cancellable=False)
+
+    update_button = ctk.CTkButton(
         form_container,
         text="Update Patient",
         command=persist_changes,
@@ -556,7 +1068,8 @@ def update_patient() -> None:
         hover_color=PRIMARY,
         corner_radius=14,
         font=("Segoe UI", 14, "bold"),
-    ).grid(row=8, column=0, columnspan=2, padx=24, pady=(18, 10), sticky="ew")
+    )
+    update_button.grid(row=8, column=0, columnspan=2, padx=24, pady=(18, 10), sticky="ew")
 
 # Delete selected patient records from the database.
 def delete_patient() -> None:
@@ -571,12 +1084,8 @@ def delete_patient() -> None:
         messagebox.showerror("Error", "Please select at least one patient to delete.")
         return
 
-    patient_ids = []
-    for item in selections:
-        content = table.item(item)
-        values = content.get("values", [])
-        if values:
-            patient_ids.append(str(values[0]))
+    # Rows are inserted with the patient ID as their item id.
+    patient_ids = [str(item) for item in selections]
 
     if not patient_ids:
         messagebox.showerror("Error", "Unable to read the selected patient data.")
@@ -592,20 +1101,29 @@ def delete_patient() -> None:
     if not messagebox.askyesno(title, prompt):
         return
 
-    try:
-        for patient_id in patient_ids:
-            _cursor.execute("delete from patient where patient_id=%s", (patient_id,))
-        _connection.commit()
-    except Exception as exc:
-        _connection.rollback()
+    # Every chunk and the counter update commit together, or not at all.
+    def _delete(cursor, connection) -> None:
+        try:
+            removed = _delete_patients(cursor, patient_ids)
+            _record_stats(cursor, removed=removed)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+    def _on_deleted(_result) -> None:
+        _notify_data_changed()
+        # Rows another workstation already deleted go too.
+        remove_patient_rows(patient_ids)
+        if len(patient_ids) == 1:
+            messagebox.showinfo("Deleted", f"Patient {patient_ids[0]} deleted successfully.")
+        else:
+            messagebox.showinfo("Deleted", f"Deleted {len(patient_ids)} patients successfully.")
+
+    def _on_failed(exc) -> None:
         messagebox.showerror("Error", f"Failed to delete selected patients: {exc}")
-        return
 
-    show_patient()
-    if len(patient_ids) == 1:
-        messagebox.showinfo("Deleted", f"Patient {patient_ids[0]} deleted successfully.")
-    else:
-        messagebox.showinfo("Deleted", f"Deleted {len(patient_ids)} patients successfully.")
+    _executor.submit(_delete, on_success=_on_deleted, on_error=_on_failed, cancellable=False)
 
 # Show detailed information of the selected patient in a new window.
 def show_patient_details(event=None):
@@ -622,11 +1140,16 @@ def show_patient_details(event=None):
     if not values:
         return
 
-    patient_id = str(values[0])
-    record = _fetch_patient_by_id(patient_id)
-    if record:
-        values = ["" if value is None else str(value) for value in record]
+    def _open(record: Optional[Tuple]) -> None:
+        if record:
+            _open_details_window(_display_values(record))
+        else:
+            _open_details_window(values)
+
+    _with_patient_record(str(selection), _open)
 
+# Build the read-only details window for a patient record.
+def _open_details_window(values: List) -> None:
     detail_fields = [
         "Patient ID",
         "Name",
@@ -679,8 +1202,15 @@ def show_patient_details(event=None):
 __all__ = [
     "configure",
     "show_patient",
+    "show_patient_rows",
+    "load_more_patients",
+    "load_all_patients",
+    "on_table_scroll",
     "add_patient",
     "update_patient",
     "delete_patient",
     "show_patient_details",
+    "upsert_patient_row",
+    "update_patient_row",
+    "remove_patient_rows",
 ]
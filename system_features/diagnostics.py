@@ -0,0 +1,228 @@
+"""Diagnostics window with query latency statistics and startup timings."""
+from __future__ import annotations # Ensure compatibility with future Python versions
+
+from typing import Any, Callable, Dict, List, Optional, Tuple # For type hinting
+
+import customtkinter as ctk # For custom Tkinter widgets
+from tkinter import END, VERTICAL, HORIZONTAL, TclError # For Tkinter constants
+from tkinter import ttk # For themed widgets
+
+from system_configs.config import ACCENT, CARD_BG, PRIMARY, SECONDARY, TEXT # Import color constants
+
+# Module-level variables to hold dependencies
+_root = None
+_get_query_stats: Optional[Callable[[], List[Dict[str, Any]]]] = None
+_get_slow_queries: Optional[Callable[[], List[Tuple[str, float, int, str]]]] = None
+_reset_query_stats: Optional[Callable[[], None]] = None
+_get_startup_phases: Optional[Callable[[], List[Tuple[str, float, float]]]] = None
+_save_timing_report: Optional[Callable[[Any], None]] = None
+_slow_threshold_ms: float = 0.0
+_window = None
+
+_QUERY_COLUMNS = (
+    ("Query", 520, "w"),
+    ("Calls", 70, "center"),
+    ("Rows", 80, "center"),
+    ("Avg ms", 80, "center"),
+    ("p50 ms", 80, "center"),
+    ("p95 ms", 80, "center"),
+    ("Max ms", 80, "center"),
+    ("Total ms", 90, "center"),
+    ("Errors", 70, "center"),
+)
+
+# Configure module-level diagnostics dependencies.
+def configure(
+    *,
+    root,
+    get_query_stats: Callable[[], List[Dict[str, Any]]],
+    get_slow_queries: Callable[[], List[Tuple[str, float, int, str]]],
+    reset_query_stats: Callable[[], None],
+    slow_threshold_ms: float,
+    get_startup_phases: Optional[Callable[[], List[Tuple[str, float, float]]]] = None,
+    save_timing_report: Optional[Callable[[Any], None]] = None,
+) -> None:
+    """Configure module-level diagnostics dependencies.
+
+    ``get_query_stats`` returns per-query-shape dicts as produced by
+    ``QueryStats.snapshot``; ``get_slow_queries`` returns recent
+    ``(timestamp, ms, rows, shape)`` entries. ``save_timing_report(parent)``
+    writes a startup timing report and tells the user where it went.
+    """
+    global _root, _get_query_stats, _get_slow_queries, _reset_query_stats
+    global _get_startup_phases, _save_timing_report, _slow_threshold_ms
+    _root = root
+    _get_query_stats = get_query_stats
+    _get_slow_queries = get_slow_queries
+    _reset_query_stats = reset_query_stats
+    _slow_threshold_ms = slow_threshold_ms
+    _get_startup_phases = get_startup_phases
+    _save_timing_report = save_timing_report
+
+# Histogram text for one query shape, skipping empty buckets.
+def _format_histogram(histogram: List[Tuple[Optional[int], int]]) -> str:
+    parts = []
+    previous = None
+    for upper_ms, count in histogram:
+        if count:
+            label = f"≤{upper_ms} ms" if upper_ms is not None else f">{previous} ms"
+            parts.append(f"{label}: {count}")
+        previous = upper_ms
+    return "   ".join(parts) if parts else "No calls recorded."
+
+# Startup phases as one line of text.
+def _format_phases(phases: List[Tuple[str, float, float]]) -> str:
+    if not phases:
+        return "No startup phases recorded."
+    return "   ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds, _ in phases)
+
+# Show the diagnostics window, or bring it forward when it is already open.
+def show_diagnostics_window() -> None:  # pragma: no cover - UI callback
+    global _window
+    if _get_query_stats is None:
+        return
+    if _window is not None:
+        try:
+            _window.deiconify()
+            _window.lift()
+            return
+        except TclError:
+            _window = None
+
+    window = ctk.CTkToplevel()
+    _window = window
+    window.title("Diagnostics")
+    window.configure(fg_color=ACCENT)
+    if _root is not None:
+        window.transient(_root)
+    window.geometry("1100x680")
+    window.minsize(800, 520)
+    window.grid_rowconfigure(0, weight=1)
+    window.grid_columnconfigure(0, weight=1)
+
+    container = ctk.CTkFrame(window, fg_color=CARD_BG, corner_radius=18)
+    container.grid(row=0, column=0, padx=26, pady=24, sticky="nsew")
+    container.grid_columnconfigure(0, weight=1)
+    container.grid_rowconfigure(1, weight=3)
+    container.grid_rowconfigure(4, weight=1)
+
+    ctk.CTkLabel(container, text="Query Statistics", font=("Segoe UI", 18, "bold"), text_color=TEXT).grid(
+        row=0, column=0, padx=12, pady=(6, 6), sticky="w"
+    )
+
+    table_frame = ctk.CTkFrame(container, fg_color="transparent")
+    table_frame.grid(row=1, column=0, padx=12, sticky="nsew")
+    table_frame.grid_columnconfigure(0, weight=1)
+    table_frame.grid_rowconfigure(0, weight=1)
+
+    query_table = ttk.Treeview(table_frame, columns=[name for name, _, _ in _QUERY_COLUMNS], show="headings", height=12)
+    for name, width, anchor in _QUERY_COLUMNS:
+        query_table.heading(name, text=name)
+        query_table.column(name, width=width, anchor=anchor, stretch=name == "Query")
+    query_table.grid(row=0, column=0, sticky="nsew")
+    scroll_y = ttk.Scrollbar(table_frame, orient=VERTICAL, command=query_table.yview)
+    scroll_y.grid(row=0, column=1, sticky="ns")
+    scroll_x = ttk.Scrollbar(table_frame, orient=HORIZONTAL, command=query_table.xview)
+    scroll_x.grid(row=1, column=0, sticky="ew")
+    query_table.configure(yscrollcommand=scroll_y.set, xscrollcommand=scroll_x.set)
+
+    histogram_label = ctk.CTkLabel(
+        container, text="Select a query to see its latency histogram.", font=("Segoe UI", 12),
+        text_color=TEXT, anchor="w", justify="left", wraplength=1000,
+    )
+    histogram_label.grid(row=2, column=0, padx=12, pady=(8, 4), sticky="ew")
+
+    ctk.CTkLabel(
+        container, text=f"Slow Queries (≥ {_slow_threshold_ms:g} ms)", font=("Segoe UI", 15, "bold"), text_color=TEXT
+    ).grid(row=3, column=0, padx=12, pady=(8, 4), sticky="w")
+
+    slow_box = ctk.CTkTextbox(container, font=("Consolas", 12), text_color=TEXT, fg_color=ACCENT, height=120, wrap="none")
+    slow_box.grid(row=4, column=0, padx=12, sticky="nsew")
+
+    startup_label = ctk.CTkLabel(
+        container, text="", font=("Segoe UI", 12), text_color=TEXT, anchor="w", justify="left", wraplength=1000
+    )
+    startup_label.grid(row=5, column=0, padx=12, pady=(10, 4), sticky="ew")
+
+    histograms: Dict[str, List[Tuple[Optional[int], int]]] = {}
+
+    def _show_histogram(_event=None) -> None:
+        selected = query_table.selection()
+        if selected and selected[0] in histograms:
+            histogram_label.configure(text=_format_histogram(histograms[selected[0]]))
+
+    def _refresh() -> None:
+        selected = query_table.selection()
+        query_table.delete(*query_table.get_children())
+        histograms.clear()
+        for entry in _get_query_stats():
+            item_id = entry["shape"]
+            histograms[item_id] = entry["histogram"]
+            query_table.insert("", END, iid=item_id, values=(
+                entry["shape"],
+                entry["calls"],
+                entry["rows"],
+                f"{entry['avg_ms']:.1f}",
+                f"{entry['p50_ms']:.1f}",
+                f"{entry['p95_ms']:.1f}",
+                f"{entry['max_ms']:.1f}",
+                f"{entry['total_ms']:.0f}",
+                entry["errors"],
+            ))
+        if selected and query_table.exists(selected[0]):
+            query_table.selection_set(selected[0])
+
+        slow_box.configure(state="normal")
+        slow_box.delete("1.0", END)
+        slow_queries = _get_slow_queries() if _get_slow_queries is not None else []
+        for timestamp, elapsed_ms, rows, shape in slow_queries:
+            slow_box.insert(END, f"{timestamp}  {elapsed_ms:8.1f} ms  rows={rows}  {shape}\n")
+        if not slow_queries:
+            slow_box.insert(END, "No slow queries recorded.")
+        slow_box.configure(state="disabled")
+
+        phases = _get_startup_phases() if _get_startup_phases is not None else []
+        startup_label.configure(text=f"Startup: {_format_phases(phases)}")
+
+    def _reset() -> None:
+        if _reset_query_stats is not None:
+            _reset_query_stats()
+        histogram_label.configure(text="Select a query to see its latency histogram.")
+        _refresh()
+
+    def _close() -> None:
+        global _window
+        _window = None
+        window.destroy()
+
+    query_table.bind("<<TreeviewSelect>>", _show_histogram)
+    window.protocol("WM_DELETE_WINDOW", _close)
+
+    button_row = ctk.CTkFrame(container, fg_color="transparent")
+    button_row.grid(row=6, column=0, padx=12, pady=(12, 4), sticky="ew")
+    button_row.grid_columnconfigure((0, 1, 2, 3), weight=1)
+
+    button_kwargs = dict(corner_radius=12, font=("Segoe UI", 13, "bold"))
+    ctk.CTkButton(button_row, text="Refresh", command=_refresh, fg_color=SECONDARY, hover_color=PRIMARY,
+                  **button_kwargs).grid(row=0, column=0, padx=(0, 6), sticky="ew")
+    ctk.CTkButton(button_row, text="Reset Statistics", command=_reset, fg_color=SECONDARY, hover_color=PRIMARY,
+                  **button_kwargs).grid(row=0, column=1, padx=6, sticky="ew")
+    ctk.CTkButton(
+        button_row,
+        text="Save Timing Report",
+        command=lambda: _save_timing_report(window) if _save_timing_report is not None else None,
+        fg_color=SECONDARY,
+        hover_color=PRIMARY,
+        state="normal" if _save_timing_report is not None else "disabled",
+        **button_kwargs,
+    ).grid(row=0, column=2, padx=6, sticky="ew")
+    ctk.CTkButton(button_row, text="Close", command=_close, fg_color="#95A5A6", hover_color="#7F8C8D",
+                  **button_kwargs).grid(row=0, column=3, padx=(6, 0), sticky="ew")
+
+    _refresh()
+
+
+__all__ = [
+    "configure",
+    "show_diagnostics_window",
+]
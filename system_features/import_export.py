@@ -2,67 +2,73 @@
 from __future__ import annotations # Ensure compatibility with future Python versions
 
 import os # For file system operations
-from typing import Callable, Optional # For type hinting
+import threading # For signalling import cancellation to the worker
+from typing import Callable, Dict, Optional # For type hinting
 
 import customtkinter as ctk # For custom Tkinter widgets
-import pandas # For data manipulation
-from pymysql.err import IntegrityError # For handling database integrity errors
 from tkinter import filedialog, messagebox # For file dialogs and message boxes
 
-from system_configs.config import ACCENT, CARD_BG, PRIMARY, SECONDARY, TEXT # Import color constants
-from system_configs.helpers import normalize_column_name as _default_normalize_column_name # Import default helper function
-from system_configs.helpers import normalize_mobile as _default_normalize_mobile # Import default helper function
-from system_configs.helpers import to_proper_case as _default_to_proper_case # Import default helper function
-from system_configs.import_service import REQUIRED_COLUMNS as DEFAULT_REQUIRED_COLUMNS # Import default required columns
+from system_configs.config import ACCENT, CARD_BG, EXCEL_EXTENSIONS, PARQUET_EXTENSIONS, PRIMARY, SECONDARY, TEXT # Import color constants
 
 # Module-level variables to hold dependencies
-_cursor = None
-_connection = None
+_executor = None
 _root = None
 _refresh_callback: Optional[Callable[[], None]] = None
 _has_openpyxl = False
-_fpdf_cls = None
-_figure_cls = None
-_export_records = None
+_has_pyarrow = False
+_has_fpdf = False
+_has_matplotlib = False
+_load_fpdf_cls: Optional[Callable[[], object]] = None
+_load_figure_cls: Optional[Callable[[], object]] = None
+_record_exporters: Dict[str, Callable[[object, str], None]] = {}
 _export_analytics = None
-_normalize_mobile = _default_normalize_mobile
-_normalize_column_name = _default_normalize_column_name
-_to_proper_case = _default_to_proper_case
+
+# Record export formats: (format name, default extension, file dialog types).
+RECORD_EXPORT_FORMATS = {
+    "excel": ("Excel", ".xlsx", [("Excel Files", "*.xlsx")]),
+    "csv": ("CSV", ".csv", [("CSV Files", "*.csv")]),
+    "parquet": ("Parquet", ".parquet", [("Parquet Files", "*.parquet")]),
+    "jsonl": ("JSON Lines", ".jsonl.gz", [("Compressed JSON Lines", "*.jsonl.gz")]),
+}
 
 # Configure module-level dependencies.
 def configure(
     *,
-    cursor,
-    connection,
+    executor,
     root,
     refresh_callback: Callable[[], None],
     has_openpyxl: bool,
-    fpdf_cls,
-    figure_cls,
-    export_records_fn: Callable[[object, str], None],
+    has_fpdf: bool,
+    has_matplotlib: bool,
+    load_fpdf_cls: Callable[[], object],
+    load_figure_cls: Callable[[], object],
+    record_exporters: Dict[str, Callable[[object, str], None]],
     export_analytics_fn: Callable[[object, str, object, object, str, str], None],
-    normalize_mobile: Callable[[str], Optional[str]] = _default_normalize_mobile,
-    normalize_column_name: Callable[[str], str] = _default_normalize_column_name,
-    to_proper_case: Callable[[str], str] = _default_to_proper_case,
+    has_pyarrow: bool = False,
 ) -> None:
-    """Configure module-level dependencies."""
-    global _cursor, _connection, _root, _refresh_callback
-    global _has_openpyxl, _fpdf_cls, _figure_cls
-    global _export_records, _export_analytics
-    global _normalize_mobile, _normalize_column_name, _to_proper_case
-
-    _cursor = cursor
-    _connection = connection
+    """Configure module-level dependencies.
+
+    ``record_exporters`` maps keys of ``RECORD_EXPORT_FORMATS`` to functions
+    that write every patient to a file. Imports and exports run on
+    ``executor`` so the window stays responsive. The ``has_*`` flags come
+    from cheap availability checks; fpdf and matplotlib are only imported by
+    ``load_fpdf_cls``/``load_figure_cls`` when an analytics export runs.
+    """
+    global _executor, _root, _refresh_callback
+    global _has_openpyxl, _has_pyarrow, _has_fpdf, _has_matplotlib, _load_fpdf_cls, _load_figure_cls
+    global _record_exporters, _export_analytics
+
+    _executor = executor
     _root = root
     _refresh_callback = refresh_callback
     _has_openpyxl = has_openpyxl
-    _fpdf_cls = fpdf_cls
-    _figure_cls = figure_cls
-    _export_records = export_records_fn
+    _has_pyarrow = has_pyarrow
+    _has_fpdf = has_fpdf
+    _has_matplotlib = has_matplotlib
+    _load_fpdf_cls = load_fpdf_cls
+    _load_figure_cls = load_figure_cls
+    _record_exporters = dict(record_exporters)
     _export_analytics = export_analytics_fn
-    _normalize_mobile = normalize_mobile
-    _normalize_column_name = normalize_column_name
-    _to_proper_case = to_proper_case
 
 # Export data (records or analytics) based on user selection.
 def export_data(figure_primary: str, figure_secondary: str) -> None:  # pragma: no cover - UI callback
@@ -82,28 +88,26 @@ def export_data(figure_primary: str, figure_secondary: str) -> None:  # pragma:
         row=0, column=0, padx=12, pady=(6, 12), sticky="ew"
     )
 
-    choice_var = ctk.StringVar(value="records")
-
-    ctk.CTkRadioButton(
-        container,
-        text="Patient Records (Excel)",
-        value="records",
-        variable=choice_var,
-        font=("Segoe UI", 13),
-        text_color=TEXT,
-    ).grid(row=1, column=0, padx=12, pady=4, sticky="w")
-
-    ctk.CTkRadioButton(
-        container,
-        text="Patient Analytics (PDF)",
-        value="analytics",
-        variable=choice_var,
-        font=("Segoe UI", 13),
-        text_color=TEXT,
-    ).grid(row=2, column=0, padx=12, pady=4, sticky="w")
+    choice_var = ctk.StringVar(value="excel")
+
+    options = [
+        (key, f"Patient Records ({name})")
+        for key, (name, _, _) in RECORD_EXPORT_FORMATS.items()
+        if key in _record_exporters
+    ]
+    options.append(("analytics", "Patient Analytics (PDF)"))
+    for row, (value, label) in enumerate(options, start=1):
+        ctk.CTkRadioButton(
+            container,
+            text=label,
+            value=value,
+            variable=choice_var,
+            font=("Segoe UI", 13),
+            text_color=TEXT,
+        ).grid(row=row, column=0, padx=12, pady=4, sticky="w")
 
     button_row = ctk.CTkFrame(container, fg_color="transparent")
-    button_row.grid(row=3, column=0, padx=12, pady=(18, 4), sticky="ew")
+    button_row.grid(row=len(options) + 1, column=0, padx=12, pady=(18, 4), sticky="ew")
     button_row.grid_columnconfigure((0, 1), weight=1)
 
     # Perform the export based on user selection.
@@ -111,35 +115,37 @@ def export_data(figure_primary: str, figure_secondary: str) -> None:  # pragma:
         selection = choice_var.get()
         export_window.destroy()
 
-        if selection == "records":
-            if not _has_openpyxl:
+        if selection in RECORD_EXPORT_FORMATS:
+            if selection == "excel" and not _has_openpyxl:
                 messagebox.showerror(
                     "Missing Dependency",
                     'Excel export requires the "openpyxl" package. Install it with "pip install openpyxl" and try again.',
                 )
                 return
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel Files", "*.xlsx")],
-            )
+            if selection == "parquet" and not _has_pyarrow:
+                messagebox.showerror(
+                    "Missing Dependency",
+                    'Parquet export requires the "pyarrow" package. Install it with "pip install pyarrow" and try again.',
+                )
+                return
+            name, extension, filetypes = RECORD_EXPORT_FORMATS[selection]
+            file_path = filedialog.asksaveasfilename(defaultextension=extension, filetypes=filetypes)
             if not file_path:
                 return
-            try:
-                _export_records(_cursor, file_path)
-            except ValueError as exc:
-                messagebox.showinfo("Export", str(exc))
-            except Exception as exc:
-                messagebox.showerror("Error", f"Failed to export Excel file: {exc}")
-            else:
-                messagebox.showinfo("Success", f"Export completed: {file_path}")
+            export_records = _record_exporters[selection]
+            _run_export(
+                lambda cursor, _connection: export_records(cursor, file_path),
+                file_path,
+                f"Failed to export {name} file",
+            )
         else:
-            if _fpdf_cls is None:
+            if not _has_fpdf:
                 messagebox.showerror(
                     "Missing Dependency",
                     'Analytics export to PDF requires the "fpdf" package. Install it with "pip install fpdf" and try again.',
                 )
                 return
-            if _figure_cls is None:
+            if not _has_matplotlib:
                 messagebox.showerror(
                     "Missing Dependency",
                     'Analytics export to PDF requires the "matplotlib" package. Install it with "pip install matplotlib" and try again.',
@@ -151,14 +157,13 @@ def export_data(figure_primary: str, figure_secondary: str) -> None:  # pragma:
             )
             if not file_path:
                 return
-            try:
-                _export_analytics(_cursor, file_path, _fpdf_cls, _figure_cls, figure_primary, figure_secondary)
-            except ValueError as exc:
-                messagebox.showinfo("Export", str(exc))
-            except Exception as exc:
-                messagebox.showerror("Error", f"Failed to export PDF: {exc}")
-            else:
-                messagebox.showinfo("Success", f"Export completed: {file_path}")
+            _run_export(
+                lambda cursor, _connection: _export_analytics(
+                    cursor, file_path, *_load_pdf_classes(), figure_primary, figure_secondary
+                ),
+                file_path,
+                "Failed to export PDF",
+            )
 
     ctk.CTkButton(
         button_row,
@@ -180,13 +185,41 @@ def export_data(figure_primary: str, figure_secondary: str) -> None:  # pragma:
         font=("Segoe UI", 13, "bold"),
     ).grid(row=0, column=1, padx=(6, 0), sticky="ew")
 
-# Import patient data from an Excel or CSV file.
+# Import fpdf and matplotlib for an analytics export; runs on a database worker.
+def _load_pdf_classes():
+    fpdf_cls = _load_fpdf_cls() if _load_fpdf_cls is not None else None
+    figure_cls = _load_figure_cls() if _load_figure_cls is not None else None
+    if fpdf_cls is None or figure_cls is None:
+        raise RuntimeError("fpdf or matplotlib is installed but could not be loaded")
+    return fpdf_cls, figure_cls
+
+# Run an export on the database executor and report the outcome when it finishes.
+def _run_export(work, file_path: str, failure_message: str) -> None:  # pragma: no cover - UI callback
+    def _on_error(exc):
+        if isinstance(exc, ValueError):
+            messagebox.showinfo("Export", str(exc))
+        else:
+            messagebox.showerror("Error", f"{failure_message}: {exc}")
+
+    _executor.submit(
+        work,
+        on_success=lambda _result: messagebox.showinfo("Success", f"Export completed: {file_path}"),
+        on_error=_on_error,
+        cancellable=False,
+        long_running=True,
+    )
+
+# Import patient data from an Excel, CSV or Parquet file.
 def import_data(required_columns=None) -> None:  # pragma: no cover - UI callback
+    # pandas loads with the import service, on the first import rather than at startup.
+    from system_configs.import_service import REQUIRED_COLUMNS  # pylint: disable=import-outside-toplevel
+
     filepath = filedialog.askopenfilename(
         title="Import Patient Data",
         filetypes=[
             ("Excel Files", "*.xlsx;*.xlsm;*.xltx;*.xltm"),
             ("CSV Files", "*.csv"),
+            ("Parquet Files", "*.parquet;*.pq"),
             ("All Files", "*.*"),
         ],
     )
@@ -194,147 +227,39 @@ def import_data(required_columns=None) -> None:  # pragma: no cover - UI callbac
         return
 
     _, ext = os.path.splitext(filepath)
-    ext = ext.lower()
-
-    try:
-        if ext in (".xlsx", ".xlsm", ".xltx", ".xltm"):
-            if not _has_openpyxl:
-                messagebox.showerror(
-                    "Missing Dependency",
-                    'Excel import requires the "openpyxl" package. Install it with "pip install openpyxl" and try again.',
-                )
-                return
-            data_frame = pandas.read_excel(filepath, dtype=str)
-        else:
-            data_frame = pandas.read_csv(filepath, dtype=str)
-    except Exception as exc:
-        messagebox.showerror("Error", f"Unable to read the selected file: {exc}")
+    if ext.lower() in EXCEL_EXTENSIONS and not _has_openpyxl:
+        messagebox.showerror(
+            "Missing Dependency",
+            'Excel import requires the "openpyxl" package. Install it with "pip install openpyxl" and try again.',
+        )
         return
-
-    if data_frame.empty:
-        messagebox.showinfo("Import", "The selected file does not contain any records.")
+    if ext.lower() in PARQUET_EXTENSIONS and not _has_pyarrow:
+        messagebox.showerror(
+            "Missing Dependency",
+            'Parquet import requires the "pyarrow" package. Install it with "pip install pyarrow" and try again.',
+        )
         return
 
-    normalized_to_original = {
-        _normalize_column_name(col): col for col in data_frame.columns
-    }
+    required_columns = required_columns or REQUIRED_COLUMNS
+    _start_background_import(filepath, required_columns)
 
-    required_columns = required_columns or DEFAULT_REQUIRED_COLUMNS
+# Report the outcome of an import and refresh the patient table.
+def _finish_import(result, error: Optional[BaseException], cancelled: bool = False) -> None:  # pragma: no cover - UI callback
+    from system_configs.import_service import EMPTY_IMPORT_MESSAGE  # pylint: disable=import-outside-toplevel
 
-    resolved_columns = {}
-    missing_fields = []
-    for field, normalized in required_columns.items():
-        if normalized in normalized_to_original:
-            resolved_columns[field] = normalized_to_original[normalized]
+    if error is not None:
+        if isinstance(error, KeyError):
+            messagebox.showerror("Error", str(error.args[0]) if error.args else str(error))
+        elif str(error) == EMPTY_IMPORT_MESSAGE:
+            messagebox.showinfo("Import", EMPTY_IMPORT_MESSAGE)
         else:
-            missing_fields.append(field)
-
-    if missing_fields:
-        pretty_missing = ", ".join(field.replace("_", " ").title() for field in missing_fields)
-        messagebox.showerror("Error", f"Missing required columns in file: {pretty_missing}")
+            # Earlier chunks may already be committed, so show what made it in.
+            if _refresh_callback is not None:
+                _refresh_callback()
+            messagebox.showerror("Error", f"Unable to import the selected file: {error}")
         return
 
-    # Helper to get value from row with proper handling.
-    def get_value(row, field):
-        value = row[resolved_columns[field]]
-        if pandas.isna(value):
-            return ""
-        return str(value).strip()
-
-    # Perform the import operation.
-    inserted = 0
-    skipped = 0
-    error_samples = []
-    field_labels = {
-        "patient_id": "patient ID",
-        "name": "name",
-        "mobile": "mobile number",
-        "email": "email",
-        "address": "address",
-        "gender": "gender",
-        "dob": "date of birth",
-        "diagnosis": "diagnosis",
-        "visit_date": "visit date",
-    }
-
-    for idx, row in data_frame.iterrows():
-        excel_row = idx + 2
-        patient_id = get_value(row, "patient_id")
-        name = get_value(row, "name")
-        mobile = get_value(row, "mobile")
-        email_value = get_value(row, "email")
-        address_value = get_value(row, "address")
-        gender_value = get_value(row, "gender")
-        dob_value = get_value(row, "dob")
-        diagnosis_value = get_value(row, "diagnosis")
-        visit_date_value = get_value(row, "visit_date")
-
-        required_values = {
-            "patient_id": patient_id,
-            "name": name,
-            "mobile": mobile,
-            "email": email_value,
-            "address": address_value,
-            "gender": gender_value,
-            "dob": dob_value,
-            "diagnosis": diagnosis_value,
-            "visit_date": visit_date_value,
-        }
-
-        missing_values = [field_labels[key] for key, value in required_values.items() if not value]
-        if missing_values:
-            skipped += 1
-            if len(error_samples) < 5:
-                missing_text = ", ".join(missing_values)
-                error_samples.append(f"Row {excel_row}: Missing {missing_text}.")
-            continue
-
-        formatted_mobile = _normalize_mobile(mobile)
-        if not formatted_mobile:
-            skipped += 1
-            if len(error_samples) < 5:
-                error_samples.append(
-                    f"Row {excel_row}: Mobile number must follow +63 000 000 0000 format."
-                )
-            continue
-
-        name = _to_proper_case(name)
-        address_value = _to_proper_case(address_value)
-        diagnosis_value = _to_proper_case(diagnosis_value)
-
-        try:
-            query = (
-                "insert into patient ("
-                "patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date"
-                ") values (%s,%s,%s,%s,%s,%s,%s,%s,%s)"
-            )
-            _cursor.execute(
-                query,
-                (
-                    patient_id,
-                    name,
-                    formatted_mobile,
-                    email_value,
-                    address_value,
-                    gender_value,
-                    dob_value,
-                    diagnosis_value,
-                    visit_date_value,
-                ),
-            )
-            _connection.commit()
-            inserted += 1
-        except IntegrityError:
-            _connection.rollback()
-            skipped += 1
-            if len(error_samples) < 5:
-                error_samples.append(f"Row {excel_row}: Patient ID already exists.")
-        except Exception as exc:
-            _connection.rollback()
-            skipped += 1
-            if len(error_samples) < 5:
-                error_samples.append(f"Row {excel_row}: {exc}")
-
+    inserted, skipped, error_samples = result
     if _refresh_callback is not None:
         _refresh_callback()
 
@@ -344,8 +269,88 @@ def import_data(required_columns=None) -> None:  # pragma: no cover - UI callbac
     if error_samples:
         summary_message += "\n\nSample issues:\n" + "\n".join(error_samples)
 
-    messagebox.showinfo("Import Complete", summary_message)
+    messagebox.showinfo("Import Cancelled" if cancelled else "Import Complete", summary_message)
+
+# Stream the file on the database executor while a progress dialog follows along.
+def _start_background_import(filepath: str, required_columns) -> None:  # pragma: no cover - UI callback
+    from system_configs.import_service import import_patient_file  # pylint: disable=import-outside-toplevel
+
+    cancel_event = threading.Event()
+
+    progress_window = ctk.CTkToplevel()
+    progress_window.title("Importing Patients")
+    progress_window.grab_set()
+    progress_window.resizable(False, False)
+    progress_window.configure(fg_color=ACCENT)
+    if _root is not None:
+        progress_window.transient(_root)
+
+    # Closing the dialog asks the import to stop after the current chunk.
+    def _request_cancel():
+        cancel_event.set()
+        cancel_button.configure(state="disabled", text="Cancelling...")
+
+    progress_window.protocol("WM_DELETE_WINDOW", _request_cancel)
+
+    container = ctk.CTkFrame(progress_window, fg_color=CARD_BG, corner_radius=18)
+    container.grid(row=0, column=0, padx=26, pady=24)
+    container.grid_columnconfigure(0, weight=1)
+
+    ctk.CTkLabel(
+        container,
+        text=f"Importing {os.path.basename(filepath)}",
+        font=("Segoe UI", 16, "bold"),
+        text_color=TEXT,
+    ).grid(row=0, column=0, padx=12, pady=(6, 12), sticky="ew")
 
+    progress_bar = ctk.CTkProgressBar(container, width=360, progress_color=PRIMARY)
+    progress_bar.grid(row=1, column=0, padx=12, pady=4, sticky="ew")
+    progress_bar.set(0)
+
+    status_label = ctk.CTkLabel(container, text="Reading file...", font=("Segoe UI", 13), text_color=TEXT)
+    status_label.grid(row=2, column=0, padx=12, pady=(8, 4), sticky="w")
+
+    cancel_button = ctk.CTkButton(
+        container,
+        text="Cancel",
+        command=_request_cancel,
+        fg_color="#95A5A6",
+        hover_color="#7F8C8D",
+        corner_radius=12,
+        font=("Segoe UI", 13, "bold"),
+    )
+    cancel_button.grid(row=3, column=0, padx=12, pady=(14, 4), sticky="ew")
+
+    def _show_progress(fraction, rows_read, inserted, skipped):
+        if not progress_window.winfo_exists():
+            return
+        if fraction is not None:
+            progress_bar.set(fraction)
+        status_label.configure(text=f"Read {rows_read} row(s): {inserted} imported, {skipped} skipped")
+
+    # Called from the worker thread; the executor hands the update to Tk.
+    def _report_progress(fraction, rows_read, inserted, skipped):
+        _executor.post(_show_progress, fraction, rows_read, inserted, skipped)
+
+    def _finish(result, error):
+        progress_window.destroy()
+        _finish_import(result, error, cancel_event.is_set())
+
+    # The import stops itself through cancel_event, so the executor must not drop it.
+    _executor.submit(
+        lambda cursor, connection: import_patient_file(
+            filepath,
+            cursor,
+            connection,
+            progress_callback=_report_progress,
+            should_cancel=cancel_event.is_set,
+            required_columns=required_columns,
+        ),
+        on_success=lambda result: _finish(result, None),
+        on_error=lambda exc: _finish(None, exc),
+        cancellable=False,
+        long_running=True,
+    )
 
 __all__ = [
     "configure",
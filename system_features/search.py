@@ -1,13 +1,41 @@
 """Search and filter helpers for the clinic system."""
 from __future__ import annotations # Ensure compatibility with future Python versions
 
-from typing import Callable, Optional, Tuple # Type hinting
+from typing import Callable, Dict, List, Optional, Tuple # Type hinting
+import unicodedata # For accent-insensitive matching of cached rows
+
+from system_configs.config import DATE_SORT_FIELDS, RELEVANCE_SORT_FIELDS, SEARCH_DEBOUNCE_MS # Search tuning constants
+from system_configs.helpers import format_date # Dates are matched as they are displayed
 
 # Module-level variables for search controls and callbacks.
 _search_entry = None
 _search_field_var = None
 _search_field_options = {}
 _refresh_callback: Optional[Callable[[], None]] = None
+_root = None
+_fetch_page: Optional[Callable[..., Tuple[List[Tuple], Optional[Tuple]]]] = None
+_executor = None
+_display_results: Optional[Callable[[List[Tuple], Optional[Tuple], Optional[str], Optional[str]], None]] = None
+_get_sort_state: Optional[Callable[[], Tuple]] = None
+
+# Column positions of searchable fields in a patient row.
+_FIELD_INDEXES = {
+    "patient_id": 0,
+    "name": 1,
+    "mobile": 2,
+    "email": 3,
+    "address": 4,
+    "gender": 5,
+    "dob": 6,
+    "diagnosis": 7,
+    "visit_date": 8,
+}
+
+# Scheduler state: pending debounce timer, in-flight query and the last complete result.
+_pending_after_id = None
+_search_task = None
+_last_request: Optional[Tuple] = None
+_cached_result: Optional[Dict[str, object]] = None
 
 # Set up search controls and refresh behaviour.
 def configure(
@@ -16,13 +44,29 @@ def configure(
     search_field_var,
     search_field_options,
     refresh_callback: Callable[[], None],
+    root=None,
+    fetch_page: Optional[Callable[..., Tuple[List[Tuple], Optional[Tuple]]]] = None,
+    executor=None,
+    display_results: Optional[Callable[[List[Tuple], Optional[Tuple], Optional[str], Optional[str]], None]] = None,
+    get_sort_state: Optional[Callable[[], Tuple]] = None,
 ) -> None:
-    """Set up search controls and refresh behaviour."""
+    """Set up search controls and refresh behaviour.
+
+    When ``root``, ``fetch_page``, ``executor`` and ``display_results`` are all
+    provided, typing is debounced and queries run on the database executor;
+    otherwise every change simply calls ``refresh_callback``.
+    """
     global _search_entry, _search_field_var, _search_field_options, _refresh_callback
+    global _root, _fetch_page, _executor, _display_results, _get_sort_state
     _search_entry = search_entry
     _search_field_var = search_field_var
     _search_field_options = dict(search_field_options)
     _refresh_callback = refresh_callback
+    _root = root
+    _fetch_page = fetch_page
+    _executor = executor
+    _display_results = display_results
+    _get_sort_state = get_sort_state
 
 # Get the current search field and term for filtering.
 def get_filter() -> Tuple[Optional[str], Optional[str]]:
@@ -42,20 +86,159 @@ def get_filter() -> Tuple[Optional[str], Optional[str]]:
 
     return filter_field, filter_term
 
+# Forget the last complete result so the next search always queries the database.
+def invalidate_cache() -> None:
+    """Drop cached search results after patient data changes."""
+    global _cached_result, _last_request
+    _cached_result = None
+    _last_request = None
+
+# Drop a scheduled or running search so it cannot replace a list loaded since.
+def cancel_search() -> None:
+    """Cancel the debounced search and any search query still in flight."""
+    global _pending_after_id, _search_task, _last_request
+    if _pending_after_id is not None and _root is not None:
+        _root.after_cancel(_pending_after_id)
+    _pending_after_id = None
+    if _search_task is not None:
+        _search_task.cancel()
+        _search_task = None
+        # The cancelled request never showed, so typing it again must search.
+        _last_request = None
+
+# Check whether the background search pipeline has everything it needs.
+def _pipeline_ready() -> bool:
+    return None not in (_root, _fetch_page, _executor, _display_results)
+
+# Return the current sort state so cached results are only reused under the same order.
+def _sort_state() -> Tuple:
+    if _get_sort_state is None:
+        return ()
+    try:
+        return tuple(_get_sort_state())
+    except Exception:
+        return ()
+
+# Fold case and accents the way MySQL's default accent-insensitive collation compares text.
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+# Filter the previous complete result in memory when the new term extends the old one.
+def _refine_cached(filter_field: Optional[str], filter_term: Optional[str], sort_state: Tuple) -> Optional[List[Tuple]]:
+    cached = _cached_result
+    if cached is None or not filter_field or not filter_term:
+        return None
+    if cached["field"] != filter_field or cached["sort_state"] != sort_state:
+        return None
+    # Relevance order depends on the term itself, so it cannot be reused.
+    if sort_state and sort_state[0] in RELEVANCE_SORT_FIELDS:
+        return None
+    previous_term = cached["term"]
+    needle = _fold(filter_term)
+    if not previous_term or not needle.startswith(_fold(previous_term)):
+        return None
+
+    index = _FIELD_INDEXES.get(filter_field)
+    if index is None:
+        return None
+    as_text = format_date if filter_field in DATE_SORT_FIELDS else str
+    return [
+        row for row in cached["rows"]
+        if row[index] is not None and needle in _fold(as_text(row[index]))
+    ]
+
+# Show a finished query and remember it when it holds every match.
+def _deliver_result(filter_field: Optional[str], filter_term: Optional[str], sort_state: Tuple, result) -> None:  # pragma: no cover - UI callback
+    global _search_task, _cached_result
+    _search_task = None
+    rows, next_key = result
+    rows = list(rows)
+    if next_key is None:
+        _cached_result = {
+            "field": filter_field,
+            "term": filter_term,
+            "sort_state": sort_state,
+            "rows": rows,
+        }
+    else:
+        _cached_result = None
+    _display_results(rows, next_key, filter_field, filter_term)
+
+# Run the search for the current entry text.
+def _run_search() -> None:  # pragma: no cover - UI callback
+    global _pending_after_id, _last_request, _search_task
+    _pending_after_id = None
+
+    filter_field, filter_term = get_filter()
+    sort_state = _sort_state()
+    request_key = (filter_field, filter_term, sort_state)
+    if request_key == _last_request:
+        return
+    _last_request = request_key
+
+    # A newer request supersedes the query still in flight.
+    if _search_task is not None:
+        _search_task.cancel()
+        _search_task = None
+
+    refined = _refine_cached(filter_field, filter_term, sort_state)
+    if refined is not None:
+        _display_results(refined, None, filter_field, filter_term)
+        return
+
+    def _on_error(_exc) -> None:
+        global _search_task, _cached_result
+        _search_task = None
+        _cached_result = None
+        _display_results([], None, filter_field, filter_term)
+
+    # Cancelled by Esc (not superseded): forget the request so retyping it searches again.
+    def _on_cancel() -> None:
+        global _search_task, _last_request
+        if _search_task is task:
+            _search_task = None
+            if _last_request == request_key:
+                _last_request = None
+
+    task = _executor.submit(
+        lambda cursor, _connection: _fetch_page(filter_field, filter_term, cursor=cursor),
+        on_success=lambda result: _deliver_result(filter_field, filter_term, sort_state, result),
+        on_error=_on_error,
+        on_cancel=_on_cancel,
+    )
+    _search_task = task
+
 # Handle changes in the search entry field.
 def on_search_entry_change(event=None) -> None:  # pragma: no cover - UI callback
-    if _refresh_callback is not None:
-        _refresh_callback()
+    global _pending_after_id
+    if not _pipeline_ready():
+        if _refresh_callback is not None:
+            _refresh_callback()
+        return
+
+    if _pending_after_id is not None:
+        _root.after_cancel(_pending_after_id)
+        _pending_after_id = None
+
+    if event is not None and getattr(event, "keysym", "") == "Return":
+        _run_search()
+    else:
+        _pending_after_id = _root.after(SEARCH_DEBOUNCE_MS, _run_search)
 
 # Handle changes in the selected search field.
 def on_search_field_change(choice) -> None:  # pragma: no cover - UI callback
-    if _refresh_callback is not None:
+    if _pipeline_ready():
+        _run_search()
+    elif _refresh_callback is not None:
         _refresh_callback()
 
 
 __all__ = [
     "configure",
     "get_filter",
+    "invalidate_cache",
+    "cancel_search",
     "on_search_entry_change",
     "on_search_field_change",
 ]
@@ -1,7 +1,7 @@
 """Selection helpers separated from the main system UI."""
 from __future__ import annotations # Ensure compatibility with future Python versions
 
-from typing import Optional # Type hinting
+from typing import Callable, Optional # Type hinting
 
 import customtkinter as ctk # For custom Tkinter widgets
 from tkinter import END, MULTIPLE, Listbox, VERTICAL, messagebox # For listbox and message boxes
@@ -14,6 +14,7 @@ _patient_table = None
 _root = None
 _selection_action_var = None
 _selection_menu_options = []
+_load_all_rows: Optional[Callable[[Callable[[], None]], None]] = None
 
 # Configure module-level context for selection handlers.
 def configure(
@@ -22,19 +23,36 @@ def configure(
     root,
     selection_action_var,
     selection_menu_options,
+    load_all_rows: Optional[Callable[[Callable[[], None]], None]] = None,
 ) -> None:
-    """Configure module-level context for selection handlers."""
-    global _patient_table, _root, _selection_action_var, _selection_menu_options
+    """Configure module-level context for selection handlers.
+
+    ``load_all_rows(callback)`` brings every matching patient into the table
+    (the table only holds the pages scrolled into view) and then calls
+    ``callback``; bulk selections wait for it.
+    """
+    global _patient_table, _root, _selection_action_var, _selection_menu_options, _load_all_rows
     _patient_table = patient_table
     _root = root
     _selection_action_var = selection_action_var
     _selection_menu_options = list(selection_menu_options)
+    _load_all_rows = load_all_rows
+
+# Run a selection handler once every matching patient is in the table.
+def _with_all_rows(callback: Callable[[], None]) -> None:
+    if _load_all_rows is None:
+        callback()
+    else:
+        _load_all_rows(callback)
 
 # Select all patients in the table.
 def select_all_patients() -> None:
     if _patient_table is None:
         return
+    _with_all_rows(_select_all_loaded)
 
+# Select every row once all pages are loaded.
+def _select_all_loaded() -> None:
     items = _patient_table.get_children()
     if not items:
         messagebox.showinfo("Select All", "No patient records available to select.")
@@ -62,7 +80,10 @@ def clear_selected_patients() -> None:
 def select_specific_patients() -> None:
     if _patient_table is None:
         return
+    _with_all_rows(_open_selection_dialog)
 
+# Build the patient picker once all pages are loaded.
+def _open_selection_dialog() -> None:
     items = _patient_table.get_children()
     if not items:
         messagebox.showinfo("Select Patients", "No patient records available to select.")
@@ -1,18 +1,19 @@
 """Sorting helpers for patient records."""
 from __future__ import annotations # Ensure compatibility with future Python versions
 
-from typing import Callable, Iterable, Optional, Sequence, Tuple # Type hinting
+from typing import Callable, Dict, List, Optional, Sequence, Tuple # Type hinting
 
 import customtkinter as ctk # For custom Tkinter widgets
 from tkinter import messagebox  # For message boxes
 
-from system_configs.config import ACCENT, CARD_BG, PRIMARY, SECONDARY, TEXT # Import color constants
+from system_configs.config import ACCENT, CARD_BG, PATIENT_PAGE_SIZE, PRIMARY, SECONDARY, TEXT # Import color constants
 
 # Module-level variables for sorting context.
-_cursor = None
 _sort_field_options = {}
 _sort_field_labels = {}
 _date_sort_fields: Sequence[str] = ()
+_fulltext_columns: Dict[str, str] = {}
+_ngram_token_size = 2  # server ngram_token_size; shorter words cannot be matched through the index
 _root = None
 _refresh_callback: Optional[Callable[[], None]] = None
 
@@ -22,56 +23,245 @@ current_sort_order = "ASC"
 # Configure module-level dependencies and callbacks.
 def configure(
     *,
-    cursor,
     sort_field_options,
     sort_field_labels,
     date_sort_fields,
     root,
     refresh_callback: Callable[[], None],
+    fulltext_columns: Optional[Dict[str, str]] = None,
+    ngram_token_size: int = 2,
 ) -> None:
-    """Configure module-level dependencies and callbacks."""
-    global _cursor, _sort_field_options, _sort_field_labels, _date_sort_fields, _root, _refresh_callback
-    _cursor = cursor
+    """Configure module-level dependencies and callbacks.
+
+    ``fulltext_columns`` maps searchable columns to their FULLTEXT parser
+    (``'ngram'`` or ``'word'``); filters on ngram columns use the index when
+    the term is at least ``ngram_token_size`` characters per word.
+    """
+    global _sort_field_options, _sort_field_labels, _date_sort_fields, _root, _refresh_callback
+    global _fulltext_columns, _ngram_token_size
     _sort_field_options = dict(sort_field_options)
     _sort_field_labels = dict(sort_field_labels)
     _date_sort_fields = tuple(date_sort_fields)
+    _fulltext_columns = dict(fulltext_columns or {})
+    _ngram_token_size = max(int(ngram_token_size), 1)
     _root = root
     _refresh_callback = refresh_callback
 
-# Fetch patients applying optional filters and the current sort state.
-def fetch_patients(filter_field: Optional[str], filter_term: Optional[str]) -> Iterable[Tuple]:
-    """Retrieve patients applying optional filters and the current sort state."""
-    global current_sort_field, current_sort_order
+# Switch FULLTEXT matching on once the index layout is known.
+def set_fulltext_columns(fulltext_columns: Optional[Dict[str, str]], ngram_token_size: int = 2) -> None:
+    """Replace the FULLTEXT column map and ngram token size given to ``configure``."""
+    global _fulltext_columns, _ngram_token_size
+    _fulltext_columns = dict(fulltext_columns or {})
+    _ngram_token_size = max(int(ngram_token_size), 1)
 
-    if _cursor is None:
-        return []
+# Column list shared by every patient lookup.
+_PATIENT_COLUMNS = "patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date"
 
+# Resolve the active sort field and order, falling back to patient ID ascending.
+def _current_sort() -> Tuple[str, str]:
     sort_field = current_sort_field if current_sort_field in _sort_field_options.values() else "patient_id"
     sort_order = current_sort_order if current_sort_order in ("ASC", "DESC") else "ASC"
+    return sort_field, sort_order
 
-    query = (
-        "select patient_id, name, mobile, email, address, gender, dob, diagnosis, visit_date "
-        "from patient"
-    )
-    params = []
+_BOOLEAN_MODE_OPERATORS = set('+-<>()~*"@')
 
-    if filter_field and filter_term:
-        query += f" where LOWER({filter_field}) LIKE %s"
-        params.append(f"%{filter_term.lower()}%")
+# Substring LIKE pattern for a search term, with its own % and _ matched literally.
+def _like_pattern(filter_term: str) -> str:
+    escaped = filter_term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+# Build a MATCH ... AGAINST expression when the filter column has a usable ngram FULLTEXT index.
+def _fulltext_match(filter_field: Optional[str], filter_term: Optional[str]) -> Optional[Tuple[str, List]]:
+    """Return a MATCH expression that finds every row the LIKE filter finds, or None.
+
+    Only ngram indexes qualify: word-parser indexes match whole words or
+    prefixes, so mid-word searches would be lost and those columns use LIKE
+    alone. Every word of the term must be at least ``ngram_token_size``
+    characters and free of boolean-mode operators, otherwise some rows that
+    contain the term could have no matching ngrams.
+    """
+    if _fulltext_columns.get(filter_field or "") != "ngram" or not filter_term:
+        return None
+
+    tokens = filter_term.split()
+    if not tokens or any(len(token) < _ngram_token_size for token in tokens):
+        return None
+    if any(ch in _BOOLEAN_MODE_OPERATORS for token in tokens for ch in token):
+        return None
+
+    # A quoted phrase over ngram tokens matches the term as a substring.
+    against = '"' + " ".join(tokens) + '"'
+    return f"MATCH({filter_field}) AGAINST(%s IN BOOLEAN MODE)", [against]
+
+# Build the (expression, direction, params, nullable) columns that totally order the current sort.
+def _sort_key_columns(match: Optional[Tuple[str, List]] = None) -> List[Tuple[str, str, List, bool]]:
+    sort_field, sort_order = _current_sort()
+
+    if sort_field == "relevance":
+        if match is not None:
+            match_expr, match_params = match
+            # Ascending relevance lists the best matches first.
+            score_order = "DESC" if sort_order == "ASC" else "ASC"
+            return [
+                (match_expr, score_order, list(match_params), False),
+                ("patient_id", sort_order, [], False),
+            ]
+        sort_field = "patient_id"
 
     if sort_field == "patient_id":
-        numeric_expr = "CASE WHEN patient_id REGEXP '^[0-9]+$' THEN CAST(patient_id AS UNSIGNED) ELSE NULL END"
-        query += (
-            f" order by ({numeric_expr} IS NULL) ASC, "
-            f"{numeric_expr} {sort_order}, patient_id {sort_order}"
-        )
-    elif sort_field in _date_sort_fields:
-        query += f" order by STR_TO_DATE({sort_field}, '%m/%d/%Y') {sort_order}"
-    else:
-        query += f" order by {sort_field} {sort_order}"
-
-    _cursor.execute(query, tuple(params))
-    return _cursor.fetchall()
+        # id_sort_key holds the numeric ID (non-numeric IDs share one high value).
+        return [
+            ("id_sort_key", sort_order, [], False),
+            ("patient_id", sort_order, [], False),
+        ]
+    # Bare columns keep the order servable by the column's index.
+    return [
+        (sort_field, sort_order, [], True),
+        ("patient_id", sort_order, [], False),
+    ]
+
+# Build the condition for rows that sort strictly after ``value`` in one key column.
+def _after_condition(expression: str, direction: str, expression_params: List, nullable: bool, value) -> Optional[Tuple[str, List]]:
+    # MySQL sorts NULL first when ascending and last when descending.
+    if direction == "ASC":
+        if value is None:
+            return f"{expression} IS NOT NULL", list(expression_params)
+        return f"{expression} > %s", list(expression_params) + [value]
+    if value is None:
+        return None
+    if nullable:
+        return f"({expression} < %s OR {expression} IS NULL)", list(expression_params) + [value] + list(expression_params)
+    return f"{expression} < %s", list(expression_params) + [value]
+
+# Build a keyset predicate selecting rows that sort strictly after the given key.
+def _keyset_predicate(key_columns: Sequence[Tuple[str, str, List, bool]], after_key: Sequence) -> Tuple[str, List]:
+    clauses = []
+    params: List = []
+    for index, (expression, direction, expression_params, nullable) in enumerate(key_columns):
+        after = _after_condition(expression, direction, expression_params, nullable, after_key[index])
+        if after is None:
+            continue
+        parts = []
+        clause_params: List = []
+        for (previous, _, previous_params, _), previous_value in zip(key_columns[:index], after_key[:index]):
+            if previous_value is None:
+                parts.append(f"{previous} IS NULL")
+                clause_params.extend(previous_params)
+            else:
+                parts.append(f"{previous} = %s")
+                clause_params.extend(previous_params)
+                clause_params.append(previous_value)
+        condition, condition_params = after
+        parts.append(condition)
+        clause_params.extend(condition_params)
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(clause_params)
+    if not clauses:
+        return "FALSE", []
+    return "(" + " OR ".join(clauses) + ")", params
+
+# Build the filtered, ordered patient query shared by full and paged lookups.
+def _build_patient_query(
+    filter_field: Optional[str],
+    filter_term: Optional[str],
+    after_key: Optional[Sequence] = None,
+    patient_id: Optional[str] = None,
+) -> Tuple[str, List, int]:
+    match = _fulltext_match(filter_field, filter_term)
+    key_columns = _sort_key_columns(match)
+
+    params: List = []
+    key_select = []
+    for index, (expression, _, expression_params, _) in enumerate(key_columns):
+        key_select.append(f"{expression} as sort_key_{index}")
+        params.extend(expression_params)
+    query = f"select {_PATIENT_COLUMNS}, {', '.join(key_select)} from patient"
+
+    conditions = []
+    if filter_field and filter_term:
+        if match is not None:
+            # The index narrows the candidates; LIKE keeps substring semantics exact.
+            match_expr, match_params = match
+            conditions.append(match_expr)
+            params.extend(match_params)
+        if filter_field in _date_sort_fields:
+            # Dates are searched as staff see them.
+            conditions.append(f"DATE_FORMAT({filter_field}, '%%m/%%d/%%Y') LIKE %s")
+        else:
+            conditions.append(f"LOWER({filter_field}) LIKE %s")
+        params.append(_like_pattern(filter_term))
+    if patient_id is not None:
+        conditions.append("patient_id = %s")
+        params.append(patient_id)
+    if after_key is not None:
+        predicate, predicate_params = _keyset_predicate(key_columns, after_key)
+        conditions.append(predicate)
+        params.extend(predicate_params)
+    if conditions:
+        query += " where " + " and ".join(conditions)
+
+    order_parts = []
+    for expression, direction, expression_params, _ in key_columns:
+        order_parts.append(f"{expression} {direction}")
+        params.extend(expression_params)
+    query += " order by " + ", ".join(order_parts)
+    return query, params, len(key_columns)
+
+# Fetch one page of patients that sort after the given keyset position.
+def fetch_patient_page(
+    filter_field: Optional[str],
+    filter_term: Optional[str],
+    after_key: Optional[Sequence] = None,
+    limit: Optional[int] = PATIENT_PAGE_SIZE,
+    cursor=None,
+) -> Tuple[List[Tuple], Optional[Tuple]]:
+    """Retrieve a page of patients using keyset pagination on the current sort key.
+
+    Returns a tuple of (rows, next_key). ``next_key`` is ``None`` once the last
+    page has been reached; otherwise pass it back as ``after_key`` for the next page.
+    ``limit=None`` returns every remaining patient in one query.
+    """
+    if cursor is None:
+        return [], None
+
+    query, params, key_count = _build_patient_query(filter_field, filter_term, after_key)
+    if limit is None:
+        cursor.execute(query, tuple(params))
+        return [row[:-key_count] for row in cursor.fetchall()], None
+    query += " limit %s"
+    params.append(limit + 1)
+    cursor.execute(query, tuple(params))
+    fetched = cursor.fetchall()
+
+    page = fetched[:limit]
+    rows = [row[:-key_count] for row in page]
+    next_key = tuple(page[-1][-key_count:]) if len(fetched) > limit else None
+    return rows, next_key
+
+# Locate one patient within the filtered, sorted patient list.
+def fetch_patient_position(
+    patient_id: str,
+    filter_field: Optional[str],
+    filter_term: Optional[str],
+    cursor=None,
+) -> Tuple[Optional[Tuple], Optional[str]]:
+    """Return ``(row, next_patient_id)`` for a patient under the current sort.
+
+    ``row`` is ``None`` when the patient does not match the filter (or no
+    longer exists); ``next_patient_id`` is the patient that sorts right after
+    it, or ``None`` when it is last. Both lookups are single indexed probes.
+    """
+    if cursor is None:
+        return None, None
+
+    query, params, key_count = _build_patient_query(filter_field, filter_term, patient_id=patient_id)
+    cursor.execute(query + " limit 1", tuple(params))
+    found = cursor.fetchone()
+    if found is None:
+        return None, None
+
+    following, _ = fetch_patient_page(filter_field, filter_term, tuple(found[-key_count:]), limit=1, cursor=cursor)
+    return tuple(found[:-key_count]), (str(following[0][0]) if following else None)
 
 # Open a dialog to select sorting options.
 def open_sort_dialog():  # pragma: no cover - UI callback
@@ -157,7 +347,9 @@ def open_sort_dialog():  # pragma: no cover - UI callback
 
 __all__ = [
     "configure",
-    "fetch_patients",
+    "fetch_patient_page",
+    "fetch_patient_position",
+    "set_fulltext_columns",
     "open_sort_dialog",
     "current_sort_field",
     "current_sort_order",
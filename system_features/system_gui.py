@@ -2,7 +2,7 @@
 from __future__ import annotations # Ensure compatibility with future Python versions
 
 from pathlib import Path # For handling file paths
-from typing import Any, Callable, Dict, Iterable # Type hinting
+from typing import Any, Callable, Dict, Iterable, Optional # Type hinting
 
 import customtkinter as ctk # For custom Tkinter widgets
 from tkinter import BOTH, BOTTOM, CENTER, Frame, TclError, VERTICAL, HORIZONTAL, RIGHT, X, Y # For Tkinter components
@@ -64,6 +64,8 @@ def build_main_window(
     on_sort_click: Callable[[], None],
     on_patient_details: Callable[[object], None],
     sidebar_side: str,
+    on_table_scroll: Optional[Callable[[str, str], None]] = None,
+    diagnostics_handler: Optional[Callable[[], None]] = None,
 ) -> Dict[str, Any]:
     """Create the main window and return the key UI widgets."""
     root = ctk.CTk()
@@ -166,7 +168,11 @@ def build_main_window(
     ctk.CTkButton(sidebar_frame, text='Import Patients', command=import_handler, **button_kwargs).grid(row=4, column=0, pady=8, padx=10, sticky='ew')
     ctk.CTkButton(sidebar_frame, text='Export Patients', command=export_handler, **button_kwargs).grid(row=5, column=0, pady=8, padx=10, sticky='ew')
     ctk.CTkButton(sidebar_frame, text='View Analytics', command=analytics_handler, **button_kwargs).grid(row=6, column=0, pady=8, padx=10, sticky='ew')
-    ctk.CTkButton(sidebar_frame, text='Exit', command=exit_handler, fg_color='#e74c3c', hover_color='#c0392b', text_color='white', font=('Segoe UI', 14, 'bold'), corner_radius=14, height=44).grid(row=7, column=0, pady=12, padx=10, sticky='ew')
+    exit_row = 7
+    if diagnostics_handler is not None:
+        ctk.CTkButton(sidebar_frame, text='Diagnostics', command=diagnostics_handler, **button_kwargs).grid(row=7, column=0, pady=8, padx=10, sticky='ew')
+        exit_row = 8
+    ctk.CTkButton(sidebar_frame, text='Exit', command=exit_handler, fg_color='#e74c3c', hover_color='#c0392b', text_color='white', font=('Segoe UI', 14, 'bold'), corner_radius=14, height=44).grid(row=exit_row, column=0, pady=12, padx=10, sticky='ew')
 
     header_frame = ctk.CTkFrame(content_frame, fg_color='transparent')
     header_frame.grid(row=0, column=0, sticky='ew', padx=28, pady=(24, 12))
@@ -175,6 +181,10 @@ def build_main_window(
     table_heading = ctk.CTkLabel(header_frame, text='Patient Records', font=('Segoe UI', 22, 'bold'), text_color=TEXT, fg_color=ACCENT)
     table_heading.grid(row=0, column=0, sticky='w')
 
+    # Shows while database work is running in the background; cleared when idle.
+    busy_label = ctk.CTkLabel(header_frame, text='', font=('Segoe UI', 12, 'italic'), text_color=SECONDARY, fg_color=ACCENT)
+    busy_label.grid(row=1, column=0, sticky='w')
+
     control_frame = ctk.CTkFrame(header_frame, fg_color='transparent')
     control_frame.grid(row=0, column=1, sticky='e', padx=(12, 0))
     control_frame.grid_columnconfigure(1, weight=1)
@@ -237,13 +247,19 @@ def build_main_window(
     scroll_bar_x = ttk.Scrollbar(tree_frame, orient=HORIZONTAL)
     scroll_bar_x.pack(side=BOTTOM, fill=X)
 
+    # Keep the scrollbar in sync and let the table load more rows near the end.
+    def _on_vertical_scroll(first, last):
+        scroll_bar_y.set(first, last)
+        if on_table_scroll is not None:
+            on_table_scroll(first, last)
+
     patient_table = ttk.Treeview(
         tree_frame,
         columns=(
             'Patient ID', 'Name', 'Mobile No.', 'Email', 'Address', 'Gender', 'Date of Birth', 'Diagnosis', 'Visit Date'
         ),
         xscrollcommand=scroll_bar_x.set,
-        yscrollcommand=scroll_bar_y.set,
+        yscrollcommand=_on_vertical_scroll,
         show='headings',
         selectmode='extended',
     )
@@ -295,6 +311,11 @@ def build_main_window(
     patient_table.tag_configure('evenrow', background=CARD_BG)
     patient_table.tag_configure('oddrow', background=TABLE_BG)
 
+    # Shown over the empty table until the first patients arrive.
+    loading_label = ctk.CTkLabel(table_container, text='Loading patients...', font=('Segoe UI', 14, 'italic'),
+                                 text_color=SECONDARY, fg_color=CARD_BG)
+    loading_label.place(relx=0.5, rely=0.5, anchor='center')
+
     # Return key UI components for further manipulation.
     return {
         'root': root,
@@ -303,4 +324,6 @@ def build_main_window(
         'search_field_var': search_field_var,
         'selection_action_var': selection_action_var,
         'patient_table': patient_table,
+        'busy_label': busy_label,
+        'loading_label': loading_label,
     }